@@ -0,0 +1,293 @@
+"""
+Time-lapse animation of the generated artwork.
+
+animate_artwork() yields one frame per timestamp while reusing everything that
+does not change between frames: the gradient background, the canvas and the
+shape overlay buffers, and the random layout. Influence parameters are taken
+from keyframes and interpolated in between, so shapes grow, fade and turn
+smoothly instead of jumping. Frames stream straight into an animated GIF or
+WebP, or an image sequence, so no more than one raw frame is held at a time.
+"""
+
+import argparse
+import datetime
+import io
+import math
+import os
+import random
+import struct
+import sys
+
+from PIL import Image, ImageDraw
+
+from batch_render import iter_timestamps
+from generate_art import active_styles, gradient_canvas, shape_functions, time_influence
+from image_encoders import ImageEncoder
+
+
+def interpolate_influence(start, end, ratio):
+    """Blend two time_influence() dicts; integer fields stay integers."""
+    blended = {}
+    for key, a in start.items():
+        b = end[key]
+        if key == "angle":
+            # Go the short way round the circle
+            b = a + ((b - a + 180) % 360 - 180)
+            value = (a + (b - a) * ratio) % 360
+        else:
+            value = a + (b - a) * ratio
+        blended[key] = round(value) if isinstance(a, int) and key != "angle" else value
+    return blended
+
+
+def keyframe_influence(time_obj, interval):
+    """
+    Return (influence, rotation) for time_obj, interpolated between the
+    influences at the surrounding keyframes ``interval`` apart.
+    """
+    midnight = time_obj.replace(hour=0, minute=0, second=0, microsecond=0)
+    elapsed = (time_obj - midnight) / interval
+    index = math.floor(elapsed)
+    before = midnight + interval * index
+    after = before + interval
+    first = time_influence(before)
+    second = time_influence(after)
+    ratio = elapsed - index
+    influence = interpolate_influence(first, second, ratio)
+    # Interpolate the small tilt directly; deriving it from the blended angle
+    # would saw-tooth every 10 degrees
+    rotation = (first["angle"] % 10 - 5) * (1 - ratio) + (second["angle"] % 10 - 5) * ratio
+    return influence, rotation
+
+
+def animate_artwork(day, times, width=None, height=None, style=None,
+                    keyframe_interval=datetime.timedelta(minutes=10)):
+    """
+    Yield an RGB frame for each timestamp in ``times``.
+
+    The layout is seeded once from the first timestamp, so the first frame
+    matches generate_artwork(day, times[0]) whenever it falls on a keyframe.
+    ``width`` and ``height`` default to the active config's canvas.
+    Buffers are reused: each yielded frame is only valid until the next one
+    is requested, so consume (encode, copy) it before advancing.
+    """
+    times = iter(times)
+    try:
+        first = next(times)
+    except StopIteration:
+        return
+
+    styles = active_styles()
+    _, colors, day_style, _ = styles.days[day]
+    width = width or styles.canvas[0]
+    height = height or styles.canvas[1]
+    shape_func = shape_functions.get(style or day_style, shape_functions["circles"])
+    seed = first.timestamp()
+
+    background = gradient_canvas(colors[0], width, height)
+    canvas = background.copy()
+    overlay = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    overlay_draw = ImageDraw.Draw(overlay)
+    box = (0, 0, width, height)
+
+    time_obj = first
+    while True:
+        influence, rotation = keyframe_influence(time_obj, keyframe_interval)
+
+        canvas.paste(background, box)
+        overlay.paste((0, 0, 0, 0), box)
+        shape_func(overlay_draw, width, height, colors, influence, random.Random(seed))
+        canvas.paste(overlay, (0, 0), overlay)
+
+        if abs(rotation) > 1e-9:
+            yield canvas.rotate(rotation, expand=False, fillcolor=(255, 255, 255))
+        else:
+            yield canvas
+
+        try:
+            time_obj = next(times)
+        except StopIteration:
+            return
+
+
+class _LazyFrames(Image.Image):
+    """
+    A multi-frame image whose frames are pulled from an iterator on seek().
+
+    Pillow's animated WebP writer walks frames with seek()/tell(), so this
+    lets it encode a frame sequence without the frames ever being collected
+    into a list. The public ``append_images`` route cannot stream: the
+    writer turns it into a list first. This relies on Image.Image internals
+    (``im``, ``_mode``, ``_size``), so requirements.txt pins the Pillow
+    major version it is tested with.
+    """
+
+    def __init__(self, frames, count):
+        super().__init__()
+        self._frames = iter(frames)
+        self._count = count
+        self._index = -1
+        self.info = {}
+        self._load_next()
+
+    def _load_next(self):
+        frame = next(self._frames).convert("RGB")
+        self.im = frame.im
+        self._mode = frame.mode
+        self._size = frame.size
+        self._index += 1
+
+    @property
+    def n_frames(self):
+        return self._count
+
+    @property
+    def is_animated(self):
+        return self._count > 1
+
+    def seek(self, frame):
+        # Only forward, one frame at a time; anything else (the writer's
+        # final rewind) leaves the current frame in place
+        if frame == self._index + 1 and frame < self._count:
+            self._load_next()
+
+    def tell(self):
+        return self._index
+
+
+def write_webp(frames, count, destination, duration=100, loop=0, lossless=False, quality=80):
+    """Stream ``count`` frames into an animated WebP."""
+    first = _LazyFrames(frames, count)
+    first.save(destination, format="WEBP", save_all=True, duration=duration, loop=loop,
+               lossless=lossless, quality=quality)
+
+
+def _gif_sub_blocks(data, pos):
+    """Return the end position of a run of GIF data sub-blocks starting at pos."""
+    while data[pos]:
+        pos += data[pos] + 1
+    return pos + 1
+
+
+def write_gif(frames, destination, duration=100, loop=0):
+    """
+    Stream frames into an animated GIF, one frame in memory at a time.
+
+    Each frame is quantized and encoded on its own by Pillow, then its image
+    block is appended to the output with the frame's palette as a local color
+    table.
+    """
+    own_file = isinstance(destination, (str, os.PathLike))
+    if own_file:
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    f = open(destination, "wb") if own_file else destination
+    try:
+        header_written = False
+        delay = max(0, round(duration / 10))
+        for frame in frames:
+            buffer = io.BytesIO()
+            frame.convert("RGB").save(buffer, format="GIF")
+            data = buffer.getvalue()
+
+            flags = data[10]
+            pos = 13
+            palette = b""
+            if flags & 0x80:
+                palette = data[pos:pos + 3 * (2 << (flags & 0x07))]
+                pos += len(palette)
+
+            if not header_written:
+                width, height = frame.size
+                # Logical screen without a global color table, then the
+                # NETSCAPE2.0 extension for looping
+                f.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+                f.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00")
+                header_written = True
+
+            # Skip the frame's own extensions; find its image descriptor
+            while data[pos] == 0x21:
+                pos = _gif_sub_blocks(data, pos + 2)
+            descriptor = bytearray(data[pos:pos + 10])
+            pos += 10
+            if descriptor[9] & 0x80:
+                local = data[pos:pos + 3 * (2 << (descriptor[9] & 0x07))]
+                pos += len(local)
+            else:
+                local = palette
+                descriptor[9] |= 0x80 | (flags & 0x07)
+            end = _gif_sub_blocks(data, pos + 1)
+
+            f.write(b"\x21\xf9\x04\x00" + struct.pack("<H", delay) + b"\x00\x00")
+            f.write(bytes(descriptor) + local + data[pos:end])
+        f.write(b";")
+    finally:
+        if own_file:
+            f.close()
+
+
+def write_sequence(frames, output_dir, encoder=None, prefix="frame"):
+    """Write each frame to its own numbered file and return the count."""
+    encoder = encoder or ImageEncoder("png")
+    count = 0
+    for count, frame in enumerate(frames, start=1):
+        encoder.encode(frame, os.path.join(output_dir, f"{prefix}_{count:06d}{encoder.extension}"))
+    return count
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render a time-lapse animation of the artwork over a time range."
+    )
+    parser.add_argument("--start", required=True, type=datetime.datetime.fromisoformat,
+                        help="First timestamp (ISO format, e.g. 2024-01-01T00:00)")
+    parser.add_argument("--end", required=True, type=datetime.datetime.fromisoformat,
+                        help="Stop before this timestamp (ISO format)")
+    parser.add_argument("--step", type=float, default=60,
+                        help="Seconds of artwork time between frames (default: 60)")
+    parser.add_argument("--day", help="Day whose concept to animate (default: the start's weekday)")
+    parser.add_argument("--style", choices=sorted(shape_functions), help="Override the day's style")
+    parser.add_argument("--width", type=int, default=None,
+                        help="Frame width in pixels (default: the config's canvas, 800)")
+    parser.add_argument("--height", type=int, default=None,
+                        help="Frame height in pixels (default: the config's canvas, 600)")
+    parser.add_argument("--format", choices=["gif", "webp", "frames"], default="webp",
+                        help="Animated GIF, animated WebP or a PNG sequence (default: webp)")
+    parser.add_argument("--fps", type=float, default=12, help="Playback frames per second")
+    parser.add_argument("--output", default=None,
+                        help="Output file (or directory for --format frames)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    if args.end <= args.start:
+        print("❌ Error: --end must be after --start.")
+        sys.exit(1)
+
+    day = args.day or args.start.strftime("%A")
+    step = datetime.timedelta(seconds=args.step)
+    count = math.ceil((args.end - args.start) / step)
+    frames = animate_artwork(day, iter_timestamps(args.start, args.end, step),
+                             width=args.width, height=args.height, style=args.style)
+    duration = round(1000 / args.fps)
+    stamp = args.start.strftime("%Y%m%d_%H%M%S")
+
+    if args.format == "frames":
+        output = args.output or os.path.join("output", f"timelapse_{stamp}")
+        write_sequence(frames, output)
+    elif args.format == "gif":
+        output = args.output or os.path.join("output", f"timelapse_{stamp}.gif")
+        write_gif(frames, output, duration=duration)
+    else:
+        output = args.output or os.path.join("output", f"timelapse_{stamp}.webp")
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        write_webp(frames, count, output, duration=duration)
+
+    print("✅ Time-lapse generated successfully!")
+    print(f"Day: {day}")
+    print(f"Frames: {count}")
+    print(f"Output: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Declarative configuration files for the art generator.
+
+A config file (JSON, or TOML on Python 3.11+) overrides any part of the
+built-in style table: each day's concept, palette and style, the ranges
+time_influence maps the time of day onto, and the default canvas size.
+Anything it leaves out keeps its built-in value:
+
+    plugins = ["my_styles"]          # modules imported first; they may
+                                     # call generate_art.register_style
+    [canvas]
+    width = 1920
+    height = 1080
+
+    [ranges]
+    complexity = [5, 25]
+    opacity = [120, 230]
+
+    [days.Friday]
+    style = "spiral"
+    colors = ["#f1c40f", [243, 156, 18], "#e74c3c"]
+
+load_config() validates the file once and compiles it into an immutable
+generate_art.StyleTable (tuples of colors, resolved draw functions,
+precomputed range spans), so renders only do dictionary lookups. Making a
+table active is a single reference swap. A ConfigReloader watches the file
+from a long-running process and swaps in each new version. If an edit is
+invalid, the reloader logs it and keeps rendering with the previous table.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import threading
+
+from generate_art import (DEFAULT_STYLES, StyleTable, influence_ranges, shape_functions,
+                          use_styles)
+
+logger = logging.getLogger("generate_art.config")
+
+CONFIG_KEYS = {"plugins", "canvas", "ranges", "days"}
+DAY_KEYS = {"concept", "colors", "style"}
+# Parameters that time_influence turns into whole numbers
+INTEGER_RANGES = {"complexity", "opacity"}
+
+
+def read_config(path):
+    """Parse a .json or .toml config file into a dict."""
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    if extension == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    elif extension == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML config files need Python 3.11 or later; use JSON") from None
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        raise ValueError(f"config files must be .json or .toml, got {os.fspath(path)!r}")
+    if not isinstance(data, dict):
+        raise ValueError("a config file must hold a table of settings")
+    return data
+
+
+def _unknown(keys, allowed, where):
+    extra = sorted(set(keys) - allowed)
+    if extra:
+        raise ValueError(f"{where}: unknown setting(s) {extra}; expected {sorted(allowed)}")
+
+
+def _color(value, where):
+    """Return an RGB tuple from "#rrggbb" or [r, g, b]."""
+    if isinstance(value, str) and len(value) == 7 and value.startswith("#"):
+        try:
+            return tuple(int(value[i:i + 2], 16) for i in (1, 3, 5))
+        except ValueError:
+            pass
+    elif (isinstance(value, (list, tuple)) and len(value) == 3
+          and all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255
+                  for c in value)):
+        return tuple(value)
+    raise ValueError(f"{where}: colors must be '#rrggbb' or [r, g, b] with 0-255 values, "
+                     f"got {value!r}")
+
+
+def _range(name, value, where):
+    if (not isinstance(value, (list, tuple)) or len(value) != 2
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)):
+        raise ValueError(f"{where}: expected [low, high], got {value!r}")
+    low, high = value
+    if low > high:
+        raise ValueError(f"{where}: low {low} is above high {high}")
+    if name in INTEGER_RANGES and not all(isinstance(v, int) for v in value):
+        raise ValueError(f"{where}: {name} takes whole numbers")
+    if name == "complexity" and low < 1:
+        raise ValueError(f"{where}: complexity must be at least 1")
+    if name == "opacity" and not 0 <= low <= high <= 255:
+        raise ValueError(f"{where}: opacity must lie within 0-255")
+    return low, high
+
+
+def _table(data, name):
+    """Return the sub-table ``name`` of a config, which must be a table if given."""
+    value = data.get(name, {})
+    if not isinstance(value, dict):
+        raise ValueError(f"{name}: expected a table of settings, got {value!r}")
+    return value
+
+
+def compile_config(data, base=DEFAULT_STYLES):
+    """
+    Validate a config dict and compile it into a StyleTable.
+
+    Settings the config leaves out are taken from ``base``. Plugin modules
+    are imported before styles are resolved, so styles they register can be
+    named. Raises ValueError naming the offending setting.
+    """
+    _unknown(data, CONFIG_KEYS, "config")
+    plugins = data.get("plugins", [])
+    if not isinstance(plugins, list) or not all(isinstance(name, str) for name in plugins):
+        raise ValueError("plugins: expected a list of module names")
+    for name in plugins:
+        try:
+            importlib.import_module(name)
+        except Exception as error:
+            raise ValueError(f"plugins: cannot import {name!r}: {error}") from error
+
+    concepts = {day: entry[0] for day, entry in base.days.items()}
+    colors = {day: entry[1] for day, entry in base.days.items()}
+    styles = {day: entry[2] for day, entry in base.days.items()}
+    for day, entry in _table(data, "days").items():
+        where = f"days.{day}"
+        if day not in concepts:
+            raise ValueError(f"{where}: unknown day; expected one of {list(concepts)}")
+        if not isinstance(entry, dict):
+            raise ValueError(f"{where}: expected a table of settings")
+        _unknown(entry, DAY_KEYS, where)
+        if "concept" in entry:
+            concepts[day] = str(entry["concept"])
+        if "colors" in entry:
+            if not isinstance(entry["colors"], list) or not entry["colors"]:
+                raise ValueError(f"{where}.colors: expected a non-empty list of colors")
+            colors[day] = tuple(_color(value, f"{where}.colors") for value in entry["colors"])
+        if "style" in entry:
+            if entry["style"] not in shape_functions:
+                raise ValueError(f"{where}.style: unknown style {entry['style']!r}; "
+                                 f"choose one of {sorted(shape_functions)}")
+            styles[day] = entry["style"]
+
+    ranges = {name: (low, low + span) for name, (low, span) in base.ranges.items()}
+    _unknown(_table(data, "ranges"), set(influence_ranges), "ranges")
+    for name, value in _table(data, "ranges").items():
+        ranges[name] = _range(name, value, f"ranges.{name}")
+
+    canvas = dict(zip(("width", "height"), base.canvas))
+    _unknown(_table(data, "canvas"), set(canvas), "canvas")
+    for name, value in _table(data, "canvas").items():
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"canvas.{name}: expected a positive whole number, got {value!r}")
+        canvas[name] = value
+
+    # Identifies the resolved settings, e.g. for render_cache keys
+    resolved = [concepts, colors, styles, ranges, canvas]
+    fingerprint = hashlib.sha256(json.dumps(resolved, sort_keys=True).encode()).hexdigest()[:16]
+    return StyleTable(concepts, colors, styles, ranges, (canvas["width"], canvas["height"]),
+                      fingerprint)
+
+
+def load_config(path, activate=True):
+    """Read, validate and compile a config file; by default also make it active."""
+    table = compile_config(read_config(path))
+    if activate:
+        use_styles(table)
+    return table
+
+
+class ConfigReloader:
+    """
+    Keep the active style table in step with a config file.
+
+    The file is loaded (and must be valid) when the reloader is created.
+    check() reloads it if its modification time or size changed since, and
+    start() runs check() every ``interval`` seconds on a daemon thread for
+    long-running processes. A file that fails to load is logged to the
+    ``generate_art.config`` logger and the previous table stays active.
+    """
+
+    def __init__(self, path, interval=2.0):
+        self.path = path
+        self.interval = interval
+        self.reloads = 0
+        self.errors = 0
+        self._signature = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._load()
+
+    def _load(self):
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return False
+        table = load_config(self.path, activate=False)
+        use_styles(table)
+        self._signature = signature
+        self.table = table
+        return True
+
+    def check(self):
+        """Reload the file if it changed; return True if a new table was activated."""
+        try:
+            reloaded = self._load()
+        except Exception as error:
+            # Whatever a bad edit raises, keep the last good table and keep watching
+            self.errors += 1
+            logger.warning("keeping the current config; reloading %s failed: %s", self.path, error)
+            return False
+        if reloaded:
+            self.reloads += 1
+            logger.info("reloaded config %s (%s)", self.path, self.table.fingerprint)
+        return reloaded
+
+    def start(self):
+        """Check the file every ``interval`` seconds on a background thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="config-reloader",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def configure(path, reload_interval=None):
+    """
+    Load the config at path for this process, returning the ConfigReloader.
+
+    With ``reload_interval`` the file is also watched for changes. Also
+    usable as a worker-pool initializer, so each worker process loads it.
+    """
+    reloader = ConfigReloader(path, reload_interval or 2.0)
+    if reload_interval:
+        reloader.start()
+    return reloader
@@ -0,0 +1,213 @@
+"""
+Batch renderer for pre-generating artwork over a range of timestamps.
+
+Each timestamp is rendered with generate_art.generate_artwork in a worker
+process (or thread) that writes its PNG straight to disk, so only file paths
+travel back to the parent and at most a fixed window of renders is in flight
+at once.
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from art_config import configure
+from generate_art import active_styles, generate_artwork, use_styles
+from image_derivatives import render_derivatives
+from image_encoders import FORMATS, ImageEncoder
+
+
+def iter_timestamps(start, end, step):
+    """Yield datetimes from start (inclusive) to end (exclusive) every step."""
+    if step <= datetime.timedelta(0):
+        raise ValueError("step must be a positive duration")
+    current = start
+    while current < end:
+        yield current
+        current += step
+
+
+def output_path_for(output_dir, time_obj, extension=".png"):
+    """Return the file path used for the artwork rendered at time_obj."""
+    timestamp = time_obj.strftime("%Y%m%d_%H%M%S")
+    if time_obj.microsecond:
+        timestamp += f"_{time_obj.microsecond:06d}"
+    return os.path.join(output_dir, f"artwork_{timestamp}{extension}")
+
+
+def render_one(time_obj, width, height, output_dir, encoder_options=None, sizes=None):
+    """
+    Render and save the artwork for a single timestamp, returning its path.
+
+    With ``sizes`` the downscaled derivatives are written next to it as well.
+    """
+    day = time_obj.strftime("%A")
+    encoder_options = encoder_options or {"fmt": "png"}
+    if sizes:
+        with ImageEncoder(background=True, workers=len(sizes) + 1, **encoder_options) as encoder:
+            output_path = output_path_for(output_dir, time_obj, encoder.extension)
+            render_derivatives(day, time_obj, width=width, height=height, sizes=sizes,
+                               output_path=output_path, encoder=encoder)
+        return output_path
+    encoder = ImageEncoder(**encoder_options)
+    output_path = output_path_for(output_dir, time_obj, encoder.extension)
+    generate_artwork(day, time_obj, width=width, height=height,
+                     output_path=output_path, encoder=encoder)
+    return output_path
+
+
+EXECUTORS = {
+    "process": ProcessPoolExecutor,
+    "thread": ThreadPoolExecutor,
+}
+
+
+def render_batch(start, end, step, width=None, height=None, output_dir="output",
+                 workers=None, max_pending=None, progress=None, executor="process",
+                 encoder_options=None, sizes=None, config=None, reload_interval=None):
+    """
+    Render every timestamp in [start, end) and write the images to output_dir.
+
+    Renders are spread over a pool of ``workers`` (defaults to the CPU count;
+    ``1`` renders in the current process). ``executor`` selects a "process"
+    pool or a "thread" pool; threads avoid process start-up and pickling and
+    still overlap well because Pillow releases the GIL while drawing,
+    compositing and encoding. At most ``max_pending`` renders are queued at
+    once so memory stays bounded no matter how long the time range is.
+    Output is identical for any worker count or executor because every
+    render uses its own generator seeded from its timestamp.
+
+    ``encoder_options`` are keyword arguments for image_encoders.ImageEncoder
+    (format, compression level, ...) and default to plain PNG. ``sizes``
+    also writes downscaled derivatives of every image, e.g. (512, 128); see
+    image_derivatives.
+
+    ``config`` is an art_config file loaded before rendering, in every
+    worker process too; the size defaults to its canvas. With
+    ``reload_interval`` (seconds) it is watched and later renders pick up
+    edits without restarting the batch. The previous style table is restored
+    when the batch ends.
+
+    Returns a dict with the number of images, elapsed seconds and images/sec.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {sorted(EXECUTORS)}, got {executor!r}")
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    os.makedirs(output_dir, exist_ok=True)
+    previous_styles = active_styles()
+    reloader = None
+    pool_options = {}
+    if config:
+        reloader = configure(config, reload_interval)
+        if executor == "process":
+            pool_options = {"initializer": configure, "initargs": (config, reload_interval)}
+
+    count = 0
+    started = time.perf_counter()
+    timestamps = iter_timestamps(start, end, step)
+
+    try:
+        if workers == 1:
+            for time_obj in timestamps:
+                path = render_one(time_obj, width, height, output_dir, encoder_options, sizes)
+                count += 1
+                if progress:
+                    progress(count, path)
+        else:
+            with EXECUTORS[executor](max_workers=workers, **pool_options) as pool:
+                pending = set()
+                for time_obj in timestamps:
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            count += 1
+                            if progress:
+                                progress(count, future.result())
+                    pending.add(pool.submit(render_one, time_obj, width, height, output_dir,
+                                            encoder_options, sizes))
+                for future in wait(pending).done:
+                    count += 1
+                    if progress:
+                        progress(count, future.result())
+    finally:
+        if reloader is not None:
+            reloader.stop()
+            use_styles(previous_styles)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "images": count,
+        "seconds": elapsed,
+        "images_per_second": count / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Pre-render artwork for every step in a time range."
+    )
+    parser.add_argument("--start", required=True, type=datetime.datetime.fromisoformat,
+                        help="First timestamp to render (ISO format, e.g. 2024-01-01T00:00)")
+    parser.add_argument("--end", required=True, type=datetime.datetime.fromisoformat,
+                        help="Stop before this timestamp (ISO format)")
+    parser.add_argument("--step", type=float, default=60,
+                        help="Seconds between rendered timestamps (default: 60)")
+    parser.add_argument("--width", type=int, default=None,
+                        help="Image width in pixels (default: the config's canvas, 800)")
+    parser.add_argument("--height", type=int, default=None,
+                        help="Image height in pixels (default: the config's canvas, 600)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of workers (default: CPU count)")
+    parser.add_argument("--threads", action="store_true",
+                        help="Render with a thread pool instead of worker processes")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="png",
+                        help="Output image format (default: png)")
+    parser.add_argument("--compress-level", type=int, default=None,
+                        help="PNG zlib level (0-9) or WebP method (0-6)")
+    parser.add_argument("--quality", type=int, default=None,
+                        help="JPEG / lossy WebP quality (1-100)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=None,
+                        help="Also write derivatives with these longest edges (e.g. 512 128)")
+    parser.add_argument("--output-dir", default=os.path.join("output", "batch"),
+                        help="Directory to write the rendered images to")
+    parser.add_argument("--config", default=None,
+                        help="JSON or TOML config with palettes, styles and ranges "
+                             "(see art_config)")
+    parser.add_argument("--reload-interval", type=float, default=None,
+                        help="Check the config for edits every this many seconds")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    if args.end <= args.start:
+        print("❌ Error: --end must be after --start.")
+        sys.exit(1)
+
+    def report(count, path):
+        if count % 100 == 0:
+            print(f"  {count} images rendered (latest: {path})")
+
+    print(f"Rendering {args.start} → {args.end} every {args.step:g}s into {args.output_dir}...")
+    stats = render_batch(
+        args.start, args.end, datetime.timedelta(seconds=args.step),
+        width=args.width, height=args.height, output_dir=args.output_dir,
+        workers=args.workers, progress=report,
+        executor="thread" if args.threads else "process",
+        encoder_options={"fmt": args.format, "compress_level": args.compress_level,
+                         "quality": args.quality},
+        sizes=args.sizes, config=args.config, reload_interval=args.reload_interval,
+    )
+
+    print("✅ Batch render complete!")
+    print(f"Images: {stats['images']}")
+    print(f"Elapsed: {stats['seconds']:.2f}s")
+    print(f"Throughput: {stats['images_per_second']:.1f} images/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark high-volume rendering against per-shape ImageDraw calls.
+
+For 10 to 100,000 primitives on a 1080p canvas, compares drawing each shape
+with its own ImageDraw call (coordinates built in Python, as the draw_*
+functions do) with BulkCanvas, which generates and rasterizes them all as
+NumPy arrays with anti-aliasing and blending. Circles and organic blobs
+are measured; times cover only the shapes, not the gradient or encode.
+
+Run from the repository root:
+
+    python benchmarks/bench_bulk.py
+"""
+
+import datetime
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bulk_raster import BulkCanvas, bulk_styles
+from generate_art import day_colors, time_influence
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+WIDTH, HEIGHT = 1920, 1080
+COUNTS = [10, 100, 1000, 10000, 100000]
+REPEAT = 3
+
+
+def imagedraw_circles(image, colors, influence, generator, count):
+    draw = ImageDraw.Draw(image, "RGBA")
+    scale = min(1.0, math.sqrt(influence["complexity"] * 2 / count))
+    for i in range(count):
+        x = int(generator.integers(0, WIDTH + 1))
+        y = int(generator.integers(0, HEIGHT + 1))
+        radius = (20 * influence["size"] + int(generator.integers(10, 51))) * scale
+        color = colors[i % len(colors)] + (influence["opacity"],)
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=color)
+
+
+def imagedraw_organic(image, colors, influence, generator, count):
+    draw = ImageDraw.Draw(image, "RGBA")
+    scale = min(1.0, math.sqrt(influence["complexity"] / count))
+    for i in range(count):
+        cx = int(generator.integers(50, WIDTH - 49))
+        cy = int(generator.integers(50, HEIGHT - 49))
+        vertices = int(generator.integers(6, 11))
+        points = []
+        for j in range(vertices):
+            angle = 2 * math.pi * j / vertices
+            radius = (30 * influence["size"] + int(generator.integers(10, 41))) * scale
+            points.append((cx + radius * math.cos(angle), cy + radius * math.sin(angle)))
+        draw.polygon(points, fill=colors[i % len(colors)] + (influence["opacity"],))
+
+
+def bulk(style):
+    def render(image, colors, influence, generator, count):
+        canvas = BulkCanvas(WIDTH, HEIGHT)
+        bulk_styles[style](canvas, WIDTH, HEIGHT, colors, influence, generator, count)
+        canvas.composite(image)
+    return render
+
+
+def best_of(function, count):
+    colors = day_colors["Friday"]
+    influence = time_influence(SAMPLE_TIME)
+    best = float("inf")
+    for _ in range(REPEAT):
+        image = Image.new("RGB", (WIDTH, HEIGHT), colors[0])
+        generator = np.random.default_rng(1)
+        start = time.perf_counter()
+        function(image, colors, influence, generator, count)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"Shapes on a {WIDTH}x{HEIGHT} canvas (best of {REPEAT})\n")
+    print(f"{'style':>8} {'count':>8} {'ImageDraw':>11} {'bulk':>11} {'bulk/shape':>11}")
+    cases = [("circles", imagedraw_circles), ("organic", imagedraw_organic)]
+    for style, imagedraw in cases:
+        for count in COUNTS:
+            draw_time = best_of(imagedraw, count)
+            bulk_time = best_of(bulk(style), count)
+            print(f"{style:>8} {count:>8} {draw_time * 1000:>9.1f}ms {bulk_time * 1000:>9.1f}ms "
+                  f"{bulk_time / count * 1e6:>9.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark producing 128px, 512px and full-size versions of one artwork.
+
+Compares three separate generate_artwork renders (one per size, which also
+changes the layout), rendering once then reloading the PNG to resize it
+with LANCZOS, and render_derivatives' single render with reduced previews
+written through shared background encoders.
+
+Run from the repository root:
+
+    python benchmarks/bench_derivatives.py
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_art import generate_artwork
+from image_derivatives import DEFAULT_SIZES, derivative_path, derivative_size, render_derivatives
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+RESOLUTIONS = [(1920, 1080), (3840, 2160)]
+REPEAT = 3
+
+
+def separate_renders(width, height, output_path):
+    generate_artwork("Friday", SAMPLE_TIME, width, height, output_path=output_path)
+    for size in DEFAULT_SIZES:
+        preview_width, preview_height = derivative_size(width, height, size)
+        generate_artwork("Friday", SAMPLE_TIME, preview_width, preview_height,
+                         output_path=derivative_path(output_path, size))
+
+
+def reload_and_resize(width, height, output_path):
+    generate_artwork("Friday", SAMPLE_TIME, width, height, output_path=output_path)
+    with Image.open(output_path) as image:
+        image.load()
+        for size in DEFAULT_SIZES:
+            preview = image.resize(derivative_size(width, height, size), Image.Resampling.LANCZOS)
+            preview.save(derivative_path(output_path, size))
+
+
+def single_pass(width, height, output_path):
+    render_derivatives("Friday", SAMPLE_TIME, width, height, output_path=output_path)
+
+
+def best_of(function, *args):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"Full size plus {', '.join(f'{size}px' for size in DEFAULT_SIZES)} previews "
+          f"(best of {REPEAT})\n")
+    print(f"{'resolution':>12} {'3 renders':>12} {'reload+resize':>14} {'single pass':>12}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, "art.png")
+        for width, height in RESOLUTIONS:
+            times = [best_of(function, width, height, output_path) * 1000
+                     for function in (separate_renders, reload_and_resize, single_pass)]
+            print(f"{f'{width}x{height}':>12} {times[0]:>10.1f}ms {times[1]:>12.1f}ms "
+                  f"{times[2]:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark download throughput and peak memory against a local HTTP server.
+
+Compares the old per-call requests.get(url).content approach with
+ImageDownloader's pooled, streaming downloads, one at a time and several at
+once. Peak memory is the largest amount of Python-allocated memory traced
+while downloading, which is where whole response bodies end up.
+
+Run from the repository root:
+
+    python benchmarks/bench_download.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from image_downloader import ImageDownloader
+from stub_image_server import StubImageServer
+
+FILE_COUNT = 16
+FILE_SIZE = 8 * 1024 * 1024
+
+
+def naive(urls, tmpdir):
+    for index, url in enumerate(urls):
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        with open(os.path.join(tmpdir, f"{index}.png"), "wb") as f:
+            f.write(response.content)
+
+
+def pooled(urls, tmpdir):
+    with ImageDownloader(pool_size=1) as downloader:
+        for index, url in enumerate(urls):
+            downloader.download(url, os.path.join(tmpdir, f"{index}.png"))
+
+
+def pooled_parallel(urls, tmpdir):
+    with ImageDownloader(pool_size=4) as downloader:
+        jobs = [(url, os.path.join(tmpdir, f"{index}.png")) for index, url in enumerate(urls)]
+        for result in downloader.download_many(jobs):
+            if isinstance(result, Exception):
+                raise result
+
+
+def main():
+    files = {f"image_{i}.png": os.urandom(FILE_SIZE) for i in range(FILE_COUNT)}
+    total = FILE_COUNT * FILE_SIZE
+    with StubImageServer(files=files) as stub:
+        urls = [stub.file_url(name) for name in files]
+        print(f"{FILE_COUNT} files × {FILE_SIZE / 2**20:.0f} MiB")
+        print(f"{'method':>22} {'MiB/s':>9} {'peak MiB':>9} {'connections':>12}")
+        for label, func in [("requests.get", naive), ("pooled, streaming", pooled),
+                            ("pooled, 4 at once", pooled_parallel)]:
+            connections = stub.connections
+            with tempfile.TemporaryDirectory() as tmpdir:
+                tracemalloc.start()
+                start = time.perf_counter()
+                func(urls, tmpdir)
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            print(f"{label:>22} {total / elapsed / 2**20:>9.1f} {peak / 2**20:>9.1f} "
+                  f"{stub.connections - connections:>12}")
+
+
+if __name__ == "__main__":
+    main()
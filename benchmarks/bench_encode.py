@@ -0,0 +1,60 @@
+"""
+Benchmark encode time and output size for each output format.
+
+Run from the repository root:
+
+    python benchmarks/bench_encode.py
+"""
+
+import datetime
+import io
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_art import generate_artwork
+from image_encoders import ImageEncoder
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+
+CONFIGS = [
+    ("png (default)", {"fmt": "png"}),
+    ("png level 1", {"fmt": "png", "compress_level": 1}),
+    ("png level 9", {"fmt": "png", "compress_level": 9}),
+    ("png optimize", {"fmt": "png", "optimize": True}),
+    ("webp lossless", {"fmt": "webp", "lossless": True, "compress_level": 0}),
+    ("webp q80", {"fmt": "webp", "quality": 80}),
+    ("jpeg q90", {"fmt": "jpeg", "quality": 90}),
+    ("raw", {"fmt": "raw"}),
+]
+
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "4K": (3840, 2160),
+}
+
+
+def main():
+    for name, (width, height) in RESOLUTIONS.items():
+        image = generate_artwork(SAMPLE_TIME.strftime("%A"), SAMPLE_TIME, width=width,
+                                 height=height)
+        print(f"\n{name} ({width}x{height})")
+        print(f"{'format':>15} {'encode (ms)':>12} {'KiB':>9}")
+        for label, options in CONFIGS:
+            encoder = ImageEncoder(**options)
+            best = float("inf")
+            size = 0
+            for _ in range(3):
+                buffer = io.BytesIO()
+                start = time.perf_counter()
+                encoder.encode(image, buffer)
+                best = min(best, time.perf_counter() - start)
+                size = buffer.tell()
+            print(f"{label:>15} {best * 1000:>12.1f} {size / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
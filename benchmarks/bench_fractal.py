@@ -0,0 +1,104 @@
+"""
+Benchmark the fractal tree style at depths 8 to 17 on a 1080p canvas.
+
+For each depth, a naive recursive expander that calls draw.line once per
+branch as it goes is compared with fractal_tree_segments plus one
+draw.line per segment, with the budget of the highest complexity the
+default influence ranges give (just before midnight, with the most
+microseconds). The unbounded tree doubles with every level. The budgeted
+one stops growing once the budget is spent, so its time and peak memory
+level off. Run from the repository root:
+
+    python benchmarks/bench_fractal.py
+"""
+
+import datetime
+import math
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_art import (DEFAULT_STYLES, FRACTAL_SEGMENTS_PER_COMPLEXITY, fractal_tree_segments,
+                          time_influence)
+
+WIDTH, HEIGHT = 1920, 1080
+TREES = 3
+# Complexity grows with the time of day and the microseconds, so it peaks here
+LATEST = datetime.datetime(2024, 1, 1, 23, 59, 59, 999999)
+COMPLEXITY = time_influence(LATEST, DEFAULT_STYLES.ranges)["complexity"]
+# The deepest tree draw_fractal_tree grows at that complexity
+DEPTHS = [8, 10, 12, 14, 16, 6 + COMPLEXITY // 2]
+FILL = (46, 204, 113, 220)
+
+
+def recursive_tree(draw, x, y, angle, length, depth, rng, spread=0.45, decay=0.72):
+    """Reference: one draw.line call per branch, recursing into both children."""
+    x1 = x + length * math.cos(angle)
+    y1 = y + length * math.sin(angle)
+    draw.line([x, y, x1, y1], fill=FILL, width=max(1, depth // 3))
+    if depth > 1:
+        for side in (-1, 1):
+            recursive_tree(draw, x1, y1, angle + side * spread * rng.uniform(0.6, 1.4),
+                           length * decay * rng.uniform(0.8, 1.1), depth - 1, rng)
+
+
+def traced(function):
+    """Return (seconds, peak traced MiB) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    budget = COMPLEXITY * FRACTAL_SEGMENTS_PER_COMPLEXITY
+    x = (np.arange(TREES) + 0.5) * WIDTH / TREES
+    length = HEIGHT * 0.25
+
+    print(f"Fractal trees at {WIDTH}x{HEIGHT}, {TREES} trees, complexity {COMPLEXITY}, "
+          f"budget {budget} segments\n")
+    print(f"{'depth':>5} {'unbounded':>10} {'recursive':>10} {'budgeted':>9} "
+          f"{'expand':>9} {'draw':>9} {'peak MiB':>9}")
+    for depth in DEPTHS:
+        unbounded = TREES * (2 ** depth - 1)
+
+        image = Image.new("RGBA", (WIDTH, HEIGHT))
+        rng = np.random.default_rng(1)
+        draw = ImageDraw.Draw(image)
+        start = time.perf_counter()
+        for tree_x in x:
+            recursive_tree(draw, tree_x, HEIGHT, -math.pi / 2, length, depth, rng)
+        recursive = time.perf_counter() - start
+
+        result = {}
+
+        def expand():
+            result["segments"], result["levels"] = fractal_tree_segments(
+                x, HEIGHT, length, depth, budget, np.random.default_rng(1))
+
+        expand_time, peak = traced(expand)
+        image = Image.new("RGBA", (WIDTH, HEIGHT))
+        draw = ImageDraw.Draw(image)
+        widths = [max(1, (depth - level) // 3) for level in range(depth)]
+        start = time.perf_counter()
+        for xy, level in zip(result["segments"].tolist(), result["levels"].tolist()):
+            draw.line(xy, fill=FILL, width=widths[level])
+        draw_time = time.perf_counter() - start
+
+        print(f"{depth:>5} {unbounded:>10} {recursive * 1000:>8.0f}ms "
+              f"{len(result['segments']):>9} {expand_time * 1000:>7.1f}ms "
+              f"{draw_time * 1000:>7.0f}ms {peak:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
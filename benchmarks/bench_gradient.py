@@ -0,0 +1,48 @@
+"""
+Benchmark the vectorized background gradient against the row-by-row loop.
+
+Run from the repository root:
+
+    python benchmarks/bench_gradient.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_art import day_colors, gradient_background, _gradient_background_loop
+
+RESOLUTIONS = {
+    "800x600": (800, 600),
+    "1080p": (1920, 1080),
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+}
+
+
+def best_of(func, repeats, *args):
+    """Return the fastest wall time in seconds over several runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    base_color = day_colors["Monday"][0]
+    print(f"{'resolution':>10} {'loop (ms)':>11} {'numpy (ms)':>11} {'speedup':>8}")
+    for name, (width, height) in RESOLUTIONS.items():
+        repeats = 5 if width < 4000 else 3
+        loop_time = best_of(_gradient_background_loop, repeats, base_color, width, height)
+        fast_time = best_of(gradient_background, repeats, base_color, width, height)
+        print(f"{name:>10} {loop_time * 1000:>11.1f} {fast_time * 1000:>11.1f} "
+              f"{loop_time / fast_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark startup cost of generate_ai_art.
+
+Uses ``python -X importtime`` to measure how long importing the module takes
+(and which imports dominate), then times complete ``--dry-run`` and
+``--help`` invocations. Each measurement runs in a fresh interpreter and the
+best of several runs is reported. The OpenAI SDK import is shown for
+comparison: that is what every run used to pay before the client became lazy.
+
+Run from the repository root:
+
+    python benchmarks/bench_import.py
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNS = 5
+
+
+def import_times(module):
+    """Return {module: cumulative microseconds} from -X importtime for one import."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+
+def best_import(module):
+    return min(import_times(module)[module] for _ in range(RUNS)) / 1000
+
+
+def best_wall(args):
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print(f"{'measurement':>40} {'ms':>9}")
+    print(f"{'import generate_ai_art':>40} {best_import('generate_ai_art'):>9.1f}")
+    print(f"{'import openai (for comparison)':>40} {best_import('openai'):>9.1f}")
+    print(f"{'python -c pass (interpreter start)':>40} {best_wall(['-c', 'pass']):>9.1f}")
+    print(f"{'generate_ai_art.py --dry-run':>40} "
+          f"{best_wall(['generate_ai_art.py', '--dry-run', '--seed', '1']):>9.1f}")
+    print(f"{'generate_ai_art.py --help':>40} {best_wall(['generate_ai_art.py', '--help']):>9.1f}")
+
+    times = import_times("generate_ai_art")
+    print("\nSlowest imports under generate_ai_art (cumulative):")
+    for name, us in sorted(times.items(), key=lambda item: -item[1])[:8]:
+        print(f"{name:>40} {us / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
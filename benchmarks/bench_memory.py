@@ -0,0 +1,95 @@
+"""
+Measure peak memory and Pillow image allocations per render.
+
+Compares the original compositing chain (RGBA base, RGBA overlay,
+alpha_composite, RGB convert, rotate) with the in-place pipeline used by
+generate_artwork. Each measurement runs in a fresh interpreter so the peak
+RSS reflects a single render. Run from the repository root:
+
+    python benchmarks/bench_memory.py
+"""
+
+import datetime
+import resource
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+}
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+
+
+def legacy_artwork(day, time_obj, width, height):
+    """The compositing chain generate_artwork used before rendering in place."""
+    import random
+    from PIL import Image, ImageDraw
+    import generate_art
+
+    rng = random.Random(time_obj.timestamp())
+    colors = generate_art.day_colors[day]
+    influence = generate_art.time_influence(time_obj)
+    image = generate_art.gradient_background(colors[0], width, height)
+    overlay = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    shape_func = getattr(generate_art, f"draw_{generate_art.day_shapes[day]}")
+    shape_func(ImageDraw.Draw(overlay), width, height, colors, influence, rng)
+    image = Image.alpha_composite(image, overlay)
+    final_image = image.convert("RGB")
+    rotation = influence["angle"] % 10 - 5
+    if rotation != 0:
+        final_image = final_image.rotate(rotation, expand=False, fillcolor=(255, 255, 255))
+    return final_image
+
+
+def child(pipeline, width, height):
+    """Render once in this process and print peak RSS growth and Pillow MiB allocated."""
+    from PIL import Image
+    from generate_art import generate_artwork
+
+    render = legacy_artwork if pipeline == "legacy" else generate_artwork
+    day = SAMPLE_TIME.strftime("%A")
+    # Warm up imports and allocator state on a tiny canvas first
+    render(day, SAMPLE_TIME, 16, 16)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    before = Image.core.get_stats()["allocated_blocks"]
+    render(day, SAMPLE_TIME, width, height)
+    blocks = Image.core.get_stats()["allocated_blocks"] - before
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    allocated_mb = blocks * Image.core.get_block_size() / (1024 * 1024)
+    print(f"{(peak_kb - baseline_kb) / 1024:.1f} {allocated_mb:.1f}")
+
+
+def measure(pipeline, width, height):
+    """Run one render in a subprocess and return (peak MiB, allocated MiB)."""
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", pipeline, str(width), str(height)],
+        check=True, capture_output=True, text=True
+    ).stdout.split()
+    return float(output[0]), float(output[1])
+
+
+def main():
+    print("Peak RSS growth and Pillow block allocations per render, in MiB")
+    print("(one frame = 4 bytes/pixel; Pillow allocates in 16 MiB blocks)")
+    print(f"{'resolution':>10} {'frame':>7} {'legacy peak':>12} {'new peak':>9} "
+          f"{'legacy alloc':>13} {'new alloc':>10}")
+    for name, (width, height) in RESOLUTIONS.items():
+        legacy_peak, legacy_alloc = measure("legacy", width, height)
+        new_peak, new_alloc = measure("inplace", width, height)
+        frame_mb = width * height * 4 / (1024 * 1024)
+        print(f"{name:>10} {frame_mb:>7.1f} {legacy_peak:>12.1f} {new_peak:>9.1f} "
+              f"{legacy_alloc:>13.1f} {new_alloc:>10.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+    else:
+        main()
@@ -0,0 +1,81 @@
+"""
+Benchmark grading a finished frame by hue, saturation and brightness.
+
+Compares a per-pixel HSV round trip (Image.convert("HSV"), shift the
+channels with NumPy, convert back), a 17^3 Color3DLUT filter and
+palettes.apply_grade, which uses a cached color matrix plus a point()
+table. The table build time is reported separately, since it only happens
+once per minute of the day.
+
+Run from the repository root:
+
+    python benchmarks/bench_palette.py
+"""
+
+import datetime
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_art import generate_artwork, time_grade
+from palettes import apply_grade, grade_tables
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 19, 30, 7)
+RESOLUTIONS = [(1920, 1080), (3840, 2160)]
+REPEAT = 5
+LUT_SIZE = 17
+
+
+def hsv_round_trip(image, grade):
+    hue_shift, saturation, brightness = grade
+    hsv = np.array(image.convert("HSV"), dtype=np.float32)
+    hsv[..., 0] = (hsv[..., 0] + hue_shift * 256 / 360) % 256
+    hsv[..., 1] *= 1 - 0.5 * (1 - saturation)
+    hsv[..., 2] *= 1 - 0.5 * (1 - brightness)
+    return Image.fromarray(hsv.astype(np.uint8), "HSV").convert("RGB")
+
+
+def color_lut(grade):
+    hue_shift, saturation, brightness = grade
+    axis = np.linspace(0, 1, LUT_SIZE, dtype=np.float32)
+    blue, green, red = np.meshgrid(axis, axis, axis, indexing="ij")
+    rgb = np.stack([red, green, blue], axis=-1).reshape(-1, 3)
+    image = Image.fromarray((rgb[None] * 255).round().astype(np.uint8))
+    graded = np.asarray(hsv_round_trip(image, grade), dtype=np.float32)[0] / 255
+    return ImageFilter.Color3DLUT(LUT_SIZE, graded)
+
+
+def best_of(function, *args):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    grade = time_grade(SAMPLE_TIME)
+    grade_tables.cache_clear()
+    build = best_of(lambda: (grade_tables.cache_clear(), grade_tables(*grade)))
+    lut_build = best_of(color_lut, grade)
+    lut = color_lut(grade)
+    print(f"Frame grading (best of {REPEAT}); tables: matrix+point {build * 1000:.2f}ms, "
+          f"Color3DLUT {lut_build * 1000:.2f}ms\n")
+    print(f"{'resolution':>12} {'HSV per pixel':>14} {'Color3DLUT':>12} {'apply_grade':>12}")
+    for width, height in RESOLUTIONS:
+        image = generate_artwork("Friday", SAMPLE_TIME, width, height)
+        times = [best_of(hsv_round_trip, image, grade), best_of(image.filter, lut),
+                 best_of(apply_grade, image, grade)]
+        print(f"{f'{width}x{height}':>12} {times[0] * 1000:>12.1f}ms {times[1] * 1000:>10.1f}ms "
+              f"{times[2] * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Benchmark time per Gray-Scott step for several grid sizes.
+
+Run from the repository root:
+
+    python benchmarks/bench_reaction_diffusion.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_art import ReactionDiffusion
+
+GRIDS = [(128, 128), (200, 150), (256, 256), (512, 512), (1024, 1024), (1920, 1080)]
+
+
+def main():
+    print(f"{'grid':>10} {'steps':>6} {'ms/step':>8} {'Mcells/s':>9}")
+    for width, height in GRIDS:
+        sim = ReactionDiffusion(width, height)
+        sim.seed(np.random.default_rng(0), count=20)
+        sim.advance(5)  # warm up
+        steps = max(10, int(2e7 // (width * height)))
+        start = time.perf_counter()
+        sim.advance(steps)
+        per_step = (time.perf_counter() - start) / steps
+        print(f"{f'{width}x{height}':>10} {steps:>6} {per_step * 1000:>8.2f} "
+              f"{width * height / per_step / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
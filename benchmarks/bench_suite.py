@@ -0,0 +1,259 @@
+"""
+Benchmark suite for every registered style across resolutions and complexity.
+
+For each style in shape_functions, each resolution from thumbnail to 8K and
+each complexity (the timestamp's own value plus forced overrides), the render
+runs through generate_artwork itself with a RenderInstrumentation attached,
+so the split into stages (scene, gradient, shapes, composite, grade,
+rotate, encode) is always the pipeline's own. Forced complexities are
+applied with a style table whose complexity range is a single value. Every
+case is repeated and the fastest run of each stage and of the whole render
+is kept.
+
+Results are written as JSON. Passing --baseline compares against a stored
+run and exits non-zero when a case got slower than --threshold allows, so
+the suite can gate changes. Run from the repository root:
+
+    python benchmarks/bench_suite.py --quick                  # thumbnail + 1080p
+    python benchmarks/bench_suite.py --save-baseline          # full run, store as baseline
+    python benchmarks/bench_suite.py --baseline benchmarks/results/baseline.json
+"""
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import PIL
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from art_config import compile_config
+from generate_art import (DEFAULT_STYLES, GENERATOR_VERSION, day_shapes, generate_artwork,
+                          shape_functions, time_influence)
+from image_encoders import ImageEncoder
+from render_instrumentation import RenderInstrumentation
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+RESOLUTIONS = {
+    "thumb": (160, 120),
+    "800x600": (800, 600),
+    "1080p": (1920, 1080),
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+}
+
+QUICK_RESOLUTIONS = ["thumb", "1080p"]
+
+# None keeps the complexity the timestamp gives
+COMPLEXITIES = [None, 3, 8, 13]
+
+# Stages in pipeline order; noise_background and grade only run with
+# --background noise and --palette
+STAGES = ["scene", "gradient", "noise_background", "shapes", "composite", "grade", "rotate",
+          "encode"]
+
+# A weekday afternoon with a non-zero rotation, shifted onto each day
+SAMPLE_TIME = datetime.datetime(2024, 1, 1, 14, 30, 7)
+
+
+def sample_time(day):
+    """Return SAMPLE_TIME moved onto the given weekday."""
+    offset = list(day_shapes).index(day)
+    return SAMPLE_TIME + datetime.timedelta(days=offset)
+
+
+def style_day(style):
+    """Return the day whose palette a style is benchmarked with."""
+    for day, day_style in day_shapes.items():
+        if day_style == style:
+            return day
+    # Extra styles take the days in turn so they see different palettes
+    return list(day_shapes)[list(shape_functions).index(style) % len(day_shapes)]
+
+
+@lru_cache(maxsize=None)
+def complexity_styles(complexity):
+    """Return the style table to render with; a forced complexity fixes its range."""
+    if complexity is None:
+        return DEFAULT_STYLES
+    return compile_config({"ranges": {"complexity": [complexity, complexity]}})
+
+
+def instrumented_render(style, time_obj, width, height, complexity=None, background="gradient",
+                        palette=None):
+    """Render through generate_artwork and return its instrumentation record."""
+    instrument = RenderInstrumentation()
+    generate_artwork(style_day(style), time_obj, width=width, height=height,
+                     output_path=io.BytesIO(), encoder=ImageEncoder("png"), style=style,
+                     background=background, palette=palette,
+                     styles=complexity_styles(complexity), instrument=instrument)
+    return instrument.records[-1]
+
+
+def run_case(style, resolution, complexity, repeat, background="gradient", palette=None):
+    """Benchmark one (style, resolution, complexity) case and return its record."""
+    width, height = RESOLUTIONS[resolution]
+    day = style_day(style)
+    time_obj = sample_time(day)
+    best = {}
+    total = float("inf")
+    for _ in range(repeat):
+        render = instrumented_render(style, time_obj, width, height, complexity, background,
+                                     palette)
+        total = min(total, render["seconds"])
+        for stage, record in render["stages"].items():
+            best[stage] = min(best.get(stage, float("inf")), record["seconds"])
+
+    return {
+        "style": style,
+        "day": day,
+        "resolution": resolution,
+        "width": width,
+        "height": height,
+        "complexity": (complexity if complexity is not None
+                       else time_influence(time_obj)["complexity"]),
+        "forced": complexity is not None,
+        "stages_ms": {stage: best[stage] * 1000 for stage in STAGES if stage in best},
+        "total_ms": total * 1000,
+    }
+
+
+def case_key(record):
+    forced = "forced" if record["forced"] else "natural"
+    return f"{record['style']}|{record['resolution']}|{forced}|{record['complexity']}"
+
+
+def environment():
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "generator_version": GENERATOR_VERSION,
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold, min_delta_ms=2.0):
+    """
+    Print a comparison and return the keys that regressed past threshold.
+
+    A case only counts as a regression when it is also at least
+    ``min_delta_ms`` slower, so timer noise on tiny renders is not flagged.
+    """
+    previous = {case_key(record): record for record in baseline["results"]}
+    regressions = []
+    print(f"\nComparison with baseline from {baseline['environment']['date']} "
+          f"(regression threshold {threshold:.2f}x)")
+    print(f"{'case':>42} {'baseline':>10} {'now':>10} {'ratio':>7}")
+    for record in results:
+        key = case_key(record)
+        if key not in previous:
+            continue
+        before = previous[key]["total_ms"]
+        ratio = record["total_ms"] / before if before > 0 else float("inf")
+        flag = ""
+        if ratio > threshold and record["total_ms"] - before >= min_delta_ms:
+            regressions.append(key)
+            flag = "  ⚠️ slower"
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        print(f"{key:>42} {before:>10.1f} {record['total_ms']:>10.1f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def print_table(results):
+    stages = [stage for stage in STAGES
+              if any(stage in record["stages_ms"] for record in results)]
+    print(f"{'style':>18} {'res':>8} {'cx':>3}  "
+          + " ".join(f"{stage[:9]:>9}" for stage in stages) + f" {'total':>9}")
+    for record in results:
+        times = record["stages_ms"]
+        print(f"{record['style']:>18} {record['resolution']:>8} "
+              f"{record['complexity']:>3}{'*' if record['forced'] else ' '} "
+              + " ".join(f"{times[stage]:>9.1f}" if stage in times else f"{'-':>9}"
+                         for stage in stages)
+              + f" {record['total_ms']:>9.1f}")
+    print("(ms, best of repeats; * = forced complexity; - = stage not run)")
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark every style by resolution and complexity.")
+    parser.add_argument("--styles", nargs="+", choices=list(shape_functions),
+                        default=list(shape_functions), help="Styles to benchmark (default: all)")
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS),
+                        default=list(RESOLUTIONS), help="Resolutions to benchmark (default: all)")
+    parser.add_argument("--complexity", nargs="+", type=int, default=None,
+                        help="Forced complexity values (default: 3 8 13, plus the natural value)")
+    parser.add_argument("--quick", action="store_true",
+                        help=f"Only {' and '.join(QUICK_RESOLUTIONS)}")
+    parser.add_argument("--background", choices=["gradient", "noise"], default="gradient",
+                        help="Background to render (default: gradient)")
+    parser.add_argument("--palette", default=None,
+                        help="Dynamic palette to grade with, e.g. dynamic (default: none)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is kept")
+    parser.add_argument("--output", default=str(RESULTS_DIR / "latest.json"),
+                        help="Where to write the JSON results")
+    parser.add_argument("--baseline", default=None, help="JSON results to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"Also store the results as {RESULTS_DIR / 'baseline.json'}")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio counted as a regression (default: 1.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="Ignore slowdowns smaller than this many ms (default: 2)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    resolutions = args.resolutions
+    if args.quick:
+        resolutions = [name for name in resolutions if name in QUICK_RESOLUTIONS]
+    complexities = [None] + args.complexity if args.complexity is not None else COMPLEXITIES
+
+    # Load lazily initialised state (encoders, lookup tables) before timing
+    for style in args.styles:
+        instrumented_render(style, sample_time(style_day(style)), *RESOLUTIONS["thumb"],
+                            background=args.background, palette=args.palette)
+
+    results = []
+    for resolution in resolutions:
+        for style in args.styles:
+            for complexity in complexities:
+                results.append(run_case(style, resolution, complexity, args.repeat,
+                                        args.background, args.palette))
+
+    print_table(results)
+    report = {"environment": environment(), "results": results}
+    paths = [args.output] + ([str(RESULTS_DIR / "baseline.json")] if args.save_baseline else [])
+    for path in paths:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} case(s) slower than "
+                  f"{args.threshold:.2f}x the baseline")
+            sys.exit(1)
+        print("\n✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Measure time and peak memory of tiled rendering against the full frame.
+
+Each measurement runs in a fresh interpreter so the peak RSS reflects a
+single render written to a PNG. The full-frame pipeline is skipped for the
+poster size, where it would need several GiB. Run from the repository root:
+
+    python benchmarks/bench_tiled.py
+    python benchmarks/bench_tiled.py --workers 4 --tile-size 1024
+"""
+
+import argparse
+import datetime
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+RESOLUTIONS = {
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+    "poster": (20000, 15000),
+}
+
+# Largest resolution the full-frame pipeline is run at
+FULL_FRAME_LIMIT = 8000 * 8000
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+
+
+def child(pipeline, width, height, tile_size, workers):
+    """Render once in this process and print peak RSS growth (MiB) and seconds."""
+    from generate_art import generate_artwork
+    from tiled_render import render_tiled
+
+    day = SAMPLE_TIME.strftime("%A")
+    # Warm up imports and allocator state on a tiny canvas first
+    generate_artwork(day, SAMPLE_TIME, 16, 16)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, "art.png")
+        start = time.perf_counter()
+        if pipeline == "tiled":
+            render_tiled(day, SAMPLE_TIME, width, height, output_path, tile_size=tile_size,
+                         workers=workers)
+        else:
+            generate_artwork(day, SAMPLE_TIME, width, height, output_path=output_path)
+        seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{(peak_kb - baseline_kb) / 1024:.1f} {seconds:.3f}")
+
+
+def measure(pipeline, width, height, tile_size, workers):
+    """Run one render in a subprocess and return (peak MiB, seconds)."""
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", pipeline, str(width), str(height),
+         str(tile_size), str(workers)],
+        check=True, capture_output=True, text=True
+    ).stdout.split()
+    return float(output[0]), float(output[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tiled against full-frame rendering.")
+    parser.add_argument("--tile-size", type=int, default=512, help="Tile edge in pixels")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Tile workers (default: CPU count)")
+    args = parser.parse_args()
+
+    print(f"Render + PNG encode; {args.tile_size}px tiles on {args.workers} worker(s)")
+    print(f"{'resolution':>10} {'frame MiB':>10} {'full peak':>10} {'full s':>8} "
+          f"{'tiled peak':>11} {'tiled s':>8}")
+    for name, (width, height) in RESOLUTIONS.items():
+        frame_mb = width * height * 3 / (1024 * 1024)
+        if width * height <= FULL_FRAME_LIMIT:
+            full_peak, full_seconds = measure("full", width, height, args.tile_size, args.workers)
+            full = f"{full_peak:>10.1f} {full_seconds:>8.2f}"
+        else:
+            full = f"{'-':>10} {'-':>8}"
+        tiled_peak, tiled_seconds = measure("tiled", width, height, args.tile_size, args.workers)
+        print(f"{name:>10} {frame_mb:>10.1f} {full} {tiled_peak:>11.1f} {tiled_seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 7 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), int(sys.argv[5]), int(sys.argv[6]))
+    else:
+        main()
@@ -0,0 +1,65 @@
+"""
+Benchmark nearest-site labelling for the Voronoi style.
+
+Compares the grid spatial index with a brute-force scan on a small canvas,
+then times the indexed labelling at 1080p for growing site counts. Run from
+the repository root:
+
+    python benchmarks/bench_voronoi.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_art import voronoi_labels, voronoi_sites
+
+SITE_COUNTS = [100, 1000, 10000, 50000]
+
+
+def brute_force_labels(width, height, sites_x, sites_y):
+    """O(pixels x sites) reference, one pixel row at a time."""
+    flat_x = sites_x.ravel()
+    flat_y = sites_y.ravel()
+    px = np.arange(width, dtype=np.float32) + np.float32(0.5)
+    labels = np.empty((height, width), dtype=np.int32)
+    for y in range(height):
+        dist = (px[:, None] - flat_x) ** 2 + (y + 0.5 - flat_y) ** 2
+        labels[y] = dist.argmin(axis=1)
+    return labels
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    generator = np.random.default_rng(0)
+
+    width, height = 320, 240
+    print(f"{width}x{height}: grid index vs brute force")
+    print(f"{'sites':>7} {'brute (ms)':>11} {'grid (ms)':>10}")
+    for count in SITE_COUNTS[:3]:
+        sites_x, sites_y = voronoi_sites(width, height, count, generator)
+        brute_time, _ = timed(brute_force_labels, width, height, sites_x, sites_y)
+        grid_time, _ = timed(voronoi_labels, width, height, sites_x, sites_y)
+        print(f"{sites_x.size:>7} {brute_time * 1000:>11.1f} {grid_time * 1000:>10.1f}")
+
+    width, height = 1920, 1080
+    print(f"\n{width}x{height}: grid index")
+    print(f"{'sites':>7} {'grid (ms)':>10}")
+    for count in SITE_COUNTS:
+        sites_x, sites_y = voronoi_sites(width, height, count, generator)
+        grid_time, _ = timed(voronoi_labels, width, height, sites_x, sites_y)
+        print(f"{sites_x.size:>7} {grid_time * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
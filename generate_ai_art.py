@@ -3,20 +3,54 @@ import base64
 import datetime
 import os
 import random
+import shutil
 import sys
-import requests
-from openai import OpenAI
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Initialize OpenAI client
-try:
-    client = OpenAI()  # Automatically reads from OPENAI_API_KEY
-    if not os.getenv("OPENAI_API_KEY"):
-        raise ValueError("API key not found")
-except Exception:
+
+from prompt_cache import DEFAULT_CACHE_DIR, PromptCache, prompt_key
+
+# The OpenAI SDK, requests, asyncio and dotenv are imported on first use so
+# that --help, --dry-run and --cache-stats start without loading them.
+_client = None
+
+
+class MissingAPIKeyError(ValueError):
+    """OPENAI_API_KEY is not set in the environment or the .env file."""
+
+
+def load_api_key():
+    """Load .env into the environment and return OPENAI_API_KEY."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise MissingAPIKeyError("API key not found")
+    return api_key
+
+
+def get_client():
+    """Return the shared OpenAI client, creating it on the first call."""
+    global _client
+    if _client is None:
+        api_key = load_api_key()
+        from openai import OpenAI
+
+        _client = OpenAI(api_key=api_key)
+    return _client
+
+
+def get_async_client():
+    """
+    Return a new AsyncOpenAI client with the SDK's own retries disabled;
+    _with_backoff retries the same errors under generate_batch's budget.
+    """
+    api_key = load_api_key()
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=api_key, max_retries=0)
+
+
+def _report_missing_key():
     print("❌ Error: OpenAI API key not found.")
     print("Please add OPENAI_API_KEY to your .env file or environment variables.")
     print("OPENAI_API_KEY=sk-proj-...")
@@ -73,6 +107,24 @@ def parse_arguments():
     parser.add_argument("--dry-run", action="store_true",
                         help="Print the prompt and estimated cost without calling the API")
     parser.add_argument("--seed", type=int, help="Seed the random generator for reproducible prompts")
+    parser.add_argument("--count", type=int, default=1,
+                        help="Number of variations to generate concurrently (default: 1)")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Maximum API requests in flight in batch mode (default: 4)")
+    parser.add_argument("--max-retries", type=int, default=5,
+                        help="Retries per image after a rate-limit, timeout or server error "
+                             "in batch mode (default: 5)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse previously generated images for identical requests "
+                             "(no API call)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Directory of the prompt cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-ttl", type=float, default=None,
+                        help="Hours before a cached image expires (default: never)")
+    parser.add_argument("--cache-max-items", type=int, default=None,
+                        help="Evict the least recently used images beyond this many")
+    parser.add_argument("--cache-stats", action="store_true",
+                        help="Print a report of the prompt cache and exit")
     return parser.parse_args()
 
 def build_prompt(day, hour, style, desc1, desc2, keywords):
@@ -94,13 +146,217 @@ def estimate_cost(quality):
     }
     return pricing.get(quality, 0.04)
 
+def batch_prompts(count, day, hour, keywords, style=None, rng=random):
+    """Build ``count`` prompts, each with its own style and mood unless style is fixed."""
+    prompts = []
+    for _ in range(count):
+        chosen_style = style or rng.choice(art_styles)
+        desc1, desc2 = rng.sample(descriptors, 2)
+        prompts.append(build_prompt(day, hour, chosen_style, desc1, desc2, keywords))
+    return prompts
+
+
+async def _with_backoff(call, max_retries=5, base_delay=1.0, max_delay=30.0):
+    """
+    Await call(), retrying with exponential backoff and jitter on rate limits,
+    timeouts, dropped connections and 5xx responses.
+    """
+    import asyncio
+
+    from openai import APIConnectionError, InternalServerError, RateLimitError
+
+    # APITimeoutError is a subclass of APIConnectionError
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except (RateLimitError, APIConnectionError, InternalServerError):
+            if attempt >= max_retries:
+                raise
+            delay = min(max_delay, base_delay * 2 ** attempt)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            attempt += 1
+
+
+def _write_file(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+async def generate_batch(prompts, model="gpt-image-1", size="1024x1024", quality="auto",
+                         output_dir="output", concurrency=4, max_retries=5, base_delay=1.0,
+                         client=None, downloader=None, progress=None, file_prefix="ai_artwork",
+                         cache=None):
+    """
+    Generate one image per prompt with at most ``concurrency`` requests in flight.
+
+    Rate-limited, timed-out, dropped and 5xx requests are retried up to
+    ``max_retries`` times with exponential backoff starting at ``base_delay``
+    seconds. Each image is downloaded (or decoded from its base64 payload)
+    and written to output_dir as soon as it arrives, and
+    ``progress(count, path)`` is called after every write. ``client``
+    defaults to get_async_client(); ``downloader`` is the
+    image_downloader.ImageDownloader whose pooled connections stream the
+    images to disk.
+
+    Identical prompts in the batch are only generated once; the other copies
+    wait for that request and copy its file. With a prompt_cache.PromptCache
+    as ``cache``, cached images are copied without calling the API and new
+    ones are added to the cache.
+
+    Returns a list with, for each prompt in order, the saved path or the
+    exception that made that image fail.
+    """
+    import asyncio
+
+    from image_downloader import ImageDownloader
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    own_client = client is None
+    own_downloader = downloader is None
+    downloader = downloader or ImageDownloader(pool_size=concurrency)
+    os.makedirs(output_dir, exist_ok=True)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    completed = 0
+
+    in_flight = {}
+
+    async def produce(key, prompt, file_name):
+        nonlocal client
+        if cache is not None and await asyncio.to_thread(cache.fetch, key, file_name):
+            return file_name
+        if client is None:
+            # Created on the first miss, so a fully cached batch needs no key
+            client = get_async_client()
+        async with semaphore:
+            response = await _with_backoff(
+                lambda: client.images.generate(model=model, prompt=prompt, size=size,
+                                               quality=quality, n=1),
+                max_retries=max_retries, base_delay=base_delay,
+            )
+            image_info = response.data[0]
+            if image_url := _get_attr_or_key(image_info, "url"):
+                # Blocking I/O runs on worker threads so other requests keep flowing
+                await asyncio.to_thread(downloader.download, image_url, file_name)
+            elif b64_json := _get_attr_or_key(image_info, "b64_json"):
+                await asyncio.to_thread(_write_file, file_name, base64.b64decode(b64_json))
+            else:
+                raise ValueError("No URL or base64 payload returned from API.")
+        if cache is not None:
+            await asyncio.to_thread(cache.store, key, file_name, prompt=prompt, model=model,
+                                    size=size, quality=quality)
+        return file_name
+
+    async def generate_one(index, prompt):
+        nonlocal completed
+        file_name = os.path.join(output_dir, f"{file_prefix}_{stamp}_{index:03d}.png")
+        key = prompt_key(prompt, model, size, quality)
+        if key in in_flight:
+            source = await in_flight[key]
+            await asyncio.to_thread(shutil.copyfile, source, file_name)
+        else:
+            in_flight[key] = asyncio.ensure_future(produce(key, prompt, file_name))
+            await in_flight[key]
+
+        completed += 1
+        if progress:
+            progress(completed, file_name)
+        return file_name
+
+    try:
+        return await asyncio.gather(
+            *(generate_one(index, prompt) for index, prompt in enumerate(prompts, start=1)),
+            return_exceptions=True,
+        )
+    finally:
+        if own_client and client is not None:
+            await client.close()
+        if own_downloader:
+            downloader.close()
+
+
+def open_cache(args):
+    """Return the PromptCache selected on the command line, or None."""
+    if not (args.cache or args.cache_stats):
+        return None
+    ttl = args.cache_ttl * 3600 if args.cache_ttl is not None else None
+    return PromptCache(args.cache_dir, ttl=ttl, max_items=args.cache_max_items)
+
+
+def print_cache_report(cache, quality):
+    """Print the prompt cache statistics and the spend the hits avoided."""
+    stats = cache.stats()
+    print(f"📦 Prompt cache: {cache.cache_dir}")
+    print(f"Entries: {stats['items']} ({stats['bytes'] / (1024 * 1024):.1f} MiB)")
+    if stats["oldest"] is not None:
+        oldest = datetime.datetime.fromtimestamp(stats["oldest"])
+        print(f"Oldest entry: {oldest:%Y-%m-%d %H:%M:%S}")
+    lookups = stats["hits"] + stats["misses"]
+    if lookups:
+        print(f"This run: {stats['hits']} hits, {stats['misses']} misses "
+              f"(hit rate {stats['hit_rate']:.0%}), {stats['stores']} stored, "
+              f"{stats['expired']} expired, {stats['evictions']} evicted")
+        print(f"Estimated savings: ${stats['hits'] * estimate_cost(quality):.2f}")
+
+
+def main_batch(args, now, keywords, cache=None):
+    """Run --count > 1: print the prompts, then generate them concurrently."""
+    prompts = batch_prompts(args.count, now.strftime("%A"), now.hour, keywords, style=args.style)
+    for index, prompt in enumerate(prompts, start=1):
+        print(f"✅ Prompt {index}: {prompt}")
+    print(f"Quality: {args.quality}, Size: {args.size}, Concurrency: {args.concurrency}")
+
+    if args.dry_run:
+        cost_per_image = estimate_cost(args.quality)
+        # Identical prompts are merged into a single request
+        unique = len(set(prompts))
+        print("🧪 Dry run mode enabled — no API call will be made.")
+        print(f"Estimated cost: ${cost_per_image * unique:.2f} "
+              f"({unique} × ${cost_per_image:.2f}, quality={args.quality})")
+        return
+
+    print(f"Generating {args.count} images with GPT Image API ({args.model})...")
+
+    def report(count, path):
+        print(f"✅ [{count}/{args.count}] Artwork saved locally as: {path}")
+
+    import asyncio
+
+    results = asyncio.run(generate_batch(
+        prompts, model=args.model, size=args.size, quality=args.quality,
+        concurrency=args.concurrency, max_retries=args.max_retries, progress=report, cache=cache,
+    ))
+    if cache is not None:
+        print_cache_report(cache, args.quality)
+    failures = [result for result in results if isinstance(result, BaseException)]
+    if any(isinstance(error, MissingAPIKeyError) for error in failures):
+        _report_missing_key()
+    for error in failures:
+        print(f"❌ Error generating or saving artwork: {error}")
+    if failures:
+        sys.exit(1)
+
+
 def main():
     args = parse_arguments()
 
     if args.seed is not None:
         random.seed(args.seed)
 
+    cache = open_cache(args)
+    if args.cache_stats:
+        print_cache_report(cache, args.quality)
+        return
+
     now = datetime.datetime.now()
+    if args.count > 1:
+        keywords = [kw.strip() for kw in args.keywords.split(",") if kw.strip()]
+        main_batch(args, now, keywords, cache)
+        return
+
     current_day = now.strftime("%A")
     current_hour = now.hour
 
@@ -121,9 +377,27 @@ def main():
         print(f"Estimated cost: ${cost_per_image:.2f} (quality={args.quality})")
         return
 
+    output_dir = "output"
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    file_name = os.path.join(output_dir, f"ai_artwork_{timestamp}.png")
+    key = prompt_key(prompt, args.model, args.size, args.quality)
+
+    if cache is not None and cache.fetch(key, file_name):
+        print("♻️ Identical request found in the prompt cache — no API call made.")
+        print(f"✅ Artwork saved locally as: {file_name}")
+        print_cache_report(cache, args.quality)
+        return
+
+    try:
+        client = get_client()
+    except MissingAPIKeyError:
+        _report_missing_key()
+
     print(f"Generating image with GPT Image API ({args.model})...")
 
     try:
+        from image_downloader import ImageDownloader
+
         response = client.images.generate(
             model=args.model,
             prompt=prompt,
@@ -134,31 +408,25 @@ def main():
 
         image_info = response.data[0]
         image_url = _get_attr_or_key(image_info, "url")
-        image_data = None
+        os.makedirs(output_dir, exist_ok=True)
 
         if image_url:
             print("✅ Image generated successfully!")
             print(f"Image URL: {image_url}")
 
-            image_response = requests.get(image_url, timeout=30)
-            image_response.raise_for_status()
-            image_data = image_response.content
+            with ImageDownloader(pool_size=1) as downloader:
+                downloader.download(image_url, file_name)
         elif b64_json := _get_attr_or_key(image_info, "b64_json"):
             print("✅ Image generated successfully (inline base64 payload).")
-            image_data = base64.b64decode(b64_json)
+            _write_file(file_name, base64.b64decode(b64_json))
         else:
             raise ValueError("No URL or base64 payload returned from API.")
 
-        output_dir = "output"
-        os.makedirs(output_dir, exist_ok=True)
-
-        timestamp = now.strftime("%Y%m%d_%H%M%S")
-        file_name = os.path.join(output_dir, f"ai_artwork_{timestamp}.png")
-
-        with open(file_name, "wb") as f:
-            f.write(image_data)
-
         print(f"✅ Artwork saved locally as: {file_name}")
+        if cache is not None:
+            cache.store(key, file_name, prompt=prompt, model=args.model, size=args.size,
+                        quality=args.quality)
+            print_cache_report(cache, args.quality)
     except Exception as e:
         print(f"❌ Error generating or saving artwork: {e}")
         sys.exit(1)
@@ -1,9 +1,20 @@
 import datetime
+import functools
 import random
 import math
 import os
+import numpy as np
 from PIL import Image, ImageDraw
 
+from image_encoders import DEFAULT_ENCODER
+from palettes import apply_grade, harmony_for_time, harmony_palette
+from render_instrumentation import no_stage
+from scene import SceneRecorder
+
+# Bump whenever a change alters the pixels generate_artwork produces, so
+# cached renders from older versions are not reused
+GENERATOR_VERSION = "1"
+
 # Step 1: Define mappings for day and hour
 day_map = {
     "Monday": "structured geometric shapes",
@@ -50,8 +61,24 @@ def time_rotation(t):
     return (total_seconds // 10) % 360
 
 
-def time_influence(t):
-    """Calculate numeric influences based on exact time."""
+# Parameter ranges time_influence maps the time of day onto, as (low, high)
+influence_ranges = {
+    "size": (0.5, 1.0),
+    "saturation": (0.3, 1.0),
+    "brightness": (0.3, 1.0),
+    "complexity": (3, 13),
+    "opacity": (150, 255)
+}
+
+
+def time_influence(t, ranges=None):
+    """
+    Calculate numeric influences based on exact time.
+
+    ``ranges`` is a StyleTable.ranges dict of (low, span) pairs; it
+    defaults to the active style table's (see use_styles()).
+    """
+    ranges = ranges or _active_styles.ranges
     # Calculate a normalized time value (0.0 to 1.0) based on the full day
     total_seconds = t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1000000
     seconds_in_day = 24 * 3600
@@ -59,60 +86,75 @@ def time_influence(t):
     
     # Use microsecond for extra randomness in complexity
     micro_factor = t.microsecond / 1000000
+    daylight = (t.hour if t.hour <= 12 else 24 - t.hour) / 12
     
+    size, saturation, brightness, complexity, opacity = (
+        ranges[name] for name in ("size", "saturation", "brightness", "complexity", "opacity"))
     return {
         "angle": (total_seconds // 10) % 360,
-        "size": 0.5 + (normalized * 0.5),
-        "saturation": 0.3 + (math.sin(normalized * math.pi) * 0.7),
-        "brightness": 0.3 + ((t.hour if t.hour <= 12 else 24 - t.hour) / 12) * 0.7,
-        "complexity": int(3 + (normalized + micro_factor) * 10),
-        "opacity": int(150 + normalized * 105)
+        "size": size[0] + (normalized * size[1]),
+        "saturation": saturation[0] + (math.sin(normalized * math.pi) * saturation[1]),
+        "brightness": brightness[0] + daylight * brightness[1],
+        "complexity": int(complexity[0] + (normalized + micro_factor) * complexity[1]),
+        "opacity": int(opacity[0] + normalized * opacity[1])
     }
 
 
+def time_grade(t, ranges=None):
+    """
+    Per-minute (hue shift, saturation, brightness) used to grade dynamic-palette frames.
+
+    ``ranges`` is passed on to time_influence().
+    """
+    minute = t.replace(second=0, microsecond=0)
+    influence = time_influence(minute, ranges)
+    return [(minute.hour * 60 + minute.minute) % 360, influence["saturation"],
+            influence["brightness"]]
+
+
 def generate_prompt(day, t):
     """Generate an AI art prompt based on day and time."""
     prompt = (
-        f"Generative digital artwork with {day_map[day]} and {time_color(t)}, "
+        f"Generative digital artwork with {_active_styles.days[day][0]} and {time_color(t)}, "
         f"rotated {time_rotation(t)} degrees, modern digital art style."
     )
     return prompt
 
 
-def draw_rectangles(draw, width, height, colors, influence):
+def draw_rectangles(draw, width, height, colors, influence, rng=random):
     """Draw structured geometric rectangles (Monday style)."""
     count = influence["complexity"]
     for i in range(count):
-        x = random.randint(0, width)
-        y = random.randint(0, height)
-        w = int(50 * influence["size"] + random.randint(20, 80))
-        h = int(40 * influence["size"] + random.randint(15, 60))
+        x = rng.randint(0, width)
+        y = rng.randint(0, height)
+        w = int(50 * influence["size"] + rng.randint(20, 80))
+        h = int(40 * influence["size"] + rng.randint(15, 60))
         color = colors[i % len(colors)] + (influence["opacity"],)
         draw.rectangle([x, y, x + w, y + h], fill=color)
 
 
-def draw_lines(draw, width, height, colors, influence):
+def draw_lines(draw, width, height, colors, influence, rng=random):
     """Draw minimalist lines (Tuesday style)."""
     count = influence["complexity"] * 2
     for i in range(count):
-        x1 = random.randint(0, width)
-        y1 = random.randint(0, height)
-        angle_rad = math.radians(influence["angle"] + random.randint(-30, 30))
-        length = int(100 * influence["size"] + random.randint(50, 150))
+        x1 = rng.randint(0, width)
+        y1 = rng.randint(0, height)
+        angle_rad = math.radians(influence["angle"] + rng.randint(-30, 30))
+        length = int(100 * influence["size"] + rng.randint(50, 150))
         x2 = x1 + int(length * math.cos(angle_rad))
         y2 = y1 + int(length * math.sin(angle_rad))
         color = colors[i % len(colors)] + (influence["opacity"],)
         draw.line([x1, y1, x2, y2], fill=color, width=3)
 
 
-def draw_symmetry(draw, width, height, colors, influence):
+def draw_symmetry(draw, width, height, colors, influence, rng=random):
     """Draw balanced symmetrical shapes (Wednesday style)."""
     count = influence["complexity"]
     center_x = width // 2
     for i in range(count):
-        offset_x = random.randint(20, width // 3)
-        y = random.randint(50, height - 50)
-        size = int(30 * influence["size"] + random.randint(10, 40))
+        offset_x = rng.randint(20, width // 3)
+        y = rng.randint(50, height - 50)
+        size = int(30 * influence["size"] + rng.randint(10, 40))
         color = colors[i % len(colors)] + (influence["opacity"],)
         # Draw on both sides for symmetry
         draw.ellipse([center_x - offset_x - size, y - size, 
@@ -121,16 +163,16 @@ def draw_symmetry(draw, width, height, colors, influence):
                       center_x + offset_x + size, y + size], fill=color)
 
 
-def draw_curves(draw, width, height, colors, influence):
+def draw_curves(draw, width, height, colors, influence, rng=random):
     """Draw dynamic abstract curves (Thursday style)."""
     count = influence["complexity"]
     for i in range(count):
         points = []
-        x = random.randint(0, width // 2)
-        y = random.randint(0, height)
+        x = rng.randint(0, width // 2)
+        y = rng.randint(0, height)
         for j in range(5):
-            x += random.randint(30, 100)
-            y += random.randint(-50, 50)
+            x += rng.randint(30, 100)
+            y += rng.randint(-50, 50)
             y = max(0, min(height, y))
             points.append((x, y))
         color = colors[i % len(colors)] + (influence["opacity"],)
@@ -138,29 +180,29 @@ def draw_curves(draw, width, height, colors, influence):
             draw.line(points, fill=color, width=4)
 
 
-def draw_circles(draw, width, height, colors, influence):
+def draw_circles(draw, width, height, colors, influence, rng=random):
     """Draw playful colorful circles (Friday style)."""
     count = influence["complexity"] * 2
     for i in range(count):
-        x = random.randint(0, width)
-        y = random.randint(0, height)
-        r = int(20 * influence["size"] + random.randint(10, 50))
+        x = rng.randint(0, width)
+        y = rng.randint(0, height)
+        r = int(20 * influence["size"] + rng.randint(10, 50))
         color = colors[i % len(colors)] + (influence["opacity"],)
         draw.ellipse([x - r, y - r, x + r, y + r], fill=color)
 
 
-def draw_organic(draw, width, height, colors, influence):
+def draw_organic(draw, width, height, colors, influence, rng=random):
     """Draw organic nature-inspired shapes (Saturday style)."""
     count = influence["complexity"]
     for i in range(count):
         # Draw irregular polygon (organic blob)
-        center_x = random.randint(50, width - 50)
-        center_y = random.randint(50, height - 50)
+        center_x = rng.randint(50, width - 50)
+        center_y = rng.randint(50, height - 50)
         points = []
-        num_points = random.randint(6, 10)
+        num_points = rng.randint(6, 10)
         for j in range(num_points):
             angle = (2 * math.pi / num_points) * j
-            r = int(30 * influence["size"] + random.randint(10, 40))
+            r = int(30 * influence["size"] + rng.randint(10, 40))
             px = center_x + int(r * math.cos(angle))
             py = center_y + int(r * math.sin(angle))
             points.append((px, py))
@@ -169,7 +211,7 @@ def draw_organic(draw, width, height, colors, influence):
             draw.polygon(points, fill=color)
 
 
-def draw_waves(draw, width, height, colors, influence):
+def draw_waves(draw, width, height, colors, influence, rng=random):
     """Draw calm wave patterns (Sunday style)."""
     count = influence["complexity"]
     for i in range(count):
@@ -183,62 +225,698 @@ def draw_waves(draw, width, height, colors, influence):
             draw.line(points, fill=color, width=5)
 
 
-def generate_artwork(day, time_obj, width=800, height=600, output_path=None):
-    """Generate artwork directly using the graphics library."""
-    
-    # Seed random with exact time for uniqueness
-    random.seed(time_obj.timestamp())
-    
-    colors = day_colors[day]
-    influence = time_influence(time_obj)
-    shape_type = day_shapes[day]
-    
-    # Create image with gradient background
+# Number of distinct noise permutation tables; renders pick one at random so
+# the cached tables are shared instead of rebuilt for every timestamp
+NOISE_TABLE_SEEDS = 256
+
+
+@functools.lru_cache(maxsize=NOISE_TABLE_SEEDS)
+def _noise_tables(seed):
+    """Return the cached (permutation, gradient x, gradient y) tables for a seed."""
+    generator = np.random.default_rng(seed)
+    perm = generator.permutation(256).astype(np.intp)
+    angles = generator.uniform(0, 2 * math.pi, 256)
+    tables = (perm, np.cos(angles).astype(np.float32), np.sin(angles).astype(np.float32))
+    for table in tables:
+        table.flags.writeable = False
+    return tables
+
+
+def _fade(t):
+    """Perlin's quintic smoothstep 6t^5 - 15t^4 + 10t^3."""
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def _noise_octave(width, height, cells_x, cells_y, tables, offset, window=None):
+    """
+    Factor one octave of 2D gradient noise into row weights and x profiles.
+
+    Interpolating along x only depends on the lattice row, so each lattice
+    row reduces to two 1D profiles over x. Every pixel row is then a blend of
+    four profile rows with per-row weights, i.e. ``weights @ profiles`` gives
+    the (height, width) octave, or only the window's part of it.
+    """
+    left, top, right, bottom = window or (0, 0, width, height)
+    perm, grad_x, grad_y = tables
+
+    # Gradients at the lattice points; indices wrap at the cell count, which
+    # makes the field tileable
+    lattice_x = perm[(np.arange(cells_x + 1) + offset[0]) % cells_x & 255]
+    lattice_y = ((np.arange(cells_y + 1) + offset[1]) % cells_y)[:, None]
+    hashed = perm[(lattice_x[None, :] + lattice_y) & 255]
+    lattice_gx = grad_x[hashed]
+    lattice_gy = grad_y[hashed]
+
+    x = np.arange(left, right, dtype=np.float32) * np.float32(cells_x / width)
+    x_cell = x.astype(np.intp)
+    xf = x - np.floor(x)
+    u = _fade(xf)
+    profiles = np.concatenate([
+        lattice_gx[:, x_cell] * (xf * (1 - u)) + lattice_gx[:, x_cell + 1] * ((xf - 1) * u),
+        lattice_gy[:, x_cell] * (1 - u) + lattice_gy[:, x_cell + 1] * u,
+    ])
+
+    y = np.arange(top, bottom, dtype=np.float32) * np.float32(cells_y / height)
+    y_cell = y.astype(np.intp)
+    yf = y - np.floor(y)
+    v = _fade(yf)
+    rows = np.arange(bottom - top)
+    weights = np.zeros((bottom - top, 2 * (cells_y + 1)), dtype=np.float32)
+    weights[rows, y_cell] = 1 - v
+    weights[rows, y_cell + 1] = v
+    weights[rows, cells_y + 1 + y_cell] = yf * (1 - v)
+    weights[rows, cells_y + 2 + y_cell] = (yf - 1) * v
+    return weights, profiles
+
+
+def noise_field(width, height, seed=0, cells=4, octaves=4, persistence=0.5, offset=(0, 0),
+                window=None):
+    """
+    Multi-octave gradient (Perlin) noise over the whole canvas in [0, 1].
+
+    ``cells`` is the number of lattice cells across the width at the first
+    octave; each further octave doubles it. The field tiles seamlessly in
+    both directions. Permutation and gradient tables are cached per seed.
+    ``window=(left, top, right, bottom)`` computes only that part of the
+    width x height field.
+    """
+    tables = _noise_tables(seed)
+    cells_x = max(1, int(cells))
+    cells_y = max(1, round(cells * height / width))
+    all_weights = []
+    all_profiles = []
+    amplitude = 1.0
+    total = 0.0
+    for _ in range(octaves):
+        weights, profiles = _noise_octave(width, height, cells_x, cells_y, tables, offset, window)
+        all_weights.append(weights * np.float32(amplitude))
+        all_profiles.append(profiles)
+        total += amplitude
+        amplitude *= persistence
+        cells_x *= 2
+        cells_y *= 2
+    # Every octave is summed by a single matrix product
+    field = np.concatenate(all_weights, axis=1) @ np.concatenate(all_profiles)
+    # 2D gradient noise stays within +-sqrt(0.5); rescale into [0, 1]
+    field *= np.float32(0.5 / (total * math.sqrt(0.5)))
+    field += np.float32(0.5)
+    return np.clip(field, 0.0, 1.0, out=field)
+
+
+def _noise_params(influence, rng):
+    """Pick noise seed, offset, scale and octaves from the render's influence."""
+    seed = rng.randrange(NOISE_TABLE_SEEDS)
+    offset = (rng.randrange(256), rng.randrange(256))
+    cells = max(2, int(6 * influence["size"]))
+    octaves = min(6, 2 + influence["complexity"] // 3)
+    return seed, offset, cells, octaves
+
+
+def _draw_field_bands(draw, field, colors, opacity, low, high, sharpness=12.0):
+    """Paint one soft-edged band per palette color above evenly spaced thresholds."""
+    for i, color in enumerate(colors):
+        threshold = low + (high - low) * i / max(1, len(colors) - 1)
+        alpha = np.clip((field - threshold) * sharpness, 0.0, 1.0) * opacity
+        draw.bitmap((0, 0), Image.fromarray(alpha.astype(np.uint8)), fill=color)
+
+
+def draw_noise(draw, width, height, colors, influence, rng=random):
+    """Draw layered cloud / marble bands from procedural noise."""
+    seed, offset, cells, octaves = _noise_params(influence, rng)
+    field = noise_field(width, height, seed, cells, octaves, offset=offset)
+    # Octave sums cluster around 0.5, so spread the bands over 0.3-0.7
+    _draw_field_bands(draw, field, colors, influence["opacity"], 0.3, 0.7)
+
+
+def apply_noise_background(image, colors, influence, rng=random, strength=0.35):
+    """Blend a noise texture in the palette's last color into an RGB canvas."""
+    paint_noise_background(image, colors[-1], _noise_params(influence, rng), strength)
+
+
+def paint_noise_background(image, color, params, strength=0.35, canvas_size=None, origin=(0, 0)):
+    """
+    Blend the noise texture for (seed, offset, cells, octaves) into an RGB canvas.
+
+    When image is one part of a larger canvas, ``canvas_size`` is the full
+    (width, height) and ``origin`` the image's position within it.
+    """
+    seed, offset, cells, octaves = params
+    width, height = canvas_size or image.size
+    window = (origin[0], origin[1], origin[0] + image.width, origin[1] + image.height)
+    field = noise_field(width, height, seed, cells, octaves, offset=offset, window=window)
+    mask = Image.fromarray((field * (255 * strength)).astype(np.uint8))
+    image.paste(color, (0, 0, image.width, image.height), mask)
+
+
+def voronoi_sites(width, height, count, generator):
+    """
+    Scatter about ``count`` Voronoi sites, one per cell of a near-square grid.
+
+    Returns (sites_x, sites_y) arrays of shape (rows, cols). Each site is
+    jittered inside the middle of its cell, leaving a margin wide enough that
+    every pixel's nearest site lies in the 3x3 cells around it.
+    """
+    cols = max(1, min(width, round(math.sqrt(count * width / height))))
+    rows = max(1, min(height, round(count / cols)))
+    cell_w = width / cols
+    cell_h = height / rows
+    # A pixel's own site is at most (1 - m) * diagonal away, while any site two
+    # cells over is at least (1 + m) * shorter side away
+    ratio = math.hypot(cell_w, cell_h) / min(cell_w, cell_h)
+    margin = (ratio - 1) / (ratio + 1)
+    jitter = generator.uniform(margin, 1 - margin, size=(2, rows, cols))
+    sites_x = (np.arange(cols) + jitter[0]) * cell_w
+    sites_y = (np.arange(rows)[:, None] + jitter[1]) * cell_h
+    return sites_x.astype(np.float32), sites_y.astype(np.float32)
+
+
+def voronoi_labels(width, height, sites_x, sites_y):
+    """
+    Label every pixel with the flat index of its nearest site.
+
+    Sites come from voronoi_sites, whose grid doubles as the spatial index:
+    only the 3x3 neighbouring cells are candidates, so the cost is nine
+    vectorized passes over the canvas however many sites there are.
+    """
+    rows, cols = sites_x.shape
+    px = np.arange(width, dtype=np.float32) + np.float32(0.5)
+    py = np.arange(height, dtype=np.float32) + np.float32(0.5)
+    cell_col = np.minimum((px * (cols / width)).astype(np.intp), cols - 1)
+    cell_row = np.minimum((py * (rows / height)).astype(np.intp), rows - 1)
+
+    best = np.full((height, width), np.inf, dtype=np.float32)
+    labels = np.zeros((height, width), dtype=np.int32)
+    for dr in (-1, 0, 1):
+        row_idx = np.clip(cell_row + dr, 0, rows - 1)
+        for dc in (-1, 0, 1):
+            col_idx = np.clip(cell_col + dc, 0, cols - 1)
+            # Squared x distance depends on (site row, pixel x) and squared y
+            # distance on (pixel y, site col), so each is a small table whose
+            # rows / columns are gathered onto the canvas
+            dist = ((px - sites_x[:, col_idx]) ** 2)[row_idx]
+            dist += ((py[:, None] - sites_y[row_idx]) ** 2)[:, col_idx]
+            closer = dist < best
+            np.copyto(best, dist, where=closer)
+            np.copyto(labels, (row_idx[:, None] * cols + col_idx).astype(np.int32), where=closer)
+    return labels
+
+
+def draw_voronoi(draw, width, height, colors, influence, rng=random):
+    """Draw cell-like Voronoi regions with thin gaps between cells."""
+    generator = np.random.default_rng(rng.getrandbits(64))
+    count = influence["complexity"] * 60
+    sites_x, sites_y = voronoi_sites(width, height, count, generator)
+    labels = voronoi_labels(width, height, sites_x, sites_y)
+
+    # Leave a one-pixel gap wherever the nearest site changes
+    edges = np.zeros((height, width), dtype=bool)
+    edges[:, 1:] |= labels[:, 1:] != labels[:, :-1]
+    edges[1:, :] |= labels[1:, :] != labels[:-1, :]
+
+    site_colors = generator.integers(0, len(colors), size=sites_x.size)
+    pixel_colors = site_colors[labels]
+    pixel_colors[edges] = -1
+    for i, color in enumerate(colors):
+        mask = (pixel_colors == i).astype(np.uint8) * np.uint8(influence["opacity"])
+        draw.bitmap((0, 0), Image.fromarray(mask), fill=color)
+
+
+# (feed, kill) pairs for Gray-Scott that give spots, mazes, coral and holes
+REACTION_DIFFUSION_PRESETS = [
+    (0.030, 0.062),
+    (0.029, 0.057),
+    (0.0545, 0.062),
+    (0.039, 0.058),
+]
+
+
+def _periodic_laplacian(a, out):
+    """Five-point Laplacian with wrap-around edges, written into out."""
+    np.multiply(a, -4, out=out)
+    out[1:] += a[:-1]
+    out[0] += a[-1]
+    out[:-1] += a[1:]
+    out[-1] += a[0]
+    out[:, 1:] += a[:, :-1]
+    out[:, 0] += a[:, -1]
+    out[:, :-1] += a[:, 1:]
+    out[:, -1] += a[:, 0]
+    return out
+
+
+class ReactionDiffusion:
+    """
+    Gray-Scott reaction-diffusion on a periodic grid.
+
+    The simulation advances in chunks with advance(), so a long-running
+    texture can be evolved a step budget at a time (e.g. per scheduler tick),
+    saved with checkpoint() and picked up later with ReactionDiffusion.resume().
+    """
+
+    def __init__(self, width, height, feed=0.030, kill=0.062, diffusion_u=0.2, diffusion_v=0.1):
+        self.width = width
+        self.height = height
+        self.feed = feed
+        self.kill = kill
+        self.diffusion_u = diffusion_u
+        self.diffusion_v = diffusion_v
+        self.steps = 0
+        self.u = np.ones((height, width), dtype=np.float32)
+        self.v = np.zeros((height, width), dtype=np.float32)
+        self._allocate_work()
+
+    def _allocate_work(self):
+        self._lap_u = np.empty_like(self.u)
+        self._lap_v = np.empty_like(self.v)
+        self._reaction = np.empty_like(self.u)
+
+    def seed(self, generator, count=10, radius=None):
+        """Drop ``count`` square patches of V at random positions."""
+        radius = radius or max(2, min(self.width, self.height) // 40)
+        for _ in range(count):
+            x = int(generator.integers(0, self.width))
+            y = int(generator.integers(0, self.height))
+            rows = np.arange(y - radius, y + radius) % self.height
+            cols = np.arange(x - radius, x + radius) % self.width
+            self.u[np.ix_(rows, cols)] = 0.5
+            self.v[np.ix_(rows, cols)] = 0.25
+
+    def step(self):
+        """Advance the simulation by one explicit Euler step."""
+        u, v = self.u, self.v
+        lap_u = _periodic_laplacian(u, self._lap_u)
+        lap_v = _periodic_laplacian(v, self._lap_v)
+        reaction = np.multiply(u, v, out=self._reaction)
+        reaction *= v
+
+        # u += Du * lap(u) - u*v^2 + F * (1 - u)
+        lap_u *= np.float32(self.diffusion_u)
+        lap_u -= reaction
+        u *= np.float32(1 - self.feed)
+        u += lap_u
+        u += np.float32(self.feed)
+        # v += Dv * lap(v) + u*v^2 - (F + k) * v
+        lap_v *= np.float32(self.diffusion_v)
+        lap_v += reaction
+        v *= np.float32(1 - self.feed - self.kill)
+        v += lap_v
+        self.steps += 1
+
+    def advance(self, budget, until=None):
+        """
+        Run at most ``budget`` steps, stopping early once ``until`` total steps
+        have been reached. Returns the number of steps taken.
+        """
+        if until is not None:
+            budget = min(budget, max(0, until - self.steps))
+        for _ in range(budget):
+            self.step()
+        return budget
+
+    def field(self):
+        """Return V normalized to [0, 1] for rendering."""
+        v = self.v
+        low, high = float(v.min()), float(v.max())
+        if high - low < 1e-6:
+            return np.zeros_like(v)
+        return (v - low) / (high - low)
+
+    def checkpoint(self, destination):
+        """Save the full simulation state to a path or file object (.npz)."""
+        np.savez_compressed(
+            destination, u=self.u, v=self.v, steps=self.steps,
+            params=np.array([self.feed, self.kill, self.diffusion_u, self.diffusion_v]),
+        )
+
+    @classmethod
+    def resume(cls, source):
+        """Load a simulation saved with checkpoint() and continue from there."""
+        with np.load(source) as data:
+            feed, kill, diffusion_u, diffusion_v = (float(p) for p in data["params"])
+            sim = cls.__new__(cls)
+            sim.feed, sim.kill = feed, kill
+            sim.diffusion_u, sim.diffusion_v = diffusion_u, diffusion_v
+            sim.u = data["u"].astype(np.float32)
+            sim.v = data["v"].astype(np.float32)
+            sim.steps = int(data["steps"])
+        sim.height, sim.width = sim.u.shape
+        sim._allocate_work()
+        return sim
+
+
+def draw_reaction_diffusion(draw, width, height, colors, influence, rng=random):
+    """Draw animal-print textures from a Gray-Scott simulation."""
+    generator = np.random.default_rng(rng.getrandbits(64))
+    feed, kill = REACTION_DIFFUSION_PRESETS[rng.randrange(len(REACTION_DIFFUSION_PRESETS))]
+    # Simulate on a reduced grid and upscale; patterns are smooth at this scale
+    scale = max(1, math.ceil(max(width, height) / 200))
+    sim = ReactionDiffusion(max(8, width // scale), max(8, height // scale), feed, kill)
+    sim.seed(generator, count=influence["complexity"] * 3)
+    sim.advance(300 + 50 * influence["complexity"])
+
+    field = Image.fromarray((sim.field() * 255).astype(np.uint8))
+    field = field.resize((width, height), Image.Resampling.BILINEAR)
+    _draw_field_bands(draw, np.asarray(field, dtype=np.float32) / 255, colors,
+                      influence["opacity"], 0.2, 0.8)
+
+
+# Segments a fractal tree may use per unit of complexity; deep trees stop
+# branching once the budget is spent instead of doubling without bound
+FRACTAL_SEGMENTS_PER_COMPLEXITY = 1500
+
+
+def fractal_tree_segments(x, y, length, depth, budget, generator, spread=0.45, decay=0.72):
+    """
+    Expand binary fractal trees level by level into segment arrays.
+
+    ``x``, ``y`` and ``length`` give each tree's base point and trunk
+    length; trunks grow straight up. Each level splits every branch tip
+    into two branches turned by about ``spread`` radians either way and
+    about ``decay`` times as long. Levels are expanded with NumPy into
+    arrays preallocated for ``budget`` segments. When the next level would
+    not fit, a random subset of its branches fills the rest, so time and
+    memory stay bounded however deep the tree.
+
+    Returns (segments, levels): an (n, 4) array of x0, y0, x1, y1 rows,
+    trunks first, and the level of each segment. Raises ValueError if
+    ``depth`` is below 1, as even the trunks are a level.
+    """
+    if depth < 1:
+        raise ValueError(f"depth must be at least 1, got {depth}")
+    x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+    trees = min(x.size, budget)
+    segments = np.empty((budget, 4))
+    angles = np.empty(budget)
+    lengths = np.empty(budget)
+    levels = np.empty(budget, dtype=np.int16)
+
+    segments[:trees, 0] = x[:trees]
+    segments[:trees, 1] = np.broadcast_to(y, x.shape)[:trees]
+    angles[:trees] = -math.pi / 2
+    lengths[:trees] = np.broadcast_to(length, x.shape)[:trees]
+    levels[:trees] = 0
+    start, end = 0, trees
+    for level in range(1, depth + 1):
+        # Finish the previous level's segments, then branch from their tips
+        segments[start:end, 2] = segments[start:end, 0] + lengths[start:end] * np.cos(
+            angles[start:end])
+        segments[start:end, 3] = segments[start:end, 1] + lengths[start:end] * np.sin(
+            angles[start:end])
+        room = budget - end
+        if level == depth or room <= 0:
+            break
+        parents = np.repeat(np.arange(start, end), 2)
+        if parents.size > room:
+            parents = parents[np.sort(generator.choice(parents.size, room, replace=False))]
+        count = parents.size
+        side = np.where(np.arange(count) % 2 == 0, -1.0, 1.0)
+        new = slice(end, end + count)
+        segments[new, :2] = segments[parents, 2:]
+        angles[new] = angles[parents] + side * spread * generator.uniform(0.6, 1.4, count)
+        lengths[new] = lengths[parents] * decay * generator.uniform(0.8, 1.1, count)
+        levels[new] = level
+        start, end = end, end + count
+    return segments[:end], levels[:end]
+
+
+def draw_fractal_tree(draw, width, height, colors, influence, rng=random):
+    """Draw branching fractal trees (nature-inspired, complexity sets the depth)."""
+    generator = np.random.default_rng(rng.getrandbits(64))
+    complexity = influence["complexity"]
+    trees = 1 + complexity // 6
+    depth = 6 + complexity // 2
+    budget = complexity * FRACTAL_SEGMENTS_PER_COMPLEXITY
+    x = (np.arange(trees) + generator.uniform(0.3, 0.7, trees)) * width / trees
+    length = height * 0.28 * influence["size"] * generator.uniform(0.8, 1.1, trees)
+    segments, levels = fractal_tree_segments(x, height, length, depth, budget, generator,
+                                             spread=generator.uniform(0.3, 0.6))
+
+    # Thick trunk in the first color, thinning out through the palette
+    trunk = max(1, round(height / 60 * influence["size"]))
+    widths = [max(1, round(trunk * 0.7 ** level)) for level in range(depth)]
+    fills = [colors[level * len(colors) // depth] + (influence["opacity"],)
+             for level in range(depth)]
+    # One call per segment on purpose: Pillow has no call for disjoint
+    # segments (a multi-point line would join them), and the budget already
+    # caps how many there are
+    for xy, level in zip(segments.tolist(), levels.tolist()):
+        draw.line(xy, fill=fills[level], width=widths[level])
+
+
+def gradient_array(base_color, width, height):
+    """Build the vertical background gradient as a (height, width, 4) RGBA array."""
+    base = np.asarray(base_color, dtype=np.float64)
+    ratio = np.arange(height, dtype=np.float64)[:, None] / height
+    rows = np.empty((height, 4), dtype=np.uint8)
+    rows[:, :3] = (base + (255 - base) * ratio * 0.3).astype(np.uint8)
+    rows[:, 3] = 255
+    # Broadcast whole pixels packed as uint32 so each row is filled with one copy
+    packed = np.broadcast_to(rows.view(np.uint32), (height, width))
+    return np.ascontiguousarray(packed).view(np.uint8).reshape(height, width, 4)
+
+
+def gradient_background(base_color, width, height):
+    """Create the RGBA gradient background image from a single NumPy array."""
+    pixels = gradient_array(base_color, width, height)
+    # frombuffer shares the array's memory instead of copying it into Pillow
+    return Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+
+
+def gradient_canvas(base_color, width, height):
+    """Create a writable RGB image filled with the background gradient."""
+    # Every row is a single colour, so stretching a one-pixel-wide column
+    # fills the frame without a full-size temporary array
+    column = gradient_array(base_color, 1, height)
+    strip = Image.frombuffer("RGBA", (1, height), column, "raw", "RGBA", 0, 1).convert("RGB")
+    return strip.resize((width, height), Image.Resampling.NEAREST)
+
+
+def _gradient_background_loop(base_color, width, height):
+    """Row-by-row reference gradient, kept for tests and benchmarks."""
     image = Image.new("RGBA", (width, height), (255, 255, 255, 255))
     draw = ImageDraw.Draw(image)
-    
-    # Draw background gradient
-    base_color = colors[0]
     for y in range(height):
         ratio = y / height
         r = int(base_color[0] + (255 - base_color[0]) * ratio * 0.3)
         g = int(base_color[1] + (255 - base_color[1]) * ratio * 0.3)
         b = int(base_color[2] + (255 - base_color[2]) * ratio * 0.3)
         draw.line([(0, y), (width, y)], fill=(r, g, b))
+    return image
+
+
+# Style name to shape drawing function; plugins add theirs with register_style
+shape_functions = {
+    "rectangles": draw_rectangles,
+    "lines": draw_lines,
+    "symmetry": draw_symmetry,
+    "curves": draw_curves,
+    "circles": draw_circles,
+    "organic": draw_organic,
+    "waves": draw_waves,
+    "noise": draw_noise,
+    "voronoi": draw_voronoi,
+    "reaction_diffusion": draw_reaction_diffusion,
+    "fractal_tree": draw_fractal_tree
+}
+
+
+def register_style(name, function=None, replace=False):
+    """
+    Register a shape drawing function under a style name.
+
+    Works as register_style("spiral", draw_spiral) or as the decorator
+    @register_style("spiral"). The function takes (draw, width, height,
+    colors, influence, rng) like the draw_* functions. Registered styles
+    can be chosen with style= and named in config files (see art_config).
+    Raises ValueError if the name is taken, unless ``replace`` is true.
+    """
+    def register(function):
+        if name in shape_functions and not replace:
+            raise ValueError(f"style {name!r} is already registered")
+        shape_functions[name] = function
+        return function
+
+    return register if function is None else register(function)
+
+
+class StyleTable:
+    """
+    Day styles, influence ranges and default canvas size, resolved for rendering.
+
+    ``days`` maps each day to a (concept, colors, style name, draw function)
+    tuple, with colors as a tuple of RGB tuples, and ``ranges`` maps each
+    time_influence parameter to (low, span). ``canvas`` is the default
+    (width, height) and ``fingerprint`` identifies a table loaded from a
+    config (None for the built-in one) so caches can tell tables apart.
+    Tables are never modified after they are built, so swapping the active
+    one with use_styles() is safe while other threads are rendering.
+    """
+
+    __slots__ = ("days", "ranges", "canvas", "fingerprint")
+
+    def __init__(self, concepts, colors, styles, ranges, canvas=(800, 600), fingerprint=None):
+        days = {}
+        for day, concept in concepts.items():
+            style = styles[day]
+            if style not in shape_functions:
+                raise ValueError(f"unknown style {style!r} for {day}; "
+                                 f"choose one of {sorted(shape_functions)}")
+            days[day] = (concept, tuple(tuple(color) for color in colors[day]), style,
+                         shape_functions[style])
+        self.days = days
+        self.ranges = {name: (low, high - low) for name, (low, high) in ranges.items()}
+        self.canvas = tuple(canvas)
+        self.fingerprint = fingerprint
+
+
+_active_styles = StyleTable(day_map, day_colors, day_shapes, influence_ranges)
+DEFAULT_STYLES = _active_styles
+
+
+def active_styles():
+    """Return the StyleTable renders currently use."""
+    return _active_styles
+
+
+def use_styles(table):
+    """Make table the active StyleTable for new renders and return the previous one."""
+    global _active_styles
+    previous, _active_styles = _active_styles, table
+    return previous
+
+
+def generate_artwork(day, time_obj, width=None, height=None, output_path=None, encoder=None,
+                     style=None, background="gradient", palette=None, styles=None,
+                     instrument=None):
+    """
+    Generate artwork directly using the graphics library.
+
+    ``width`` and ``height`` default to the style table's canvas (800x600
+    unless a config changes it). ``output_path`` may be a file path or a
+    writable file object. ``encoder`` is an image_encoders.ImageEncoder that
+    controls the output format and compression; by default the format
+    follows the path's extension.
+    ``style`` overrides the day's shape style (e.g. "noise"), and
+    ``background="noise"`` adds a procedural noise texture to the gradient.
+    ``palette="dynamic"`` (or a palettes.HARMONIES name) swaps the day's
+    fixed colors for a color harmony and grades the whole frame by time.
+    ``styles`` is the StyleTable to render with, by default the active one.
+    ``instrument`` is an optional render_instrumentation.RenderInstrumentation
+    that times and counts allocations for each stage of the render.
+    """
+    # Read the active table once so a config reload cannot change it mid-render
+    styles = styles or _active_styles
+    width = width or styles.canvas[0]
+    height = height or styles.canvas[1]
+    if instrument is None:
+        return _render_artwork(day, time_obj, width, height, output_path, encoder, style,
+                               background, palette, styles, no_stage)
+    with instrument.render(day=day, timestamp=time_obj.isoformat(), width=width, height=height,
+                           style=style or styles.days[day][2], background=background) as stage:
+        return _render_artwork(day, time_obj, width, height, output_path, encoder, style,
+                               background, palette, styles, stage)
+
+
+def build_scene(day, time_obj, width=None, height=None, style=None, background="gradient",
+                palette=None, styles=None):
+    """
+    Generate the scene for an artwork without rasterizing it.
+
+    Returns a scene.Scene holding the shapes the style's draw function
+    produced for a width x height canvas, together with the background,
+    noise texture, grading and rotation settings. render_scene() turns it
+    into the same image generate_artwork() returns, at that size or any other.
+    """
+    styles = styles or _active_styles
+    width = width or styles.canvas[0]
+    height = height or styles.canvas[1]
+    # Seed a private generator with exact time for uniqueness; keeping it
+    # per render makes concurrent renders in threads reproducible
+    rng = random.Random(time_obj.timestamp())
     
-    # Create overlay for shapes
-    overlay = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    overlay_draw = ImageDraw.Draw(overlay)
+    _, colors, _, day_function = styles.days[day]
+    influence = time_influence(time_obj, styles.ranges)
+    settings = {}
+    if palette is not None:
+        harmony = harmony_for_time(time_obj) if palette == "dynamic" else palette
+        colors = harmony_palette(tuple(colors), harmony)
+        settings["grade"] = time_grade(time_obj, styles.ranges)
+    settings["base_color"] = list(colors[0])
+    # Small rotation: -5 to +5 degrees
+    settings["rotation"] = influence["angle"] % 10 - 5
+    if background == "noise":
+        seed, offset, cells, octaves = _noise_params(influence, rng)
+        settings["noise"] = {"params": [seed, list(offset), cells, octaves],
+                             "color": list(colors[-1])}
     
-    # Draw shapes based on day
-    shape_functions = {
-        "rectangles": draw_rectangles,
-        "lines": draw_lines,
-        "symmetry": draw_symmetry,
-        "curves": draw_curves,
-        "circles": draw_circles,
-        "organic": draw_organic,
-        "waves": draw_waves
-    }
+    recorder = SceneRecorder(width, height)
+    if style is None:
+        shape_func = day_function
+    else:
+        shape_func = shape_functions.get(style, draw_circles)
+    shape_func(recorder, width, height, colors, influence, rng)
+    return recorder.scene(settings)
+
+
+def render_scene(scene, width=None, height=None, stage=no_stage):
+    """
+    Rasterize a scene into the final RGB image at width x height.
+
+    Defaults to the size the scene was generated for, where the result is
+    identical to generate_artwork(). ``stage`` is the instrumentation hook.
+    """
+    width = width or scene.width
+    height = height or scene.height
+    settings = scene.settings
+    
+    # Paint the gradient straight into the RGB canvas that becomes the output
+    with stage("gradient"):
+        image = gradient_canvas(tuple(settings["base_color"]), width, height)
+    if "noise" in settings:
+        with stage("noise_background"):
+            seed, offset, cells, octaves = settings["noise"]["params"]
+            paint_noise_background(image, tuple(settings["noise"]["color"]),
+                                   (seed, tuple(offset), cells, octaves))
     
-    shape_func = shape_functions.get(shape_type, draw_circles)
-    shape_func(overlay_draw, width, height, colors, influence)
+    # Replay the shapes onto a transparent overlay
+    with stage("shapes"):
+        overlay = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        overlay_draw = ImageDraw.Draw(overlay)
+        scene.rasterize(overlay_draw, width, height)
     
-    # Composite the overlay onto the base image
-    image = Image.alpha_composite(image, overlay)
+    # Composite the overlay onto the opaque canvas in place; pasting through
+    # the overlay's own alpha gives the same pixels as alpha_composite followed
+    # by an RGB convert without allocating either intermediate frame
+    with stage("composite"):
+        image.paste(overlay, (0, 0), overlay)
+        del overlay_draw, overlay
     
-    # Convert to RGB for saving as PNG
-    final_image = image.convert("RGB")
+    # Grade the frame before rotating so the white corners stay white
+    if "grade" in settings:
+        with stage("grade"):
+            image = apply_grade(image, settings["grade"])
     
-    # Rotate based on hour influence (subtle rotation)
-    rotation = influence["angle"] % 10 - 5  # Small rotation: -5 to +5 degrees
+    # Rotate based on hour influence (subtle rotation) as the single affine
+    # step that produces the final frame
+    final_image = image
+    rotation = settings["rotation"]
     if rotation != 0:
-        final_image = final_image.rotate(rotation, expand=False, fillcolor=(255, 255, 255))
+        with stage("rotate"):
+            final_image = image.rotate(rotation, expand=False, fillcolor=(255, 255, 255))
+    return final_image
+
+
+def _render_artwork(day, time_obj, width, height, output_path, encoder, style, background, palette,
+                    styles, stage):
+    """The generate_artwork pipeline, with each stage wrapped in stage(name)."""
+    with stage("scene"):
+        scene = build_scene(day, time_obj, width, height, style, background, palette, styles)
+    final_image = render_scene(scene, stage=stage)
     
     # Save if output path provided
     if output_path:
-        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-        final_image.save(output_path)
+        with stage("encode"):
+            (encoder or DEFAULT_ENCODER).save(final_image, output_path)
     
     return final_image
 
@@ -264,7 +942,7 @@ def main():
     print("✅ Artwork generated successfully!")
     print(f"Day: {current_day}")
     print(f"Time: {now.strftime('%H:%M:%S')}")
-    print(f"Day Concept: {day_map[current_day]}")
+    print(f"Day Concept: {_active_styles.days[current_day][0]}")
     print(f"Time Influence: rotation={time_rotation(now)}°, hue_shift={time_color(now)}")
     print(f"AI Art Prompt: {prompt}")
     print(f"Generated Image: {output_path}")
@@ -0,0 +1,94 @@
+"""
+Multi-resolution output from a single render.
+
+render_derivatives() renders an artwork once at full size and derives the
+smaller versions a frontend needs (128px and 512px previews by default)
+from that frame, so every size shows exactly the same layout. Each
+derivative is reduced from the next larger one with Image.reduce, Pillow's
+integer box filter, and a short box resize covers any remainder. All
+outputs are written in one pass through a shared pool of background
+encoder threads, so the full-size image is compressed while the previews
+are still being reduced.
+"""
+
+import os
+
+from PIL import Image
+
+from generate_art import generate_artwork
+from image_encoders import ImageEncoder
+
+# Longest edge of each derivative, in pixels
+DEFAULT_SIZES = (512, 128)
+
+
+def derivative_size(width, height, size):
+    """Return width x height scaled so that the longer edge is ``size`` pixels."""
+    scale = size / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def reduce_image(image, size):
+    """Downscale image to exactly ``size`` with Image.reduce plus a box resize."""
+    factor = min(image.width // size[0], image.height // size[1])
+    if factor >= 2:
+        image = image.reduce(factor)
+    if image.size != size:
+        image = image.resize(size, Image.Resampling.BOX)
+    return image
+
+
+def derivatives(image, sizes=DEFAULT_SIZES):
+    """
+    Return {size: image} for every size smaller than image, largest first.
+
+    Each derivative is reduced from the previous one rather than from the
+    full frame, so the smaller steps only touch a fraction of the pixels.
+    Sizes at or above the image's longer edge are skipped.
+    """
+    result = {}
+    source = image
+    for size in sorted(set(sizes), reverse=True):
+        if size >= max(image.size):
+            continue
+        source = reduce_image(source, derivative_size(image.width, image.height, size))
+        result[size] = source
+    return result
+
+
+def derivative_path(path, size):
+    """Return the file path for the ``size`` derivative of path (art.png -> art_128.png)."""
+    root, extension = os.path.splitext(os.fspath(path))
+    return f"{root}_{size}{extension}"
+
+
+def render_derivatives(day, time_obj, width=None, height=None, sizes=DEFAULT_SIZES,
+                       output_path=None, encoder=None, style=None, background="gradient"):
+    """
+    Render an artwork once and return {"full": image, size: image, ...}.
+
+    With ``output_path`` (a file path) the full image is written there and
+    each derivative next to it as derivative_path(output_path, size).
+    ``encoder`` is an image_encoders.ImageEncoder; by default a background
+    encoder with one worker per output is used and closed before returning.
+    A background encoder that is passed in is shared and left running, so
+    call its wait() before reading the files.
+    """
+    image = generate_artwork(day, time_obj, width=width, height=height, style=style,
+                             background=background)
+    images = {"full": image}
+    own_encoder = encoder is None and output_path is not None
+    if own_encoder:
+        encoder = ImageEncoder(background=True, workers=len(sizes) + 1)
+    try:
+        # Queue the full-size encode first so it overlaps with the reductions
+        if output_path is not None:
+            encoder.save(image, output_path)
+        for size, derived in derivatives(image, sizes).items():
+            images[size] = derived
+            if output_path is not None:
+                encoder.save(derived, derivative_path(output_path, size))
+    finally:
+        if own_encoder:
+            encoder.close()
+    return images
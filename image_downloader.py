@@ -0,0 +1,141 @@
+"""
+Shared download layer for generated images.
+
+An ImageDownloader keeps one requests.Session whose connection pool is reused
+across downloads, streams each response body to disk in fixed-size chunks
+instead of holding it in memory, and checks the number of bytes received (and
+optionally a SHA-256 digest) before the file appears under its final name.
+download_many() fetches several URLs at once on a small thread pool that
+shares the same connections.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CHUNK_SIZE = 256 * 1024
+
+
+class DownloadError(Exception):
+    """A download finished but its size or checksum did not match."""
+
+
+class ImageDownloader:
+    """
+    Stream URLs to files over a pool of keep-alive connections.
+
+    ``pool_size`` is the number of connections kept open per host and the
+    number of threads download_many() uses; ``chunk_size`` is how many bytes
+    are read and written at a time, which bounds the memory a download needs.
+    The downloader is safe to share between threads and usable as a context
+    manager.
+    """
+
+    def __init__(self, pool_size=8, chunk_size=CHUNK_SIZE, timeout=30):
+        self.pool_size = pool_size
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def download(self, url, destination, expected_size=None, sha256=None):
+        """
+        Stream url into destination and return a dict with the path, the
+        number of bytes, their SHA-256 hex digest and the elapsed seconds.
+
+        The body is written to a temporary file next to destination and only
+        renamed into place once its length matches Content-Length (and
+        ``expected_size`` / ``sha256`` when given); otherwise DownloadError is
+        raised and nothing is left behind.
+        """
+        started = time.perf_counter()
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+        temp_path = f"{destination}.{os.getpid()}.{threading.get_ident()}.part"
+        digest = hashlib.sha256()
+        received = 0
+
+        try:
+            with self._session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                content_length = response.headers.get("Content-Length")
+                with open(temp_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        received += len(chunk)
+
+            # Content-Length counts compressed bytes when the body was encoded
+            if content_length is not None and "Content-Encoding" not in response.headers \
+                    and received != int(content_length):
+                raise DownloadError(
+                    f"{url}: received {received} bytes, Content-Length was {content_length}")
+            if expected_size is not None and received != expected_size:
+                raise DownloadError(f"{url}: received {received} bytes, expected {expected_size}")
+            if sha256 is not None and digest.hexdigest() != sha256.lower():
+                raise DownloadError(f"{url}: SHA-256 {digest.hexdigest()} does not match {sha256}")
+            os.replace(temp_path, destination)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        return {
+            "path": destination,
+            "bytes": received,
+            "sha256": digest.hexdigest(),
+            "seconds": time.perf_counter() - started,
+        }
+
+    def download_many(self, jobs):
+        """
+        Download several (url, destination) pairs at once.
+
+        Jobs may also be dicts of download() keyword arguments. Returns, for
+        each job in order, the download() result or the exception it raised.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                    thread_name_prefix="image-downloader")
+            executor = self._executor
+
+        futures = []
+        for job in jobs:
+            if isinstance(job, dict):
+                futures.append(executor.submit(self.download, **job))
+            else:
+                futures.append(executor.submit(self.download, *job))
+
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as error:
+                results.append(error)
+        return results
+
+    def close(self):
+        """Stop the worker threads and close the pooled connections."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
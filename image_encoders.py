@@ -0,0 +1,173 @@
+"""
+Output encoders for rendered artwork.
+
+An ImageEncoder turns a finished Pillow image into PNG, WebP, JPEG or raw
+pixel bytes with tunable compression, and writes them to a path, an open
+file object or an in-memory buffer. Encoding can optionally run on a
+background thread so rendering the next image overlaps with compressing and
+writing the previous one; Pillow releases the GIL while it encodes.
+"""
+
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from PIL import Image
+
+FORMATS = {
+    "png": "PNG",
+    "webp": "WEBP",
+    "jpeg": "JPEG",
+    "raw": None,
+}
+
+EXTENSIONS = {
+    "png": ".png",
+    "webp": ".webp",
+    "jpeg": ".jpg",
+    "raw": ".raw",
+}
+
+
+def save_options(fmt, compress_level=None, optimize=False, quality=None, lossless=False):
+    """Translate the encoder settings into Pillow save() keyword arguments."""
+    options = {}
+    if fmt == "png":
+        if compress_level is not None:
+            options["compress_level"] = compress_level
+        if optimize:
+            options["optimize"] = True
+    elif fmt == "webp":
+        # WebP's "method" (0-6) is its speed/size trade-off
+        if compress_level is not None:
+            options["method"] = max(0, min(6, compress_level))
+        if quality is not None:
+            options["quality"] = quality
+        if lossless:
+            options["lossless"] = True
+    elif fmt == "jpeg":
+        if quality is not None:
+            options["quality"] = quality
+        if optimize:
+            options["optimize"] = True
+    return options
+
+
+class ImageEncoder:
+    """
+    Encode images in a chosen format and write them to a destination.
+
+    ``fmt`` is one of FORMATS, or ``None`` to pick the format from a path's
+    extension (PNG for file objects). ``compress_level`` is zlib's 0-9 for
+    PNG and the 0-6 method for WebP; ``quality`` applies to JPEG and lossy
+    WebP. With ``background=True`` save() queues the work on
+    ``workers`` threads and returns a Future; call wait() or close() to make
+    sure everything has been written. Images handed to a background encoder
+    must not be modified afterwards.
+    """
+
+    def __init__(self, fmt=None, compress_level=None, optimize=False, quality=None,
+                 lossless=False, background=False, workers=1):
+        if fmt is not None and fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {sorted(FORMATS)}, got {fmt!r}")
+        self.fmt = fmt
+        self.compress_level = compress_level
+        self.optimize = optimize
+        self.quality = quality
+        self.lossless = lossless
+        self.background = background
+        self.workers = workers
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = set()
+
+    @property
+    def extension(self):
+        """File extension for this encoder's format (PNG when unspecified)."""
+        return EXTENSIONS[self.fmt or "png"]
+
+    def encode(self, image, destination):
+        """Encode image into destination now and return the bytes written."""
+        if isinstance(destination, (str, os.PathLike)):
+            fmt = self.fmt or _format_from_path(destination)
+            os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+            with open(destination, "wb") as f:
+                return self._write(image, f, fmt)
+        return self._write(image, destination, self.fmt or "png")
+
+    def _write(self, image, f, fmt):
+        if fmt == "raw":
+            data = image.tobytes()
+            f.write(data)
+            return len(data)
+
+        start = f.tell() if f.seekable() else None
+        options = save_options(fmt, self.compress_level, self.optimize,
+                               self.quality, self.lossless)
+        image.save(f, format=FORMATS.get(fmt, fmt), **options)
+        return f.tell() - start if start is not None else None
+
+    def to_bytes(self, image):
+        """Encode image into an in-memory buffer and return its bytes."""
+        buffer = io.BytesIO()
+        self.encode(image, buffer)
+        return buffer.getvalue()
+
+    def save(self, image, destination):
+        """Encode now, or queue on the background thread when enabled."""
+        if not self.background:
+            return self.encode(image, destination)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="image-encoder")
+            future = self._executor.submit(self.encode, image, destination)
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def wait(self):
+        """Block until every queued background encode has finished."""
+        with self._lock:
+            pending = list(self._pending)
+        for future in wait(pending).done:
+            future.result()
+
+    def close(self):
+        """Finish queued work and stop the background thread."""
+        self.wait()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _format_from_path(path):
+    """Pick the format from a path's extension, as Image.save(path) would."""
+    extension = os.path.splitext(str(path))[1].lower()
+    for name, known in EXTENSIONS.items():
+        if known == extension:
+            return name
+    if extension == ".jpeg":
+        return "jpeg"
+    Image.init()
+    if extension not in Image.EXTENSION:
+        raise ValueError(f"unknown file extension: {extension!r}")
+    # Formats without encoder settings go straight to Pillow by name
+    return Image.EXTENSION[extension]
+
+
+DEFAULT_ENCODER = ImageEncoder()
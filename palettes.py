@@ -0,0 +1,113 @@
+"""
+Dynamic palettes and per-minute color grading.
+
+The day palettes in generate_art are fixed. With ``palette="dynamic"`` a
+render instead derives a color harmony from the timestamp: the day's
+colors keep their own saturation and value, but their hues are spread
+around the first (background) color as a complementary, analogous or
+triadic scheme. The finished frame is then graded as a whole: its hue is
+rotated by the same shift time_color() describes, and saturation and
+brightness follow the time of day.
+
+Grading never converts pixels to HSV. Hue rotation and saturation are both
+linear in RGB, so they combine into one 3x3 color matrix that Pillow applies
+natively, and brightness is a tone curve applied as a Pillow point() lookup
+table. Both tables depend only on the minute of the day and are cached, so
+repeat renders within a minute, or on another day, reuse them.
+"""
+
+import colorsys
+import functools
+import math
+
+# Hue offsets in degrees from the palette's anchor color, cycled over its colors
+HARMONIES = {
+    "analogous": (0, -30, 30),
+    "complementary": (0, 180),
+    "triadic": (0, 120, 240),
+}
+
+# Harmony by third of the day: calm nights, contrasting days, lively evenings
+HARMONY_SCHEDULE = ("analogous", "complementary", "triadic")
+
+# Luma weights used by the hue and saturation matrices (as in SVG feColorMatrix)
+_LUMA = (0.213, 0.715, 0.072)
+
+# How far saturation and brightness drop at their lowest time_influence values
+GRADE_STRENGTH = 0.5
+
+# One grade per minute of the day
+GRADE_CACHE_SIZE = 24 * 60
+
+
+def harmony_for_time(t):
+    """Return the harmony name a timestamp selects."""
+    return HARMONY_SCHEDULE[t.hour * len(HARMONY_SCHEDULE) // 24]
+
+
+@functools.lru_cache(maxsize=64)
+def harmony_palette(colors, harmony):
+    """
+    Return colors re-hued into the named harmony, as a tuple of RGB tuples.
+
+    ``colors`` is a tuple of RGB tuples. The first color anchors the
+    harmony and stays unchanged; color i takes the anchor's hue plus the
+    harmony's i-th offset and keeps its own saturation and value, so pale
+    or muted palettes stay pale or muted.
+    """
+    if harmony not in HARMONIES:
+        raise ValueError(f"unknown harmony {harmony!r}; choose one of {sorted(HARMONIES)}")
+    offsets = HARMONIES[harmony]
+    anchor = colorsys.rgb_to_hsv(*(c / 255 for c in colors[0]))[0]
+    palette = []
+    for i, color in enumerate(colors):
+        _, saturation, value = colorsys.rgb_to_hsv(*(c / 255 for c in color))
+        hue = (anchor + offsets[i % len(offsets)] / 360) % 1.0
+        palette.append(tuple(round(c * 255) for c in colorsys.hsv_to_rgb(hue, saturation, value)))
+    return tuple(palette)
+
+
+def _multiply(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
+
+
+def hue_matrix(degrees):
+    """3x3 matrix rotating hue around the grey axis while keeping luma."""
+    cos, sin = math.cos(math.radians(degrees)), math.sin(math.radians(degrees))
+    r, g, b = _LUMA
+    return [
+        [r + cos * (1 - r) - sin * r, g - cos * g - sin * g, b - cos * b + sin * (1 - b)],
+        [r - cos * r + sin * 0.143, g + cos * (1 - g) + sin * 0.140, b - cos * b - sin * 0.283],
+        [r - cos * r - sin * (1 - r), g - cos * g + sin * g, b + cos * (1 - b) + sin * b],
+    ]
+
+
+def saturation_matrix(scale):
+    """3x3 matrix moving colors towards (scale < 1) or away from their luma."""
+    return [[weight * (1 - scale) + (scale if i == j else 0) for j, weight in enumerate(_LUMA)]
+            for i in range(3)]
+
+
+@functools.lru_cache(maxsize=GRADE_CACHE_SIZE)
+def grade_tables(hue_shift, saturation, brightness):
+    """
+    Return the cached (matrix, lut) that grade a frame.
+
+    ``saturation`` and ``brightness`` are time_influence values (0.3 at
+    midnight to 1.0 at noon). The matrix is the 12-tuple
+    Image.convert("RGB", matrix) expects, rotating the hue by
+    ``hue_shift`` degrees and scaling saturation. The lut is the 768-entry
+    Image.point() table of a gamma curve that darkens midtones as
+    brightness falls, leaving black and white in place.
+    """
+    scale = 1 - GRADE_STRENGTH * (1 - saturation)
+    matrix = _multiply(saturation_matrix(scale), hue_matrix(hue_shift))
+    gamma = 1 + GRADE_STRENGTH * 2 * (1 - brightness)
+    curve = [round(255 * (value / 255) ** gamma) for value in range(256)]
+    return tuple(value for row in matrix for value in (*row, 0)), curve * 3
+
+
+def apply_grade(image, grade):
+    """Return the RGB image graded by (hue_shift, saturation, brightness)."""
+    matrix, lut = grade_tables(*grade)
+    return image.convert("RGB", matrix).point(lut)
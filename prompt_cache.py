@@ -0,0 +1,206 @@
+"""
+Persistent prompt → image cache for AI generations.
+
+A generated image is fully determined (as far as billing is concerned) by the
+prompt, model, size and quality sent to the API, so downloaded images are
+stored on disk under a hash of those four values. A later request for the
+same combination is answered by copying the cached file instead of paying for
+another generation. Entries expire after a TTL and the least recently used
+ones are evicted once the cache grows past its item or byte limits.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = os.path.join("output", "prompt_cache")
+
+
+def prompt_key(prompt, model, size, quality):
+    """Return the hex digest identifying one generation request."""
+    material = json.dumps([prompt, model, size, quality], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """
+    On-disk LRU cache of generated images with an optional TTL.
+
+    Each entry is ``<key>.png`` plus a ``<key>.json`` sidecar describing the
+    request it answers. ``ttl`` is the lifetime of an entry in seconds and
+    ``max_items`` / ``max_bytes`` bound the cache; ``None`` disables that
+    limit. The image file's mtime records the last access, so the LRU order
+    survives restarts. The cache is safe to share between threads.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=None, max_items=None,
+                 max_bytes=1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        # key -> (size, created), least recently used first
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evictions": 0,
+        }
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Index existing entries, oldest access first."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".png"):
+                continue
+            key = name[:-4]
+            try:
+                stat = os.stat(self._image_path(key))
+                created = os.stat(self._meta_path(key)).st_mtime
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, key, stat.st_size, created))
+        for _, key, size, created in sorted(entries):
+            self._entries[key] = (size, created)
+            self._bytes += size
+
+    def _image_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def _meta_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remove_files(self, keys):
+        for key in keys:
+            for path in (self._image_path(key), self._meta_path(key)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def lookup(self, key):
+        """Return the path of the cached image for key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1], now):
+                self._bytes -= self._entries.pop(key)[0]
+                self._counters["expired"] += 1
+                expired = True
+                entry = None
+            else:
+                expired = False
+            if entry is None:
+                self._counters["misses"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+
+        if expired:
+            self._remove_files([key])
+        if entry is None:
+            return None
+        path = self._image_path(key)
+        try:
+            # Refresh the mtime so the LRU order survives restarts
+            os.utime(path)
+        except FileNotFoundError:
+            # Removed behind our back; fetch() reports it as a miss
+            pass
+        return path
+
+    def fetch(self, key, destination):
+        """Copy the cached image for key to destination; return False on a miss."""
+        path = self.lookup(key)
+        if path is None:
+            return False
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+        try:
+            shutil.copyfile(path, destination)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key, source, **metadata):
+        """
+        Copy the image file at source into the cache under key.
+
+        ``metadata`` (prompt, model, ...) is written to the entry's sidecar
+        for inspection. Evicts least recently used entries past the limits.
+        """
+        image_path = self._image_path(key)
+        suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(source, f"{image_path}.{suffix}")
+        with open(f"{self._meta_path(key)}.{suffix}", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        os.replace(f"{self._meta_path(key)}.{suffix}", self._meta_path(key))
+        os.replace(f"{image_path}.{suffix}", image_path)
+        size = os.path.getsize(image_path)
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[0]
+            self._entries[key] = (size, time.time())
+            self._bytes += size
+            self._counters["stores"] += 1
+            evicted = []
+            while self._entries and (
+                (self.max_items is not None and len(self._entries) > self.max_items)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                old_key, (old_size, _) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self._counters["evictions"] += 1
+                evicted.append(old_key)
+
+        self._remove_files(evicted)
+
+    def purge_expired(self):
+        """Drop every entry older than the TTL and return how many were removed."""
+        if self.ttl is None:
+            return 0
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, created) in self._entries.items()
+                       if self._expired(created, now)]
+            for key in expired:
+                self._bytes -= self._entries.pop(key)[0]
+            self._counters["expired"] += len(expired)
+        self._remove_files(expired)
+        return len(expired)
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current cache size."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                "items": len(self._entries),
+                "bytes": self._bytes,
+                "oldest": min((created for _, created in self._entries.values()), default=None),
+            })
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        self._remove_files(keys)
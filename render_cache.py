@@ -0,0 +1,231 @@
+"""
+Content-addressed cache in front of generate_art.generate_artwork.
+
+Rendered artwork depends only on the day, the timestamp used as seed, the
+canvas size, the generator version and the style table (see art_config), so
+finished PNG bytes are stored under a hash of those inputs. Lookups go
+through an in-memory LRU first and an optional on-disk store second; a hit
+skips both rendering and PNG encoding.
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+from generate_art import GENERATOR_VERSION, active_styles, generate_artwork
+from image_encoders import ImageEncoder
+
+PNG_ENCODER = ImageEncoder("png")
+
+
+def cache_key(day, time_obj, width, height, version=GENERATOR_VERSION, styles=None):
+    """
+    Return the hex digest identifying one rendered artwork.
+
+    ``styles`` is the fingerprint of a style table loaded from a config;
+    None (the built-in table) leaves the key as it always was.
+    """
+    material = f"{version}|{day}|{time_obj.timestamp()!r}|{width}x{height}"
+    if styles is not None:
+        material += f"|{styles}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def encode_png(image):
+    """Encode an image with the same PNG settings generate_artwork uses."""
+    return PNG_ENCODER.to_bytes(image)
+
+
+class RenderCache:
+    """
+    Two-level LRU cache of rendered PNG bytes.
+
+    ``max_memory_items`` and ``max_memory_bytes`` bound the in-memory level;
+    ``max_disk_items`` and ``max_disk_bytes`` bound the on-disk level, which
+    is only used when ``cache_dir`` is given. A limit of ``None`` disables
+    that bound. The least recently used entries are evicted first. The cache
+    is safe to share between threads.
+    """
+
+    def __init__(self, cache_dir=None, max_memory_items=256, max_memory_bytes=256 * 1024 * 1024,
+                 max_disk_items=None, max_disk_bytes=4 * 1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_items = max_disk_items
+        self.max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _load_disk_index(self):
+        """Index existing cache files, oldest access first."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".png"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def _remember(self, key, data):
+        """Store data in the memory level and evict past the limits."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory and (
+            (self.max_memory_items is not None and len(self._memory) > self.max_memory_items)
+            or (self.max_memory_bytes is not None and self._memory_bytes > self.max_memory_bytes)
+        ):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._counters["memory_evictions"] += 1
+
+    def _persist(self, key, data):
+        """Write data atomically to the disk level and evict past the limits."""
+        path = self._disk_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            if key in self._disk:
+                self._disk_bytes -= self._disk.pop(key)
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            evicted = []
+            while self._disk and (
+                (self.max_disk_items is not None and len(self._disk) > self.max_disk_items)
+                or (self.max_disk_bytes is not None and self._disk_bytes > self.max_disk_bytes)
+            ):
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                self._counters["disk_evictions"] += 1
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            try:
+                os.remove(self._disk_path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def _lookup(self, key):
+        """Return cached bytes for key, or None on a miss."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return data
+            on_disk = self.cache_dir and key in self._disk
+
+        if on_disk:
+            path = self._disk_path(key)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = None
+            if data is not None:
+                # Refresh the file's mtime so the on-disk order survives restarts
+                os.utime(path)
+                with self._lock:
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                    self._counters["disk_hits"] += 1
+                    self._remember(key, data)
+                return data
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def render_png(self, day, time_obj, width=None, height=None):
+        """
+        Return the PNG bytes for an artwork, rendering it only on a miss.
+
+        ``width`` and ``height`` default to the active config's canvas.
+        """
+        # Key and render with the same table even if a config reload swaps it
+        styles = active_styles()
+        width = width or styles.canvas[0]
+        height = height or styles.canvas[1]
+        key = cache_key(day, time_obj, width, height, styles=styles.fingerprint)
+        data = self._lookup(key)
+        if data is not None:
+            return data
+
+        data = encode_png(generate_artwork(day, time_obj, width=width, height=height,
+                                           styles=styles))
+        with self._lock:
+            self._remember(key, data)
+        if self.cache_dir:
+            self._persist(key, data)
+        return data
+
+    def generate_artwork(self, day, time_obj, width=None, height=None, output_path=None):
+        """Cached drop-in for generate_art.generate_artwork."""
+        data = self.render_png(day, time_obj, width=width, height=height)
+        if output_path:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            with open(output_path, "wb") as f:
+                f.write(data)
+        return Image.open(io.BytesIO(data))
+
+    def stats(self):
+        """Return hit/miss/eviction counters and current cache sizes."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_items": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            })
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Drop every cached entry from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            keys = list(self._disk)
+            self._disk.clear()
+            self._disk_bytes = 0
+        for key in keys:
+            try:
+                os.remove(self._disk_path(key))
+            except FileNotFoundError:
+                pass
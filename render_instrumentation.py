@@ -0,0 +1,185 @@
+"""
+Optional stage-level instrumentation for generate_art.generate_artwork.
+
+Pass a RenderInstrumentation as ``generate_artwork(..., instrument=...)`` to
+time each stage of a render (scene, gradient, shapes, composite, grade when
+a dynamic palette is used, rotate, encode), count the Pillow images and
+memory blocks allocated in each, and hand the resulting record to a
+callback, a structured log, or both. A sampled fraction of renders can
+additionally be run under cProfile and/or tracemalloc, with the profiles
+dumped to a directory for offline inspection.
+
+Without an instrument generate_artwork takes its plain code path, so none of
+this costs anything when it is not used.
+"""
+
+import contextlib
+import cProfile
+import json
+import logging
+import os
+import random
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+from PIL import Image
+
+logger = logging.getLogger("generate_art.instrumentation")
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def no_stage(name):
+    """Stage hook used for renders that are not instrumented."""
+    return _NULL_STAGE
+
+
+def _pillow_stats():
+    stats = Image.core.get_stats()
+    return stats["new_count"], stats["allocated_blocks"] + stats["reallocated_blocks"]
+
+
+class _RenderTrace:
+    """Per-render collector whose stage() hook generate_artwork calls."""
+
+    def __init__(self, trace_memory):
+        self.stages = {}
+        self.trace_memory = trace_memory
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        images, blocks = _pillow_stats()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {"seconds": time.perf_counter() - start}
+            after_images, after_blocks = _pillow_stats()
+            record["pillow_images"] = after_images - images
+            record["pillow_blocks"] = after_blocks - blocks
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                record["python_peak_bytes"] = max(0, peak - traced_before)
+            self.stages[name] = record
+
+
+class RenderInstrumentation:
+    """
+    Collect per-stage timings and allocation counts for sampled renders.
+
+    ``sample_rate`` is the fraction of renders (0.0-1.0) that are
+    instrumented at all. Each instrumented render produces a record dict with
+    the render parameters, the total time and a ``stages`` mapping of stage
+    name to seconds, Pillow images allocated and Pillow memory blocks
+    allocated. The record is passed to ``callback`` and, with ``log=True``,
+    written as one JSON line to the ``generate_art.instrumentation`` logger.
+
+    ``profile_dir`` enables the heavy tools for a further ``profile_rate``
+    fraction of the instrumented renders: ``cprofile=True`` dumps a
+    ``.prof`` file loadable by pstats, and ``trace_memory=True`` records the
+    Python-side peak of each stage with tracemalloc and dumps a snapshot.
+
+    The last ``max_records`` records are kept in ``records``; summary()
+    aggregates over every instrumented render.
+
+    Pillow's allocation counters are process-wide, so per-stage counts are
+    only exact when renders do not overlap in other threads.
+    """
+
+    def __init__(self, callback=None, sample_rate=1.0, log=False, profile_dir=None,
+                 profile_rate=1.0, cprofile=False, trace_memory=False, seed=None,
+                 max_records=1000):
+        self.callback = callback
+        self.sample_rate = sample_rate
+        self.log = log
+        self.profile_dir = profile_dir
+        self.profile_rate = profile_rate
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._renders = 0
+        self._totals = {}
+        self.records = deque(maxlen=max_records)
+
+    def _sample(self, rate):
+        with self._lock:
+            return rate >= 1.0 or self._rng.random() < rate
+
+    @contextlib.contextmanager
+    def render(self, **info):
+        """
+        Context manager around one render; yields the stage hook to use.
+
+        Renders that are not sampled get the no-op hook and leave no record.
+        """
+        if not self._sample(self.sample_rate):
+            yield no_stage
+            return
+
+        with self._lock:
+            self._renders += 1
+            index = self._renders
+        profiled = self.profile_dir is not None and (self.cprofile or self.trace_memory) \
+            and self._sample(self.profile_rate)
+        trace_memory = profiled and self.trace_memory
+        started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile() if profiled and self.cprofile else None
+
+        trace = _RenderTrace(trace_memory)
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield trace.stage
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            total = time.perf_counter() - start
+
+            record = dict(info)
+            record.update({"render": index, "seconds": total, "stages": trace.stages})
+            if profiled:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                stem = os.path.join(self.profile_dir, f"render_{os.getpid()}_{index:06d}")
+                if profiler is not None:
+                    profiler.dump_stats(f"{stem}.prof")
+                    record["cprofile"] = f"{stem}.prof"
+                if trace_memory:
+                    tracemalloc.take_snapshot().dump(f"{stem}.tracemalloc")
+                    record["tracemalloc"] = f"{stem}.tracemalloc"
+            if started_tracing:
+                tracemalloc.stop()
+            self._finish(record)
+
+    def _finish(self, record):
+        with self._lock:
+            self.records.append(record)
+            for name, stage in record["stages"].items():
+                total = self._totals.setdefault(name, {"count": 0, "seconds": 0.0,
+                                                       "pillow_images": 0, "pillow_blocks": 0})
+                total["count"] += 1
+                total["seconds"] += stage["seconds"]
+                total["pillow_images"] += stage["pillow_images"]
+                total["pillow_blocks"] += stage["pillow_blocks"]
+        if self.log:
+            logger.info(json.dumps(record, default=str))
+        if self.callback is not None:
+            self.callback(record)
+
+    def summary(self):
+        """Return per-stage totals and means over every instrumented render."""
+        with self._lock:
+            summary = {}
+            for name, total in self._totals.items():
+                summary[name] = dict(total)
+                summary[name]["mean_ms"] = total["seconds"] / total["count"] * 1000
+            return {"renders": self._renders, "stages": summary}
@@ -0,0 +1,394 @@
+"""
+Long-running render service for the generated artwork.
+
+A RenderService keeps one process warm (Pillow and NumPy imported, palettes,
+shape tables and noise tables loaded, optionally a RenderCache of finished
+PNGs) and renders requests on a pool of workers. Only a fixed number of
+requests may be running or queued at once; anything beyond that is rejected
+immediately instead of piling up, so callers see backpressure as an HTTP 503
+with Retry-After. Latencies are kept for a sliding window and reported as
+percentiles on /metrics.
+
+The service is exposed over HTTP on a TCP port or a Unix socket:
+
+    GET /render?timestamp=2024-01-05T14:30:00&width=800&height=600&format=png
+    GET /metrics
+    GET /health
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from art_config import configure
+from batch_render import EXECUTORS
+from generate_art import active_styles, generate_artwork, shape_functions, use_styles
+from image_encoders import FORMATS, ImageEncoder
+from render_cache import RenderCache
+
+logger = logging.getLogger("generate_art.server")
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "raw": "application/octet-stream",
+}
+
+
+class QueueFull(Exception):
+    """The service already has as many requests running and queued as it allows."""
+
+
+def render_bytes(day, time_obj, width, height, fmt="png", style=None, cache=None):
+    """Render one artwork and return it encoded in fmt."""
+    if cache is not None and fmt == "png" and style is None:
+        return cache.render_png(day, time_obj, width=width, height=height)
+    image = generate_artwork(day, time_obj, width=width, height=height, style=style)
+    return ImageEncoder(fmt).to_bytes(image)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class RenderService:
+    """
+    Render artwork on a warm worker pool with bounded queuing.
+
+    ``workers`` renders run at once (default: CPU count) and up to
+    ``max_queue`` more wait for a worker; submit() raises QueueFull beyond
+    that. ``executor`` is "thread" (shares the warm state and the cache) or
+    "process". ``cache_items`` sizes an in-memory RenderCache for default-
+    style PNG requests in thread mode; 0 disables it. The last
+    ``latency_window`` requests feed the latency percentiles. ``config`` is
+    an art_config file to render with; with ``reload_interval`` (seconds)
+    edits to it are picked up while the service runs.
+    """
+
+    def __init__(self, workers=None, max_queue=None, executor="thread", cache_items=256,
+                 max_pixels=7680 * 4320, latency_window=1024, config=None, reload_interval=None):
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {sorted(EXECUTORS)}, got {executor!r}")
+        self._previous_styles = active_styles()
+        self.reloader = configure(config, reload_interval) if config else None
+        pool_options = {}
+        if config and executor == "process":
+            pool_options = {"initializer": configure, "initargs": (config, reload_interval)}
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = self.workers * 4 if max_queue is None else max_queue
+        self.executor = executor
+        self.max_pixels = max_pixels
+        self.cache = (RenderCache(max_memory_items=cache_items)
+                      if cache_items and executor == "thread" else None)
+
+        self._pool = EXECUTORS[executor](max_workers=self.workers, **pool_options)
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._in_flight = 0
+        self._started = time.time()
+        self._counters = {
+            "requests": 0,
+            "completed": 0,
+            "rejected": 0,
+            "errors": 0,
+        }
+
+    def warm_up(self, width=256, height=192):
+        """
+        Render every style once so imports, tables and caches are loaded.
+
+        The default size is large enough for every built-in style. A style
+        that fails is logged to the ``generate_art.server`` logger and
+        skipped rather than stopping start-up; returns {style: error}.
+        """
+        time_obj = datetime.datetime(2024, 1, 1, 12, 0, 0)
+        futures = {style: self._pool.submit(render_bytes, "Monday", time_obj, width, height,
+                                            "png", style)
+                   for style in shape_functions}
+        failures = {}
+        for style, future in futures.items():
+            try:
+                future.result()
+            except Exception as error:
+                failures[style] = error
+                logger.warning("warm-up render of style %r at %dx%d failed: %r",
+                               style, width, height, error)
+        return failures
+
+    def validate(self, day, width, height, fmt, style):
+        """Raise ValueError for a request the service will not render."""
+        if day not in active_styles().days:
+            raise ValueError(f"unknown day: {day!r}")
+        if width < 1 or height < 1 or width * height > self.max_pixels:
+            raise ValueError(f"size must be positive and at most {self.max_pixels} pixels")
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {sorted(FORMATS)}")
+        if style is not None and style not in shape_functions:
+            raise ValueError(f"style must be one of {sorted(shape_functions)}")
+
+    def submit(self, day, time_obj, width=None, height=None, fmt="png", style=None):
+        """
+        Queue a render and return a Future of its encoded bytes.
+
+        ``width`` and ``height`` default to the active config's canvas.
+        Raises QueueFull straight away when all workers are busy and the
+        queue is full, and ValueError for invalid parameters.
+        """
+        canvas = active_styles().canvas
+        width = canvas[0] if width is None else width
+        height = canvas[1] if height is None else height
+        self.validate(day, width, height, fmt, style)
+        with self._lock:
+            self._counters["requests"] += 1
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters["rejected"] += 1
+            raise QueueFull(f"{self.workers} renders running and {self.max_queue} queued")
+
+        started = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._pool.submit(render_bytes, day, time_obj, width, height, fmt, style,
+                                       self.cache)
+        except BaseException:
+            self._release(started, failed=True)
+            raise
+
+        # The caller's future completes only after the slot is released and
+        # the latency recorded, so metrics are up to date once it resolves
+        result = Future()
+
+        def finish(done):
+            error = done.exception()
+            self._release(started, failed=error is not None)
+            if error is None:
+                result.set_result(done.result())
+            else:
+                result.set_exception(error)
+
+        future.add_done_callback(finish)
+        return result
+
+    def _release(self, started, failed):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._in_flight -= 1
+            if failed:
+                self._counters["errors"] += 1
+            else:
+                self._counters["completed"] += 1
+                self._latencies.append(elapsed)
+        self._slots.release()
+
+    def render(self, day, time_obj, width=None, height=None, fmt="png", style=None):
+        """Render synchronously through the pool and return the encoded bytes."""
+        return self.submit(day, time_obj, width, height, fmt, style).result()
+
+    def metrics(self):
+        """Return request counters, queue depth and latency percentiles in ms."""
+        with self._lock:
+            metrics = dict(self._counters)
+            latencies = sorted(self._latencies)
+            in_flight = self._in_flight
+        metrics.update({
+            "uptime_seconds": time.time() - self._started,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "queued": max(0, in_flight - self.workers),
+            "latency_ms": {
+                name: (value * 1000 if value is not None else None)
+                for name, value in (("p50", percentile(latencies, 0.50)),
+                                    ("p90", percentile(latencies, 0.90)),
+                                    ("p99", percentile(latencies, 0.99)),
+                                    ("max", latencies[-1] if latencies else None))
+            },
+            "latency_samples": len(latencies),
+            "config": active_styles().fingerprint,
+        })
+        if self.cache is not None:
+            metrics["cache"] = self.cache.stats()
+        return metrics
+
+    def close(self):
+        """Finish running renders and stop the workers."""
+        self._pool.shutdown(wait=True)
+        if self.reloader is not None:
+            self.reloader.stop()
+            use_styles(self._previous_styles)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parse_render_query(query):
+    """Turn /render query parameters into submit() keyword arguments."""
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    if "timestamp" in params:
+        time_obj = datetime.datetime.fromisoformat(params["timestamp"])
+    else:
+        time_obj = datetime.datetime.now()
+    width, height = active_styles().canvas
+    return {
+        "day": params.get("day") or time_obj.strftime("%A"),
+        "time_obj": time_obj,
+        "width": int(params.get("width", width)),
+        "height": int(params.get("height", height)),
+        "fmt": params.get("format", "png"),
+        "style": params.get("style") or None,
+    }
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for the RenderService attached to the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload, headers=None):
+        self._send(status, json.dumps(payload).encode("utf-8"), headers=headers)
+
+    def do_GET(self):
+        service = self.server.service
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif url.path == "/metrics":
+            self._send_json(200, service.metrics())
+        elif url.path == "/render":
+            try:
+                request = parse_render_query(url.query)
+                future = service.submit(**request)
+            except QueueFull as error:
+                self._send_json(503, {"error": str(error)}, headers={"Retry-After": "1"})
+                return
+            except ValueError as error:
+                self._send_json(400, {"error": str(error)})
+                return
+            try:
+                data = future.result()
+            except ValueError as error:
+                # Styles such as symmetry and organic cannot lay out a canvas
+                # under about 100 px; that is the request's fault, not ours
+                self._send_json(400, {"error": f"cannot render this request: {error}"})
+                return
+            except Exception as error:
+                self._send_json(500, {"error": str(error)})
+                return
+            self._send(200, data, content_type=CONTENT_TYPES[request["fmt"]])
+        else:
+            self._send_json(404, {"error": "not found"})
+
+
+class RenderHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service):
+        self.service = service
+        super().__init__(address, RenderRequestHandler)
+
+
+class RenderUnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, service):
+        self.service = service
+        if os.path.exists(path):
+            os.remove(path)
+        super().__init__(path, RenderRequestHandler)
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) style client address
+        return request, ("unix", 0)
+
+
+def make_server(service, host="127.0.0.1", port=8765, unix_socket=None):
+    """Create (but do not start) an HTTP server for service."""
+    if unix_socket:
+        return RenderUnixHTTPServer(unix_socket, service)
+    return RenderHTTPServer((host, port), service)
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve generated artwork over HTTP from a warm, long-running process."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument("--unix-socket", default=None,
+                        help="Listen on this Unix socket path instead of a TCP port")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Concurrent renders (default: CPU count)")
+    parser.add_argument("--max-queue", type=int, default=None,
+                        help="Requests allowed to wait for a worker before 503 "
+                             "(default: 4 per worker)")
+    parser.add_argument("--processes", action="store_true",
+                        help="Render in worker processes instead of threads (disables the cache)")
+    parser.add_argument("--cache-items", type=int, default=256,
+                        help="PNG renders kept in memory (default: 256, 0 disables)")
+    parser.add_argument("--no-warm-up", action="store_true",
+                        help="Skip rendering every style once at start-up")
+    parser.add_argument("--config", default=None,
+                        help="JSON or TOML config with palettes, styles and ranges "
+                             "(see art_config)")
+    parser.add_argument("--reload-interval", type=float, default=None,
+                        help="Check the config for edits every this many seconds")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    service = RenderService(workers=args.workers, max_queue=args.max_queue,
+                            executor="process" if args.processes else "thread",
+                            cache_items=args.cache_items, config=args.config,
+                            reload_interval=args.reload_interval)
+    if not args.no_warm_up:
+        service.warm_up()
+    server = make_server(service, args.host, args.port, args.unix_socket)
+    where = args.unix_socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"✅ Render server listening on {where}")
+    print(f"Workers: {service.workers}, queue: {service.max_queue}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.remove(args.unix_socket)
+
+
+if __name__ == "__main__":
+    main()
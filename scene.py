@@ -0,0 +1,238 @@
+"""
+Array-backed display lists for the generated artwork.
+
+A Scene is the output of the scene-generation step: the shapes a draw_*
+function produced, stored as a handful of flat NumPy arrays (shape kind,
+point offsets into one coordinate array, RGBA color, line width), plus the
+render settings around them. Rasterizing is a separate step that replays the
+list onto an ImageDraw at any resolution, so one scene can give a thumbnail
+and a full-size image, be saved to disk or cached, and be replayed by other
+rasterizers.
+
+The draw_* functions do not need to know about scenes: a SceneRecorder has
+the same drawing methods as ImageDraw and records every call instead of
+painting it.
+"""
+
+import io
+import json
+
+import numpy as np
+from PIL import Image
+
+RECTANGLE, ELLIPSE, LINE, POLYGON, BITMAP = range(5)
+
+SHAPE_KINDS = ("rectangle", "ellipse", "line", "polygon", "bitmap")
+
+
+def _flatten(xy):
+    """Flatten [x0, y0, x1, y1, ...] or [(x0, y0), (x1, y1), ...] into a list."""
+    if xy and isinstance(xy[0], (tuple, list)):
+        return [value for point in xy for value in point]
+    return list(xy)
+
+
+def _rgba(fill):
+    fill = tuple(fill)
+    return fill if len(fill) == 4 else fill + (255,)
+
+
+class Scene:
+    """
+    A display list plus the settings needed to turn it into a frame.
+
+    Shape ``i`` has kind ``kinds[i]``, color ``colors[i]`` (RGBA) and the
+    points ``coords[offsets[i]:offsets[i + 1]]`` in pixels of the
+    ``width`` x ``height`` canvas the scene was generated for. Coordinates
+    are kept as recorded (float64), so sub-pixel geometry survives until
+    Pillow rounds it while drawing, at any rasterization scale. ``params[i]``
+    is the line width for lines and the index into ``masks`` for bitmaps.
+    ``settings`` holds the frame-level values (background color, rotation,
+    ...) as a JSON-serializable dict.
+    """
+
+    def __init__(self, width, height, kinds, offsets, coords, colors, params, masks=(),
+                 settings=None):
+        self.width = width
+        self.height = height
+        self.kinds = np.asarray(kinds, dtype=np.uint8)
+        self.offsets = np.asarray(offsets, dtype=np.int32)
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.colors = np.asarray(colors, dtype=np.uint8).reshape(-1, 4)
+        self.params = np.asarray(params, dtype=np.int32)
+        self.masks = list(masks)
+        self.settings = dict(settings or {})
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def nbytes(self):
+        """Memory held by the display list arrays and bitmap masks."""
+        arrays = (self.kinds, self.offsets, self.coords, self.colors, self.params)
+        return sum(array.nbytes for array in arrays) + sum(
+            mask.width * mask.height for mask in self.masks)
+
+    def bounds(self):
+        """
+        Return an (n, 4) array of each shape's [left, top, right, bottom].
+
+        Boxes are in scene pixels and padded by the line width and a pixel of
+        antialiasing slack, so a shape can be skipped wherever its box does
+        not overlap the area being drawn.
+        """
+        boxes = np.zeros((len(self), 4), dtype=np.int64)
+        if not len(self):
+            return boxes
+        starts = self.offsets[:-1]
+        boxes[:, :2] = np.floor(np.minimum.reduceat(self.coords, starts, axis=0))
+        boxes[:, 2:] = np.ceil(np.maximum.reduceat(self.coords, starts, axis=0))
+        # A bitmap covers its mask from the (unpadded) top-left corner
+        for i in np.flatnonzero(self.kinds == BITMAP):
+            mask = self.masks[self.params[i]]
+            boxes[i, 2:] = boxes[i, :2] + (mask.width, mask.height)
+
+        pad = np.where(self.kinds == LINE, self.params, 0) + 2
+        boxes[:, :2] -= pad[:, None]
+        boxes[:, 2:] += pad[:, None]
+        return boxes
+
+    def rasterize(self, draw, width=None, height=None, origin=(0, 0), indices=None):
+        """
+        Replay the display list onto an ImageDraw sized width x height.
+
+        At the scene's own size the calls are exactly the ones that were
+        recorded, so the pixels match drawing directly. At other sizes
+        coordinates and line widths are scaled, and bitmap masks are resized
+        bilinearly.
+
+        ``origin`` is where the ImageDraw's top-left corner sits in the
+        width x height frame, for drawing one region of it, and ``indices``
+        limits the replay to those shapes (in ascending order).
+        """
+        width = width or self.width
+        height = height or self.height
+        scale_x = width / self.width
+        scale_y = height / self.height
+        native = scale_x == 1 and scale_y == 1
+        scale = np.array([scale_x, scale_y])
+        line_scale = (scale_x + scale_y) / 2
+        shift = np.asarray(origin)
+        shifted = bool(shift.any())
+
+        kinds = self.kinds.tolist()
+        offsets = self.offsets.tolist()
+        colors = [tuple(color) for color in self.colors.tolist()]
+        params = self.params.tolist()
+        for i in range(len(kinds)) if indices is None else np.asarray(indices).tolist():
+            kind = kinds[i]
+            points = self.coords[offsets[i]:offsets[i + 1]]
+            if not native:
+                points = points * scale
+            if shifted:
+                if kind in (LINE, POLYGON):
+                    # Pillow truncates line and polygon points towards zero, so
+                    # a point shifted below zero would land a pixel off
+                    points = np.trunc(points)
+                points = points - shift
+            xy = points.ravel().tolist()
+            if kind == RECTANGLE:
+                draw.rectangle(xy, fill=colors[i])
+            elif kind == ELLIPSE:
+                draw.ellipse(xy, fill=colors[i])
+            elif kind == LINE:
+                line_width = params[i] if native else max(1, round(params[i] * line_scale))
+                draw.line(xy, fill=colors[i], width=line_width)
+            elif kind == POLYGON:
+                draw.polygon(xy, fill=colors[i])
+            elif kind == BITMAP:
+                mask = self.masks[params[i]]
+                if not native:
+                    size = (max(1, round(mask.width * scale_x)),
+                            max(1, round(mask.height * scale_y)))
+                    mask = mask.resize(size, Image.Resampling.BILINEAR)
+                draw.bitmap((round(xy[0]), round(xy[1])), mask, fill=colors[i])
+
+    def to_bytes(self):
+        """Serialize the scene into a compressed .npz payload."""
+        buffer = io.BytesIO()
+        self.save(buffer)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Rebuild a scene serialized with to_bytes()."""
+        return cls.load(io.BytesIO(data))
+
+    def save(self, destination):
+        """Write the scene to a .npz file path or file object."""
+        meta = {"width": self.width, "height": self.height, "settings": self.settings}
+        arrays = {
+            "meta": np.array(json.dumps(meta)),
+            "kinds": self.kinds,
+            "offsets": self.offsets,
+            "coords": self.coords,
+            "colors": self.colors,
+            "params": self.params,
+        }
+        for index, mask in enumerate(self.masks):
+            arrays[f"mask_{index}"] = np.asarray(mask)
+        np.savez_compressed(destination, **arrays)
+
+    @classmethod
+    def load(cls, source):
+        """Read a scene written by save()."""
+        with np.load(source) as data:
+            meta = json.loads(str(data["meta"]))
+            masks = []
+            while f"mask_{len(masks)}" in data:
+                masks.append(Image.fromarray(data[f"mask_{len(masks)}"]))
+            return cls(meta["width"], meta["height"], data["kinds"], data["offsets"],
+                       data["coords"], data["colors"], data["params"], masks, meta["settings"])
+
+
+class SceneRecorder:
+    """
+    Drop-in for the ImageDraw methods the draw_* functions use.
+
+    Every call is appended to a display list instead of being painted;
+    scene() returns the recorded Scene.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._kinds = []
+        self._offsets = [0]
+        self._coords = []
+        self._colors = []
+        self._params = []
+        self._masks = []
+
+    def _add(self, kind, xy, fill, param=0):
+        self._coords.extend(_flatten(xy))
+        self._kinds.append(kind)
+        self._offsets.append(len(self._coords) // 2)
+        self._colors.append(_rgba(fill))
+        self._params.append(param)
+
+    def rectangle(self, xy, fill=None):
+        self._add(RECTANGLE, xy, fill)
+
+    def ellipse(self, xy, fill=None):
+        self._add(ELLIPSE, xy, fill)
+
+    def line(self, xy, fill=None, width=1):
+        self._add(LINE, xy, fill, width)
+
+    def polygon(self, xy, fill=None):
+        self._add(POLYGON, xy, fill)
+
+    def bitmap(self, xy, bitmap, fill=None):
+        self._masks.append(bitmap)
+        self._add(BITMAP, xy, fill, len(self._masks) - 1)
+
+    def scene(self, settings=None):
+        """Return the recorded shapes as a Scene."""
+        return Scene(self.width, self.height, self._kinds, self._offsets, self._coords,
+                     self._colors, self._params, self._masks, settings)
@@ -0,0 +1,156 @@
+"""
+Local stand-in for the OpenAI images endpoint and its image download URLs.
+
+StubImageServer runs a threaded HTTP server on 127.0.0.1 that answers
+POST /v1/images/generations with either a download URL or an inline base64
+payload, and serves the referenced PNG from GET /files/<name>. It can fail the
+first requests with 429 or 500 to exercise retry logic and add artificial latency,
+which makes it usable from tests and benchmarks without network access or an
+API key.
+"""
+
+import base64
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+
+def sample_png(size=64, color=(52, 152, 219)):
+    """Return the bytes of a small solid-color PNG."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (size, size), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class StubImageServer:
+    """
+    Threaded fake of the images API, usable as a context manager.
+
+    ``rate_limit_first`` generation requests get a 429 response and the next
+    ``fail_first`` a 500, ``response_format`` is "url" or "b64_json", and
+    ``latency`` seconds are slept before every response. ``files`` maps extra
+    download names to bytes. Counters record generation requests,
+    rate-limited and failed requests, downloads and accepted TCP connections.
+    """
+
+    def __init__(self, image_bytes=None, rate_limit_first=0, response_format="url", latency=0.0,
+                 files=None, fail_first=0):
+        self.image_bytes = image_bytes if image_bytes is not None else sample_png()
+        self.rate_limit_first = rate_limit_first
+        self.fail_first = fail_first
+        self.response_format = response_format
+        self.latency = latency
+        self.files = dict(files or {})
+        self.files.setdefault("image.png", self.image_bytes)
+        self.generation_requests = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.downloads = 0
+        self.connections = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """Base URL to hand to the OpenAI client."""
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def file_url(self, name):
+        """Download URL for a file served by the stub."""
+        return f"http://127.0.0.1:{self._server.server_port}/files/{name}"
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def _send(self, status, body, content_type="application/json", headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if not self.path.endswith("/images/generations"):
+                    self._send(404, b'{"error": {"message": "not found"}}')
+                    return
+
+                with stub._lock:
+                    stub.generation_requests += 1
+                    limited = stub.rate_limited < stub.rate_limit_first
+                    failed = not limited and stub.failed < stub.fail_first
+                    if limited:
+                        stub.rate_limited += 1
+                    elif failed:
+                        stub.failed += 1
+                    else:
+                        stub.prompts.append(payload.get("prompt"))
+                if limited:
+                    body = json.dumps({"error": {"message": "Rate limit reached",
+                                                 "type": "requests",
+                                                 "code": "rate_limit_exceeded"}}).encode()
+                    self._send(429, body, headers={"Retry-After": "0"})
+                    return
+                if failed:
+                    body = json.dumps({"error": {"message": "The server had an error",
+                                                 "type": "server_error"}}).encode()
+                    self._send(500, body)
+                    return
+
+                if stub.response_format == "b64_json":
+                    item = {"b64_json": base64.b64encode(stub.image_bytes).decode("ascii")}
+                else:
+                    item = {"url": stub.file_url("image.png")}
+                self._send(200, json.dumps({"created": int(time.time()), "data": [item]}).encode())
+
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                name = self.path.split("?", 1)[0].rsplit("/", 1)[-1]
+                if not self.path.startswith("/files/") or name not in stub.files:
+                    self._send(404, b"not found", content_type="text/plain")
+                    return
+                with stub._lock:
+                    stub.downloads += 1
+                self._send(200, stub.files[name], content_type="image/png")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
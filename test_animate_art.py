@@ -0,0 +1,113 @@
+"""
+Tests for the time-lapse animation mode.
+"""
+
+import datetime
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from PIL import Image, ImageSequence
+
+from animate_art import (
+    animate_artwork,
+    interpolate_influence,
+    keyframe_influence,
+    write_gif,
+    write_sequence,
+    write_webp
+)
+from batch_render import iter_timestamps
+from generate_art import generate_artwork, time_influence
+
+START = datetime.datetime(2023, 1, 7, 9, 0, 0)
+STEP = datetime.timedelta(minutes=3)
+
+
+def frame_times(count):
+    return list(iter_timestamps(START, START + STEP * count, STEP))
+
+
+def test_interpolate_influence():
+    """Test blending of influence values between keyframes."""
+    a = time_influence(datetime.datetime(2023, 1, 1, 6, 0, 0))
+    b = time_influence(datetime.datetime(2023, 1, 1, 7, 0, 0))
+    assert interpolate_influence(a, b, 0.0) == a, "Ratio 0 should give the start"
+    middle = interpolate_influence(a, b, 0.5)
+    assert abs(middle["size"] - (a["size"] + b["size"]) / 2) < 1e-9, "Floats should be blended"
+    assert isinstance(middle["complexity"], int), "Complexity should stay an integer"
+    
+    wrap = interpolate_influence({"angle": 350}, {"angle": 10}, 0.5)
+    assert wrap["angle"] == 0, "Angle should interpolate the short way round"
+    
+    interval = datetime.timedelta(minutes=10)
+    influence, _ = keyframe_influence(datetime.datetime(2023, 1, 1, 6, 0, 0), interval)
+    assert influence == a, "Keyframe times should use time_influence exactly"
+    
+    print("✅ test_interpolate_influence passed")
+
+
+def test_animate_artwork_frames():
+    """Test that frames reuse the first render's layout and stream lazily."""
+    frames = animate_artwork("Saturday", iter(frame_times(4)), width=160, height=120)
+    first = next(frames).copy()
+    expected = generate_artwork("Saturday", START, width=160, height=120)
+    assert first.tobytes() == expected.tobytes(), "First keyframe should match generate_artwork"
+    remaining = [frame.copy() for frame in frames]
+    assert len(remaining) == 3, "One frame per timestamp"
+    assert all(frame.size == (160, 120) for frame in remaining), "Frames should keep the size"
+    
+    print("✅ test_animate_artwork_frames passed")
+
+
+def test_animation_writers():
+    """Test GIF, WebP and image-sequence output."""
+    times = frame_times(6)
+    
+    buffer = io.BytesIO()
+    write_gif(animate_artwork("Tuesday", times, width=96, height=72), buffer, duration=50)
+    gif = Image.open(io.BytesIO(buffer.getvalue()))
+    assert gif.format == "GIF", "Output should be a GIF"
+    assert gif.n_frames == 6, "GIF should contain every frame"
+    assert gif.size == (96, 72), "GIF should keep the frame size"
+    assert gif.info.get("duration") == 50, "GIF should carry the frame duration"
+    
+    buffer = io.BytesIO()
+    write_webp(animate_artwork("Tuesday", times, width=96, height=72), 6, buffer, lossless=True)
+    webp = Image.open(io.BytesIO(buffer.getvalue()))
+    assert webp.format == "WEBP", "Output should be a WebP"
+    assert webp.n_frames == 6, "WebP should contain every frame"
+    expected = [frame.copy() for frame in animate_artwork("Tuesday", times, width=96, height=72)]
+    for index, frame in enumerate(ImageSequence.Iterator(webp)):
+        assert frame.convert("RGB").tobytes() == expected[index].tobytes(), \
+            f"Lossless WebP frame {index} should match the rendered frame"
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        count = write_sequence(animate_artwork("Tuesday", times, width=96, height=72), tmpdir)
+        assert count == 6, "Sequence should report every frame"
+        assert sorted(os.listdir(tmpdir))[0] == "frame_000001.png", "Frames should be numbered"
+        assert len(os.listdir(tmpdir)) == 6, "One file per frame"
+    
+    print("✅ test_animation_writers passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for animate_art.py\n")
+    print("=" * 50)
+    
+    test_interpolate_influence()
+    test_animate_artwork_frames()
+    test_animation_writers()
+    
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,201 @@
+"""
+Tests for config files, the style registry and config hot reload.
+"""
+
+import datetime
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from PIL import Image
+
+from animate_art import animate_artwork
+from art_config import ConfigReloader, compile_config, load_config
+from bulk_raster import generate_high_volume
+from generate_art import (DEFAULT_STYLES, active_styles, generate_artwork, register_style,
+                          shape_functions, time_influence, use_styles)
+from image_derivatives import render_derivatives
+from render_cache import RenderCache
+from render_server import RenderService
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+
+PLUGIN_SOURCE = '''
+from generate_art import register_style
+
+
+@register_style("test_stripes")
+def draw_stripes(draw, width, height, colors, influence, rng):
+    for i in range(influence["complexity"]):
+        x = rng.randint(0, width)
+        draw.rectangle([x, 0, x + 8, height], fill=colors[i % len(colors)] + (255,))
+'''
+
+TOML_CONFIG = '''
+plugins = ["test_art_plugin"]
+
+[canvas]
+width = 320
+height = 200
+
+[ranges]
+complexity = [20, 30]
+
+[days.Friday]
+concept = "striped rhythms"
+style = "test_stripes"
+colors = ["#102030", [200, 40, 90]]
+'''
+
+
+def test_load_config():
+    """Test that a TOML config with a plugin style is compiled and used for rendering."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        Path(tmpdir, "test_art_plugin.py").write_text(PLUGIN_SOURCE)
+        Path(tmpdir, "art.toml").write_text(TOML_CONFIG)
+        sys.path.insert(0, tmpdir)
+        try:
+            table = load_config(os.path.join(tmpdir, "art.toml"))
+            assert active_styles() is table, "Loading should activate the config"
+            concept, colors, style, function = table.days["Friday"]
+            assert (concept, colors, style) == ("striped rhythms", ((16, 32, 48), (200, 40, 90)),
+                                                "test_stripes"), "Day settings should be compiled"
+            assert function is shape_functions["test_stripes"], "Styles should resolve at load"
+            assert table.days["Monday"] == DEFAULT_STYLES.days["Monday"], \
+                "Days the config leaves out should keep their defaults"
+            assert 20 <= time_influence(SAMPLE_TIME)["complexity"] <= 30, "Ranges should apply"
+
+            image = generate_artwork("Friday", SAMPLE_TIME)
+            assert image.size == (320, 200), "The config canvas should be the default size"
+            with RenderService(workers=1, cache_items=0) as service:
+                served = service.render("Friday", SAMPLE_TIME)
+            cached = RenderCache().render_png("Friday", SAMPLE_TIME)
+            derived = render_derivatives("Friday", SAMPLE_TIME, sizes=())
+            sizes = {
+                "render_png": Image.open(io.BytesIO(cached)).size,
+                "animate_artwork": next(animate_artwork("Friday", [SAMPLE_TIME])).size,
+                "render_derivatives": derived["full"].size,
+                "generate_high_volume": generate_high_volume("Monday", SAMPLE_TIME).size,
+                "RenderService": Image.open(io.BytesIO(served)).size,
+            }
+            for entry_point, size in sizes.items():
+                assert size == (320, 200), f"{entry_point} should default to the config canvas"
+            default = generate_artwork("Friday", SAMPLE_TIME, 320, 200, styles=DEFAULT_STYLES)
+            assert image.tobytes() != default.tobytes(), "The plugin style should be drawn"
+
+            as_json = {"plugins": ["test_art_plugin"], "canvas": {"width": 320, "height": 200},
+                       "ranges": {"complexity": [20, 30]},
+                       "days": {"Friday": {"concept": "striped rhythms", "style": "test_stripes",
+                                           "colors": ["#102030", [200, 40, 90]]}}}
+            assert compile_config(as_json).fingerprint == table.fingerprint, \
+                "JSON and TOML configs should compile to the same table"
+        finally:
+            use_styles(DEFAULT_STYLES)
+            sys.path.remove(tmpdir)
+            shape_functions.pop("test_stripes", None)
+            sys.modules.pop("test_art_plugin", None)
+
+    assert generate_artwork("Friday", SAMPLE_TIME).size == (800, 600), "Defaults should be back"
+    print("✅ test_load_config passed")
+
+
+def test_validation():
+    """Test that invalid configs and duplicate styles are rejected with the setting named."""
+    bad_configs = {
+        "colour": {"colour": {}},
+        "days.Funday": {"days": {"Funday": {"style": "circles"}}},
+        "days.Friday.style": {"days": {"Friday": {"style": "spirals"}}},
+        "days.Friday.colors": {"days": {"Friday": {"colors": ["#12345"]}}},
+        "ranges.opacity": {"ranges": {"opacity": [100, 300]}},
+        "ranges.size": {"ranges": {"size": [1.0, 0.5]}},
+        "ranges.complexity": {"ranges": {"complexity": [2.5, 8]}},
+        "canvas.width": {"canvas": {"width": 0}},
+        "days": {"days": []},
+        "canvas": {"canvas": 5},
+        "ranges": {"ranges": 5},
+        "plugins": {"plugins": ["test_missing_art_plugin"]},
+    }
+    for where, data in bad_configs.items():
+        try:
+            compile_config(data)
+            raise AssertionError(f"{where} should be rejected")
+        except ValueError as error:
+            assert where in str(error), f"Error should name {where}: {error}"
+
+    try:
+        register_style("circles", lambda *args: None)
+        raise AssertionError("Registering a taken style name should fail")
+    except ValueError:
+        pass
+    assert active_styles() is DEFAULT_STYLES, "Failed configs should not be activated"
+
+    print("✅ test_validation passed")
+
+
+def test_hot_reload():
+    """Test that edits are picked up, broken edits are skipped and caches tell tables apart."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "art.json")
+        Path(path).write_text(json.dumps({"days": {"Friday": {"colors": ["#202020"]}}}))
+        reloader = ConfigReloader(path)
+        try:
+            first = active_styles()
+            assert first.days["Friday"][1] == ((32, 32, 32),), "The file should load at start"
+            assert not reloader.check(), "An unchanged file should not reload"
+
+            cache = RenderCache(max_memory_items=8)
+            before = cache.render_png("Friday", SAMPLE_TIME, 64, 48)
+
+            edited = {"days": {"Friday": {"colors": ["#e0e0e0", "#ff0000"]}}}
+            Path(path).write_text(json.dumps(edited))
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+            assert reloader.check() and reloader.reloads == 1, "An edit should reload"
+            second = active_styles()
+            assert second.days["Friday"][1] == ((224, 224, 224), (255, 0, 0)), "Edit should apply"
+            assert cache.render_png("Friday", SAMPLE_TIME, 64, 48) != before, \
+                "Cached renders from the old config should not be reused"
+
+            Path(path).write_text("{not json")
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2 * 10 ** 9))
+            assert not reloader.check() and reloader.errors == 1, "Broken edits should be skipped"
+            assert active_styles() is second, "The last good config should stay active"
+
+            reloader.interval = 0.01
+            reloader.start()
+            Path(path).write_text(json.dumps({"days": []}))
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 3 * 10 ** 9))
+            deadline = time.monotonic() + 5
+            while reloader.errors < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert reloader.errors >= 2, "Malformed edits should be counted as errors"
+            assert reloader._thread.is_alive(), "The reload thread should survive bad edits"
+            assert active_styles() is second, "Malformed edits should not be activated"
+        finally:
+            reloader.stop()
+            use_styles(DEFAULT_STYLES)
+
+    print("✅ test_hot_reload passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for art_config.py\n")
+    print("=" * 50)
+
+    test_load_config()
+    test_validation()
+    test_hot_reload()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,81 @@
+"""
+Tests for the batch renderer.
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from batch_render import iter_timestamps, output_path_for, render_batch
+
+
+def test_iter_timestamps():
+    """Test that timestamps cover the range with an exclusive end."""
+    start = datetime.datetime(2024, 1, 1, 0, 0, 0)
+    end = datetime.datetime(2024, 1, 1, 0, 5, 0)
+    timestamps = list(iter_timestamps(start, end, datetime.timedelta(minutes=1)))
+    assert len(timestamps) == 5, "Should yield one timestamp per minute"
+    assert timestamps[0] == start, "First timestamp should be the start"
+    assert timestamps[-1] == datetime.datetime(2024, 1, 1, 0, 4, 0), "End should be exclusive"
+    
+    try:
+        list(iter_timestamps(start, end, datetime.timedelta(0)))
+        assert False, "Zero step should raise ValueError"
+    except ValueError:
+        pass
+    
+    print("✅ test_iter_timestamps passed")
+
+
+def test_render_batch_deterministic():
+    """Test that the same range gives identical images for any worker count."""
+    start = datetime.datetime(2024, 3, 4, 9, 0, 0)
+    end = datetime.datetime(2024, 3, 4, 9, 6, 0)
+    step = datetime.timedelta(minutes=1)
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        serial_dir = os.path.join(tmpdir, "serial")
+        pooled_dir = os.path.join(tmpdir, "pooled")
+        serial = render_batch(start, end, step, width=120, height=90,
+                              output_dir=serial_dir, workers=1)
+        threaded_dir = os.path.join(tmpdir, "threaded")
+        pooled = render_batch(start, end, step, width=120, height=90,
+                              output_dir=pooled_dir, workers=3, max_pending=2)
+        threaded = render_batch(start, end, step, width=120, height=90,
+                                output_dir=threaded_dir, workers=4, executor="thread")
+        
+        assert serial["images"] == 6, "Serial run should render 6 images"
+        assert pooled["images"] == 6, "Pooled run should render 6 images"
+        assert threaded["images"] == 6, "Threaded run should render 6 images"
+        assert pooled["images_per_second"] > 0, "Throughput should be reported"
+        
+        for time_obj in iter_timestamps(start, end, step):
+            serial_path = output_path_for(serial_dir, time_obj)
+            with open(serial_path, "rb") as f:
+                expected = f.read()
+            for other_dir in (pooled_dir, threaded_dir):
+                with open(output_path_for(other_dir, time_obj), "rb") as f:
+                    assert f.read() == expected, f"Images differ for {time_obj} in {other_dir}"
+    
+    print("✅ test_render_batch_deterministic passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for batch_render.py\n")
+    print("=" * 50)
+    
+    test_iter_timestamps()
+    test_render_batch_deterministic()
+    
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
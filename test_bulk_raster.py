@@ -0,0 +1,152 @@
+"""
+Tests for the high-volume batched rasterizer.
+"""
+
+import datetime
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bulk_raster import BulkCanvas, bulk_styles, generate_high_volume
+from generate_art import active_styles, gradient_canvas, time_influence
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+
+
+def test_primitive_coverage():
+    """Test that single primitives cover the right pixels with the right colors."""
+    image = Image.new("RGB", (60, 40), (0, 0, 0))
+    canvas = BulkCanvas(60, 40)
+    canvas.discs([20], [20], [10], [(255, 0, 0, 255)])
+    canvas.composite(image)
+    pixels = np.asarray(image)
+    assert tuple(pixels[20, 20]) == (255, 0, 0), "Disc centre should be the fill color"
+    assert not pixels[:, 35:].any(), "Pixels outside the disc should be untouched"
+    area = pixels[:, :, 0].sum() / 255
+    assert abs(area - math.pi * 100) < 0.02 * math.pi * 100, \
+        f"Anti-aliased coverage should add up to the disc's area, got {area:.1f}"
+
+    image = Image.new("RGB", (60, 40), (0, 0, 0))
+    canvas = BulkCanvas(60, 40)
+    canvas.rectangles([5], [6], [14], [20], [(0, 0, 255, 255)])
+    canvas.composite(image)
+    expected = np.zeros((40, 60, 3), dtype=np.uint8)
+    expected[6:21, 5:15] = (0, 0, 255)
+    assert np.array_equal(np.asarray(image), expected), \
+        "Integer rectangles should fill exactly like ImageDraw"
+
+    print("✅ test_primitive_coverage passed")
+
+
+def test_blending():
+    """Test that translucent primitives blend regardless of order."""
+    image = Image.new("RGB", (20, 20), (0, 0, 200))
+    canvas = BulkCanvas(20, 20)
+    canvas.rectangles([0], [0], [19], [19], [(200, 100, 0, 128)])
+    canvas.composite(image)
+    red, green, blue = np.asarray(image)[10, 10]
+    assert (red, green, blue) == (100, 50, 100), "Half alpha should blend half way"
+
+    colors = [(255, 0, 0, 128), (0, 255, 0, 128), (0, 0, 255, 200)]
+    results = []
+    for order in ([0, 1, 2], [2, 0, 1]):
+        image = gradient_canvas((52, 152, 219), 30, 30)
+        canvas = BulkCanvas(30, 30)
+        for index in order:
+            canvas.discs([10 + 5 * index], [15], [8], [colors[index]])
+        canvas.composite(image)
+        results.append(np.asarray(image).astype(int))
+    assert np.abs(results[0] - results[1]).max() <= 1, "Blending should not depend on order"
+
+    print("✅ test_blending passed")
+
+
+def test_generate_high_volume():
+    """Test high-volume renders for every style, size and primitive count."""
+    rotation = time_influence(SAMPLE_TIME)["angle"] % 10 - 5
+    plain = gradient_canvas(active_styles().days["Friday"][1][0], 200, 150)
+    plain = plain.rotate(rotation, fillcolor=(255, 255, 255))
+    for style in bulk_styles:
+        image = generate_high_volume("Friday", SAMPLE_TIME, 200, 150, style=style)
+        again = generate_high_volume("Friday", SAMPLE_TIME, 200, 150, style=style)
+        assert image.size == (200, 150), f"{style} should keep the requested size"
+        assert image.tobytes() == again.tobytes(), f"{style} should be deterministic"
+        assert image.tobytes() != plain.tobytes(), f"{style} should draw shapes"
+
+    canvas_pixels = 320 * 240
+    busy = generate_high_volume("Saturday", SAMPLE_TIME, 320, 240, primitives=20000)
+    assert busy.size == (320, 240), "Large primitive counts should render"
+    colors = np.unique(np.asarray(busy).reshape(-1, 3), axis=0)
+    assert len(colors) > canvas_pixels // 20, "Many primitives should add detail"
+
+    try:
+        generate_high_volume("Friday", SAMPLE_TIME, 200, 150, style="voronoi")
+        raise AssertionError("Styles without a high-volume mode should be rejected")
+    except ValueError:
+        pass
+
+    print("✅ test_generate_high_volume passed")
+
+
+def test_high_volume_rotation():
+    """Test that the shapes land where directly drawn, rotated discs would be."""
+    width, height = 320, 240
+    discs = []
+    circles = bulk_styles["circles"]
+
+    def recording(canvas, *args, **kwargs):
+        draw_discs = canvas.discs
+
+        def record(*disc_args):
+            discs.append(disc_args)
+            draw_discs(*disc_args)
+
+        canvas.discs = record
+        circles(canvas, *args, **kwargs)
+
+    bulk_styles["circles"] = recording
+    try:
+        image = generate_high_volume("Friday", SAMPLE_TIME, width, height, style="circles")
+    finally:
+        bulk_styles["circles"] = circles
+
+    # Blending order differs from ImageDraw, but which pixels are covered does not
+    reference = Image.new("L", (width, height))
+    draw = ImageDraw.Draw(reference)
+    for x, y, radius in zip(*(np.asarray(values).tolist() for values in discs[0][:3])):
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=255)
+    rotation = time_influence(SAMPLE_TIME)["angle"] % 10 - 5
+    assert rotation != 0, "The sample time should rotate the frame"
+    plain = gradient_canvas(active_styles().days["Friday"][1][0], width, height)
+    plain = np.asarray(plain.rotate(rotation, fillcolor=(255, 255, 255))).astype(int)
+    covered = np.abs(np.asarray(image).astype(int) - plain).max(axis=2) > 24
+    expected = np.asarray(reference.rotate(rotation)) > 127
+    assert covered.sum() > expected.sum() // 2, "Most of the discs should be visible"
+    outside = (covered & ~expected).sum() / covered.sum()
+    assert outside < 0.005, f"{outside:.1%} of the drawn pixels lie outside the rotated discs"
+
+    print("✅ test_high_volume_rotation passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for bulk_raster.py\n")
+    print("=" * 50)
+
+    test_primitive_coverage()
+    test_blending()
+    test_generate_high_volume()
+    test_high_volume_rotation()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,170 @@
+"""
+Tests for the async batch mode of generate_ai_art.py, run against a local stub
+of the images API.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from openai import APIConnectionError, AsyncOpenAI, RateLimitError
+
+from generate_ai_art import batch_prompts, generate_batch
+from prompt_cache import PromptCache
+from stub_image_server import StubImageServer
+
+
+def _client(stub):
+    return AsyncOpenAI(api_key="sk-test", base_url=stub.base_url, max_retries=0)
+
+
+def test_import_is_lazy():
+    """Test that importing needs no API key and loads neither the SDK nor requests."""
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    code = (
+        "import sys; import generate_ai_art; "
+        "print(sorted(m for m in ('openai', 'requests', 'dotenv', 'asyncio') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, f"Import should not exit without a key: {result.stdout}"
+    assert result.stdout.strip() == "[]", f"Heavy modules loaded at import: {result.stdout}"
+
+    print("✅ test_import_is_lazy passed")
+
+
+def test_batch_prompts():
+    """Test that batch prompts vary and are reproducible from a seed."""
+    import random
+
+    first = batch_prompts(5, "Monday", 9, ["sunset"], rng=random.Random(7))
+    second = batch_prompts(5, "Monday", 9, ["sunset"], rng=random.Random(7))
+    assert first == second, "Same seed should give the same prompts"
+    assert len(set(first)) > 1, "Variations should differ"
+    assert all("sunset" in prompt for prompt in first), "Keywords should be in every prompt"
+
+    fixed = batch_prompts(3, "Monday", 9, [], style="Cubism", rng=random.Random(7))
+    assert all("Style: Cubism" in prompt for prompt in fixed), "Fixed style should be kept"
+
+    print("✅ test_batch_prompts passed")
+
+
+def test_generate_batch_downloads():
+    """Test that every image is downloaded and written, in prompt order."""
+    prompts = [f"prompt {i}" for i in range(6)]
+    saved = []
+    with StubImageServer(latency=0.05) as stub, tempfile.TemporaryDirectory() as tmpdir:
+        results = asyncio.run(generate_batch(
+            prompts, output_dir=tmpdir, concurrency=3, client=_client(stub),
+            progress=lambda count, path: saved.append(path),
+        ))
+        assert len(results) == len(prompts), "Should return one result per prompt"
+        for path in results:
+            assert isinstance(path, str), f"Image should succeed, got {path!r}"
+            with open(path, "rb") as f:
+                assert f.read() == stub.image_bytes, "Saved file should match the download"
+        assert results == sorted(results), "Results should follow the prompt order"
+        assert sorted(saved) == sorted(results), "Progress should report every saved file"
+        assert sorted(stub.prompts) == sorted(prompts), "Every prompt should reach the API"
+        assert stub.downloads == len(prompts), "Every image URL should be downloaded once"
+
+    print("✅ test_generate_batch_downloads passed")
+
+
+def test_generate_batch_retries_rate_limits():
+    """Test that rate-limited requests are retried and inline payloads are decoded."""
+    with StubImageServer(rate_limit_first=3, response_format="b64_json") as stub, \
+            tempfile.TemporaryDirectory() as tmpdir:
+        results = asyncio.run(generate_batch(
+            ["a", "b"], output_dir=tmpdir, concurrency=1, max_retries=5, base_delay=0.01,
+            client=_client(stub),
+        ))
+        assert all(isinstance(path, str) for path in results), "Retries should succeed"
+        assert stub.rate_limited == 3, "The stub should have rate-limited three requests"
+        assert stub.generation_requests == 5, "Each 429 should be followed by one retry"
+        assert stub.downloads == 0, "Base64 payloads need no download"
+        with open(results[0], "rb") as f:
+            assert f.read() == stub.image_bytes, "Decoded payload should be written as-is"
+
+    with StubImageServer(rate_limit_first=10) as stub, tempfile.TemporaryDirectory() as tmpdir:
+        results = asyncio.run(generate_batch(
+            ["a"], output_dir=tmpdir, max_retries=2, base_delay=0.01, client=_client(stub),
+        ))
+        assert isinstance(results[0], RateLimitError), "Exhausted retries should surface the error"
+        assert stub.generation_requests == 3, "Should stop after the retry budget"
+
+    print("✅ test_generate_batch_retries_rate_limits passed")
+
+
+def test_generate_batch_retries_server_errors():
+    """Test that 5xx responses and dropped connections are retried like rate limits."""
+    with StubImageServer(fail_first=2) as stub, tempfile.TemporaryDirectory() as tmpdir:
+        results = asyncio.run(generate_batch(
+            ["a"], output_dir=tmpdir, max_retries=3, base_delay=0.01, client=_client(stub),
+        ))
+        assert isinstance(results[0], str), f"Retries should succeed, got {results[0]!r}"
+        assert stub.failed == 2 and stub.generation_requests == 3, \
+            "Each 500 should be followed by one retry"
+
+    with StubImageServer() as stub:
+        base_url = stub.base_url
+    # The stub has stopped, so every attempt is refused
+    client = AsyncOpenAI(api_key="sk-test", base_url=base_url, max_retries=0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = asyncio.run(generate_batch(
+            ["a"], output_dir=tmpdir, max_retries=2, base_delay=0.01, client=client,
+        ))
+        assert isinstance(results[0], APIConnectionError), \
+            f"Exhausted retries should surface the connection error, got {results[0]!r}"
+
+    print("✅ test_generate_batch_retries_server_errors passed")
+
+
+def test_generate_batch_merges_and_caches():
+    """Test that duplicate prompts are paid for once and cached prompts not at all."""
+    prompts = ["same", "same", "other", "same"]
+    with StubImageServer(latency=0.05) as stub, tempfile.TemporaryDirectory() as tmpdir:
+        cache = PromptCache(os.path.join(tmpdir, "cache"))
+        results = asyncio.run(generate_batch(
+            prompts, output_dir=os.path.join(tmpdir, "first"), client=_client(stub), cache=cache,
+        ))
+        assert all(isinstance(path, str) and os.path.exists(path) for path in results), \
+            "Every prompt should get its own file"
+        assert sorted(stub.prompts) == ["other", "same"], "Duplicates should be merged"
+        assert cache.stats()["items"] == 2, "Both distinct images should be cached"
+
+        results = asyncio.run(generate_batch(
+            prompts, output_dir=os.path.join(tmpdir, "second"), client=_client(stub), cache=cache,
+        ))
+        assert all(isinstance(path, str) for path in results), "Cached run should succeed"
+        assert stub.generation_requests == 2, "Cached prompts should not call the API"
+        with open(results[0], "rb") as f:
+            assert f.read() == stub.image_bytes, "Cached file should match the original"
+
+    print("✅ test_generate_batch_merges_and_caches passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for generate_ai_art.py\n")
+    print("=" * 50)
+
+    test_import_is_lazy()
+    test_batch_prompts()
+    test_generate_batch_downloads()
+    test_generate_batch_retries_rate_limits()
+    test_generate_batch_retries_server_errors()
+    test_generate_batch_merges_and_caches()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -18,7 +18,16 @@ from generate_art import (
     time_rotation,
     time_influence,
     generate_prompt,
-    generate_artwork
+    generate_artwork,
+    gradient_background,
+    gradient_canvas,
+    noise_field,
+    voronoi_sites,
+    voronoi_labels,
+    ReactionDiffusion,
+    fractal_tree_segments,
+    _noise_tables,
+    _gradient_background_loop
 )
 
 
@@ -145,6 +154,206 @@ def test_generate_artwork():
     print("✅ test_generate_artwork passed")
 
 
+def test_gradient_background():
+    """Test that the vectorized gradient matches the row-by-row loop."""
+    for day in ["Monday", "Friday", "Sunday"]:
+        base_color = day_colors[day][0]
+        for width, height in [(200, 150), (801, 599), (7, 3)]:
+            fast = gradient_background(base_color, width, height)
+            reference = _gradient_background_loop(base_color, width, height)
+            assert fast.mode == "RGBA", "Gradient should be RGBA"
+            assert fast.size == (width, height), f"Gradient size should be {width}x{height}"
+            assert fast.tobytes() == reference.tobytes(), \
+                f"Gradient pixels differ for {day} at {width}x{height}"
+            canvas = gradient_canvas(base_color, width, height)
+            assert canvas.mode == "RGB", "Gradient canvas should be RGB"
+            assert canvas.tobytes() == reference.convert("RGB").tobytes(), \
+                f"Gradient canvas pixels differ for {day} at {width}x{height}"
+    
+    print("✅ test_gradient_background passed")
+
+
+def test_generate_artwork_thread_safe():
+    """Test that concurrent renders in threads are reproducible."""
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    
+    times = [datetime.datetime(2023, 1, 2 + i, 8 + i, 15, 30, i * 1000) for i in range(7)]
+    jobs = [(t.strftime("%A"), t) for t in times] * 6
+    expected = {t: generate_artwork(day, t, width=160, height=120).tobytes() for day, t in jobs}
+    
+    random.seed(1234)
+    state = random.getstate()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda job: (job[1], generate_artwork(job[0], job[1], width=160, height=120).tobytes()),
+            jobs
+        ))
+    
+    for t, data in results:
+        assert data == expected[t], f"Threaded render for {t} should match the serial render"
+    assert random.getstate() == state, "Rendering should not touch the global random state"
+    
+    print("✅ test_generate_artwork_thread_safe passed")
+
+
+def test_noise_field():
+    """Test noise range, determinism, table caching and tiling."""
+    import numpy as np
+    
+    field = noise_field(256, 192, seed=7, cells=4, octaves=4)
+    assert field.shape == (192, 256), "Noise field should be (height, width)"
+    assert field.dtype == np.float32, "Noise field should be float32"
+    assert 0.0 <= field.min() and field.max() <= 1.0, "Noise should be within [0, 1]"
+    assert field.std() > 0.02, "Noise should not be flat"
+    assert np.array_equal(field, noise_field(256, 192, seed=7, cells=4, octaves=4)), \
+        "Same seed should give the same field"
+    assert not np.array_equal(field, noise_field(256, 192, seed=8, cells=4, octaves=4)), \
+        "Different seeds should give different fields"
+    assert _noise_tables(7) is _noise_tables(7), "Noise tables should be cached"
+    
+    # Wrapping around either edge should be as smooth as any neighbouring step
+    step_x = np.abs(np.diff(field, axis=1)).max()
+    step_y = np.abs(np.diff(field, axis=0)).max()
+    assert np.abs(field[:, 0] - field[:, -1]).max() <= step_x, "Field should tile horizontally"
+    assert np.abs(field[0, :] - field[-1, :]).max() <= step_y, "Field should tile vertically"
+    
+    print("✅ test_noise_field passed")
+
+
+def test_generate_artwork_noise():
+    """Test the noise style and noise background."""
+    t = datetime.datetime(2023, 1, 6, 12, 0, 0)
+    styled = generate_artwork("Friday", t, width=200, height=150, style="noise")
+    assert styled.size == (200, 150), "Noise style should keep the canvas size"
+    again = generate_artwork("Friday", t, width=200, height=150, style="noise")
+    assert styled.tobytes() == again.tobytes(), "Noise style should be reproducible"
+    
+    plain = generate_artwork("Monday", t, width=200, height=150)
+    textured = generate_artwork("Monday", t, width=200, height=150, background="noise")
+    assert textured.size == (200, 150), "Noise background should keep the canvas size"
+    assert textured.tobytes() != plain.tobytes(), "Noise background should change the image"
+    
+    print("✅ test_generate_artwork_noise passed")
+
+
+def test_voronoi_labels():
+    """Test that the grid index finds the same nearest site as brute force."""
+    import numpy as np
+    
+    generator = np.random.default_rng(42)
+    width, height = 160, 120
+    px = np.arange(width) + 0.5
+    py = np.arange(height) + 0.5
+    for count in [1, 7, 60, 900]:
+        sites_x, sites_y = voronoi_sites(width, height, count, generator)
+        labels = voronoi_labels(width, height, sites_x, sites_y)
+        assert labels.shape == (height, width), "Labels should cover the canvas"
+        dist = ((px[None, :, None] - sites_x.ravel()) ** 2
+                + (py[:, None, None] - sites_y.ravel()) ** 2)
+        chosen = np.take_along_axis(dist, labels[..., None].astype(np.intp), axis=-1)[..., 0]
+        assert np.allclose(chosen, dist.min(axis=-1)), \
+            f"Labels should be nearest sites for {count} sites"
+    
+    print("✅ test_voronoi_labels passed")
+
+
+def test_generate_artwork_voronoi():
+    """Test the Voronoi style."""
+    t = datetime.datetime(2023, 1, 6, 12, 0, 0)
+    image = generate_artwork("Wednesday", t, width=200, height=150, style="voronoi")
+    assert image.size == (200, 150), "Voronoi style should keep the canvas size"
+    again = generate_artwork("Wednesday", t, width=200, height=150, style="voronoi")
+    assert image.tobytes() == again.tobytes(), "Voronoi style should be reproducible"
+    
+    print("✅ test_generate_artwork_voronoi passed")
+
+
+def test_reaction_diffusion_resume():
+    """Test chunked advancing and checkpoint/resume against one long run."""
+    import io
+    import numpy as np
+    
+    def seeded():
+        sim = ReactionDiffusion(48, 32, feed=0.029, kill=0.057)
+        sim.seed(np.random.default_rng(3), count=6)
+        return sim
+    
+    continuous = seeded()
+    continuous.advance(120)
+    
+    chunked = seeded()
+    assert chunked.advance(50, until=120) == 50, "Budget should cap the steps taken"
+    buffer = io.BytesIO()
+    chunked.checkpoint(buffer)
+    buffer.seek(0)
+    resumed = ReactionDiffusion.resume(buffer)
+    assert resumed.steps == 50, "Resumed simulation should keep its step count"
+    assert resumed.advance(100, until=120) == 70, "Advance should stop at the target"
+    assert resumed.advance(100, until=120) == 0, "No steps past the target"
+    
+    assert np.array_equal(resumed.u, continuous.u), "Resumed U should match a continuous run"
+    assert np.array_equal(resumed.v, continuous.v), "Resumed V should match a continuous run"
+    field = resumed.field()
+    assert field.min() >= 0.0 and field.max() <= 1.0, "Field should be normalized"
+    
+    print("✅ test_reaction_diffusion_resume passed")
+
+
+def test_generate_artwork_reaction_diffusion():
+    """Test the reaction-diffusion style."""
+    t = datetime.datetime(2023, 1, 6, 12, 0, 0)
+    image = generate_artwork("Saturday", t, width=200, height=150, style="reaction_diffusion")
+    assert image.size == (200, 150), "Reaction-diffusion style should keep the canvas size"
+    again = generate_artwork("Saturday", t, width=200, height=150, style="reaction_diffusion")
+    assert image.tobytes() == again.tobytes(), "Reaction-diffusion style should be reproducible"
+    
+    print("✅ test_generate_artwork_reaction_diffusion passed")
+
+
+def test_fractal_tree_segments():
+    """Test that tree expansion is reproducible, connected and capped by its budget."""
+    import numpy as np
+    
+    segments, levels = fractal_tree_segments([100.0], 300.0, 80.0, 6, 1000,
+                                             np.random.default_rng(5))
+    assert len(segments) == 2 ** 6 - 1, "An unbounded tree should double every level"
+    assert np.allclose(segments[0], [100.0, 300.0, 100.0, 220.0]), "The trunk should come first"
+    assert np.all(np.diff(levels) >= 0), "Segments should be ordered by level"
+    parents = segments[levels == 4]
+    children = segments[levels == 5]
+    assert np.allclose(children[:, :2], np.repeat(parents[:, 2:], 2, axis=0)), \
+        "Branches should start at their parent's tip"
+    
+    x = [50.0, 150.0, 250.0]
+    deep, deep_levels = fractal_tree_segments(x, 300.0, 80.0, 16, 5000, np.random.default_rng(5))
+    again, _ = fractal_tree_segments(x, 300.0, 80.0, 16, 5000, np.random.default_rng(5))
+    assert len(deep) == 5000, "Deep trees should stop at the segment budget"
+    assert np.array_equal(deep, again), "Tree expansion should be reproducible"
+    assert np.count_nonzero(deep_levels == 0) == 3, "Every tree should keep its trunk"
+
+    try:
+        fractal_tree_segments(x, 300.0, 80.0, 0, 5000, np.random.default_rng(5))
+        assert False, "A depth of 0 should be rejected"
+    except ValueError:
+        pass
+    
+    print("✅ test_fractal_tree_segments passed")
+
+
+def test_generate_artwork_fractal_tree():
+    """Test the fractal tree style."""
+    t = datetime.datetime(2023, 1, 6, 23, 0, 0)
+    image = generate_artwork("Sunday", t, width=200, height=150, style="fractal_tree")
+    assert image.size == (200, 150), "Fractal tree style should keep the canvas size"
+    again = generate_artwork("Sunday", t, width=200, height=150, style="fractal_tree")
+    assert image.tobytes() == again.tobytes(), "Fractal tree style should be reproducible"
+    plain = generate_artwork("Sunday", t, width=200, height=150)
+    assert image.tobytes() != plain.tobytes(), "Fractal tree style should draw trees"
+    
+    print("✅ test_generate_artwork_fractal_tree passed")
+
+
 def run_all_tests():
     """Run all tests."""
     print("\n🧪 Running tests for generate_art.py\n")
@@ -158,6 +367,16 @@ def run_all_tests():
     test_time_influence()
     test_generate_prompt()
     test_generate_artwork()
+    test_gradient_background()
+    test_generate_artwork_thread_safe()
+    test_noise_field()
+    test_generate_artwork_noise()
+    test_voronoi_labels()
+    test_generate_artwork_voronoi()
+    test_reaction_diffusion_resume()
+    test_generate_artwork_reaction_diffusion()
+    test_fractal_tree_segments()
+    test_generate_artwork_fractal_tree()
     
     print("=" * 50)
     print("\n✅ All tests passed!\n")
@@ -0,0 +1,99 @@
+"""
+Tests for multi-resolution output.
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from batch_render import render_batch
+from generate_art import generate_artwork
+from image_derivatives import (derivative_path, derivative_size, derivatives, reduce_image,
+                               render_derivatives)
+from image_encoders import ImageEncoder
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+
+
+def test_derivative_sizes():
+    """Test the longest-edge sizing and the reduction steps."""
+    assert derivative_size(1920, 1080, 512) == (512, 288), "Landscape should fit the width"
+    assert derivative_size(600, 800, 128) == (96, 128), "Portrait should fit the height"
+    assert derivative_path("out/art.png", 128) == os.path.join("out", "art_128.png"), \
+        "Derivatives should sit next to the full image"
+
+    image = Image.new("RGB", (1920, 1080), (10, 20, 30))
+    assert reduce_image(image, (512, 288)).size == (512, 288), "Reduction should be exact"
+    result = derivatives(image, (128, 512, 4096))
+    assert list(result) == [512, 128], "Sizes should be largest first, without upscaling"
+    assert result[128].getpixel((5, 5)) == (10, 20, 30), "Flat colors should survive reduction"
+
+    print("✅ test_derivative_sizes passed")
+
+
+def test_render_derivatives():
+    """Test that one render gives the full image and matching previews on disk."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, "art.png")
+        images = render_derivatives("Friday", SAMPLE_TIME, 640, 480, output_path=output_path)
+
+        full = generate_artwork("Friday", SAMPLE_TIME, 640, 480)
+        assert images["full"].tobytes() == full.tobytes(), "Full size should match generate_artwork"
+        assert images[512].size == (512, 384) and images[128].size == (128, 96), \
+            "Previews should have the requested longest edge"
+
+        for key, path in (("full", output_path), (512, derivative_path(output_path, 512)),
+                          (128, derivative_path(output_path, 128))):
+            with Image.open(path) as written:
+                assert written.tobytes() == images[key].tobytes(), f"{key} should be written"
+
+        reference = np.asarray(full.resize((128, 96), Image.Resampling.LANCZOS), dtype=np.int16)
+        difference = np.abs(np.asarray(images[128], dtype=np.int16) - reference).mean()
+        assert difference < 4, f"Thumbnail should show the same layout ({difference:.1f})"
+
+    print("✅ test_render_derivatives passed")
+
+
+def test_shared_encoder_and_batch():
+    """Test a caller-owned encoder and derivatives from batch rendering."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with ImageEncoder(fmt="webp", background=True, workers=2) as encoder:
+            render_derivatives("Monday", SAMPLE_TIME, 320, 240, sizes=(128,),
+                               output_path=os.path.join(tmpdir, "art.webp"), encoder=encoder)
+        assert sorted(os.listdir(tmpdir)) == ["art.webp", "art_128.webp"], \
+            "Shared encoder should write both files"
+
+        batch_dir = os.path.join(tmpdir, "batch")
+        start = datetime.datetime(2024, 3, 4, 9, 0, 0)
+        stats = render_batch(start, start + datetime.timedelta(minutes=2),
+                             datetime.timedelta(minutes=1), width=200, height=150,
+                             output_dir=batch_dir, workers=1, sizes=(128,))
+        assert stats["images"] == 2, "Batch should count renders, not files"
+        assert len(os.listdir(batch_dir)) == 4, "Every render should have its derivative"
+
+    print("✅ test_shared_encoder_and_batch passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for image_derivatives.py\n")
+    print("=" * 50)
+
+    test_derivative_sizes()
+    test_render_derivatives()
+    test_shared_encoder_and_batch()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
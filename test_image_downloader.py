@@ -0,0 +1,78 @@
+"""
+Tests for the pooled, streaming image downloader.
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from image_downloader import DownloadError, ImageDownloader
+from stub_image_server import StubImageServer
+
+
+def test_download_streams_and_verifies():
+    """Test that a download is written intact and reports its size and digest."""
+    payload = os.urandom(300_000)
+    with StubImageServer(files={"big.bin": payload}) as stub, \
+            tempfile.TemporaryDirectory() as tmpdir, \
+            ImageDownloader(chunk_size=4096) as downloader:
+        path = os.path.join(tmpdir, "nested", "big.bin")
+        digest = hashlib.sha256(payload).hexdigest()
+        result = downloader.download(stub.file_url("big.bin"), path,
+                                     expected_size=len(payload), sha256=digest)
+        assert result["bytes"] == len(payload), "Should report the bytes received"
+        assert result["sha256"] == digest, "Should report the SHA-256 digest"
+        with open(path, "rb") as f:
+            assert f.read() == payload, "File should match the served bytes"
+
+        bad_path = os.path.join(tmpdir, "bad.bin")
+        for kwargs in ({"sha256": "0" * 64}, {"expected_size": 1}):
+            try:
+                downloader.download(stub.file_url("big.bin"), bad_path, **kwargs)
+                assert False, f"Mismatch should raise DownloadError ({kwargs})"
+            except DownloadError:
+                pass
+        assert os.listdir(tmpdir) == ["nested"], "Failed downloads should leave no files behind"
+
+    print("✅ test_download_streams_and_verifies passed")
+
+
+def test_download_many_reuses_connections():
+    """Test that concurrent downloads share a small pool of keep-alive connections."""
+    files = {f"image_{i}.png": os.urandom(1000 + i) for i in range(12)}
+    with StubImageServer(files=files) as stub, tempfile.TemporaryDirectory() as tmpdir, \
+            ImageDownloader(pool_size=3) as downloader:
+        jobs = [(stub.file_url(name), os.path.join(tmpdir, name)) for name in files]
+        jobs.append({"url": stub.file_url("missing.png"),
+                     "destination": os.path.join(tmpdir, "missing.png")})
+        results = downloader.download_many(jobs)
+
+        assert len(results) == len(jobs), "Should return one result per job"
+        for (name, payload), result in zip(files.items(), results):
+            assert result["bytes"] == len(payload), f"{name} should be complete"
+        assert isinstance(results[-1], Exception), "A 404 should be returned as an error"
+        assert stub.downloads == len(files), "Every file should be served once"
+        assert stub.connections <= 4, f"Connections should be pooled, opened {stub.connections}"
+
+    print("✅ test_download_many_reuses_connections passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for image_downloader.py\n")
+    print("=" * 50)
+
+    test_download_streams_and_verifies()
+    test_download_many_reuses_connections()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,95 @@
+"""
+Tests for the output encoders.
+"""
+
+import datetime
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from PIL import Image
+
+from generate_art import generate_artwork
+from image_encoders import FORMATS, ImageEncoder, save_options
+
+
+def sample_image():
+    return generate_artwork("Friday", datetime.datetime(2023, 1, 6, 12, 0, 0), width=160,
+                            height=120)
+
+
+def test_save_options():
+    """Test that settings map onto the right Pillow arguments."""
+    assert save_options("png", compress_level=1, optimize=True) == {"compress_level": 1,
+                                                                     "optimize": True}
+    assert save_options("webp", compress_level=9, quality=80) == {"method": 6, "quality": 80}
+    assert save_options("jpeg", quality=90, optimize=True) == {"quality": 90, "optimize": True}
+    assert save_options("raw", compress_level=9) == {}, "Raw output takes no options"
+    print("✅ test_save_options passed")
+
+
+def test_encode_formats():
+    """Test that every format encodes to an in-memory buffer."""
+    image = sample_image()
+    for fmt in FORMATS:
+        data = ImageEncoder(fmt).to_bytes(image)
+        assert len(data) > 0, f"{fmt} output should not be empty"
+        if fmt == "raw":
+            assert data == image.tobytes(), "Raw output should be the pixel bytes"
+        else:
+            decoded = Image.open(io.BytesIO(data))
+            assert decoded.format == FORMATS[fmt], f"Output should decode as {FORMATS[fmt]}"
+            assert decoded.size == image.size, "Decoded size should match"
+    
+    lossless = ImageEncoder("webp", lossless=True).to_bytes(image)
+    assert Image.open(io.BytesIO(lossless)).convert("RGB").tobytes() == image.tobytes(), \
+        "Lossless WebP should round-trip exactly"
+    
+    print("✅ test_encode_formats passed")
+
+
+def test_encode_destinations():
+    """Test writing to paths, file objects and the background thread."""
+    image = sample_image()
+    t = datetime.datetime(2023, 1, 6, 12, 0, 0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        jpeg_path = os.path.join(tmpdir, "nested", "art.jpg")
+        written = ImageEncoder().encode(image, jpeg_path)
+        assert Image.open(jpeg_path).format == "JPEG", "Format should follow the extension"
+        assert written == os.path.getsize(jpeg_path), "Encode should return bytes written"
+        
+        with ImageEncoder("png", compress_level=1, background=True) as encoder:
+            futures = [encoder.save(image, os.path.join(tmpdir, f"bg_{i}.png")) for i in range(4)]
+        assert all(future.done() for future in futures), "Close should wait for background work"
+        for i in range(4):
+            assert Image.open(os.path.join(tmpdir, f"bg_{i}.png")).size == image.size
+    
+    buffer = io.BytesIO()
+    generate_artwork("Friday", t, width=160, height=120, output_path=buffer,
+                     encoder=ImageEncoder("webp", lossless=True))
+    assert Image.open(io.BytesIO(buffer.getvalue())).format == "WEBP", \
+        "generate_artwork should write to file objects with the given encoder"
+    
+    print("✅ test_encode_destinations passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for image_encoders.py\n")
+    print("=" * 50)
+    
+    test_save_options()
+    test_encode_formats()
+    test_encode_destinations()
+    
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
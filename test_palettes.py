@@ -0,0 +1,121 @@
+"""
+Tests for the dynamic palettes and frame grading.
+"""
+
+import colorsys
+import datetime
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from generate_art import (StyleTable, build_scene, day_colors, day_map, day_shapes,
+                          generate_artwork, influence_ranges, time_grade)
+from palettes import HARMONIES, apply_grade, grade_tables, harmony_for_time, harmony_palette
+from tiled_render import write_tiled
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+
+
+def test_harmony_palette():
+    """Test that harmonies re-hue the palette around its first color."""
+    colors = tuple(day_colors["Friday"])
+    for harmony, offsets in HARMONIES.items():
+        palette = harmony_palette(colors, harmony)
+        assert palette[0] == colors[0], f"{harmony} should keep the anchor color"
+        anchor = colorsys.rgb_to_hsv(*(c / 255 for c in colors[0]))[0]
+        for i, (color, original) in enumerate(zip(palette, colors)):
+            hue, saturation, value = colorsys.rgb_to_hsv(*(c / 255 for c in color))
+            expected = (anchor + offsets[i % len(offsets)] / 360) % 1.0
+            assert min(abs(hue - expected), 1 - abs(hue - expected)) < 0.01, \
+                f"{harmony} color {i} should sit at its harmony hue"
+            assert abs(value - max(original) / 255) < 0.01, "Colors should keep their value"
+
+    assert harmony_for_time(SAMPLE_TIME.replace(hour=3)) == "analogous", "Nights are analogous"
+    assert harmony_for_time(SAMPLE_TIME) == "complementary", "Afternoons are complementary"
+    assert harmony_for_time(SAMPLE_TIME.replace(hour=20)) == "triadic", "Evenings are triadic"
+    try:
+        harmony_palette(colors, "tetradic")
+        raise AssertionError("Unknown harmonies should be rejected")
+    except ValueError:
+        pass
+
+    print("✅ test_harmony_palette passed")
+
+
+def test_grade_tables():
+    """Test that grading keeps greys, scales saturation and reuses cached tables."""
+    grays = Image.fromarray(np.repeat(np.arange(256, dtype=np.uint8)[None, :, None], 3, axis=2))
+    graded = np.asarray(apply_grade(grays, [123, 1.0, 1.0])).astype(int)
+    assert np.abs(graded - np.asarray(grays)).max() <= 1, "Noon grade should keep greys"
+
+    red = Image.new("RGB", (4, 4), (220, 40, 40))
+    noon = apply_grade(red, [0, 1.0, 1.0]).getpixel((0, 0))
+    night = apply_grade(red, [0, 0.3, 0.3]).getpixel((0, 0))
+    assert max(abs(a - b) for a, b in zip(noon, (220, 40, 40))) <= 1, "Noon should be neutral"
+    assert max(night) - min(night) < 180 and sum(night) < sum(noon), \
+        "Night should be less saturated and darker"
+    shifted = apply_grade(red, [120, 1.0, 1.0]).getpixel((0, 0))
+    assert shifted[1] == max(shifted), "A 120 degree shift should turn red towards green"
+
+    grade = time_grade(SAMPLE_TIME)
+    assert grade == time_grade(SAMPLE_TIME.replace(second=59)), "Grades should change per minute"
+    grade_tables.cache_clear()
+    apply_grade(red, grade)
+    apply_grade(red, time_grade(SAMPLE_TIME.replace(second=10)))
+    info = grade_tables.cache_info()
+    assert info.misses == 1 and info.hits == 1, "Tables should be cached between renders"
+
+    print("✅ test_grade_tables passed")
+
+
+def test_dynamic_render():
+    """Test dynamic-palette renders through generate_artwork and the tiled renderer."""
+    plain = generate_artwork("Friday", SAMPLE_TIME, 200, 150)
+    dynamic = generate_artwork("Friday", SAMPLE_TIME, 200, 150, palette="dynamic")
+    again = generate_artwork("Friday", SAMPLE_TIME, 200, 150, palette="dynamic")
+    assert dynamic.tobytes() == again.tobytes(), "Dynamic renders should be deterministic"
+    assert dynamic.tobytes() != plain.tobytes(), "The palette should change the frame"
+    assert dynamic.getpixel((0, 0)) == (255, 255, 255), "Rotated corners should stay white"
+
+    scene = build_scene("Friday", SAMPLE_TIME, 300, 220, palette="triadic")
+    expected = generate_artwork("Friday", SAMPLE_TIME, 300, 220, palette="triadic")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "tiled.png")
+        write_tiled(scene, path, tile_size=64, workers=2)
+        with Image.open(path) as tiled:
+            assert tiled.tobytes() == expected.tobytes(), "Tiles should be graded like the frame"
+
+    # The grade follows the ranges of the table being rendered, not the active one
+    ranges = dict(influence_ranges, saturation=(0.1, 0.1), brightness=(0.2, 0.2))
+    styles = StyleTable(day_map, day_colors, day_shapes, ranges)
+    scene = build_scene("Friday", SAMPLE_TIME, 200, 150, palette="dynamic", styles=styles)
+    assert scene.settings["grade"] == time_grade(SAMPLE_TIME, styles.ranges), \
+        "The grade should use the table's influence ranges"
+    assert scene.settings["grade"] != time_grade(SAMPLE_TIME), \
+        "Other ranges should grade differently"
+
+    print("✅ test_dynamic_render passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for palettes.py\n")
+    print("=" * 50)
+
+    test_harmony_palette()
+    test_grade_tables()
+    test_dynamic_render()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,104 @@
+"""
+Tests for the prompt → image cache.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from prompt_cache import PromptCache, prompt_key
+
+
+def _image(tmpdir, name, size=100):
+    path = os.path.join(tmpdir, name)
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+    return path
+
+
+def test_prompt_key():
+    """Test that every request field changes the key."""
+    base = prompt_key("a cat", "gpt-image-1", "1024x1024", "auto")
+    assert base == prompt_key("a cat", "gpt-image-1", "1024x1024", "auto"), "Key should be stable"
+    variants = [
+        prompt_key("a dog", "gpt-image-1", "1024x1024", "auto"),
+        prompt_key("a cat", "other-model", "1024x1024", "auto"),
+        prompt_key("a cat", "gpt-image-1", "1792x1024", "auto"),
+        prompt_key("a cat", "gpt-image-1", "1024x1024", "high"),
+    ]
+    assert len(set(variants + [base])) == 5, "Each field should be part of the key"
+
+    print("✅ test_prompt_key passed")
+
+
+def test_store_fetch_and_persist():
+    """Test that entries round-trip, survive a restart and are counted."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_dir = os.path.join(tmpdir, "cache")
+        source = _image(tmpdir, "source.png")
+        key = prompt_key("a cat", "gpt-image-1", "1024x1024", "auto")
+
+        cache = PromptCache(cache_dir)
+        assert not cache.fetch(key, os.path.join(tmpdir, "miss.png")), "Empty cache should miss"
+        cache.store(key, source, prompt="a cat")
+
+        reopened = PromptCache(cache_dir)
+        destination = os.path.join(tmpdir, "out", "hit.png")
+        assert reopened.fetch(key, destination), "Entry should survive a restart"
+        with open(source, "rb") as a, open(destination, "rb") as b:
+            assert a.read() == b.read(), "Fetched image should match the stored one"
+
+        stats = reopened.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 0, "Should count the hit"
+        assert stats["items"] == 1 and stats["bytes"] == 100, "Should report the cache size"
+
+        reopened.clear()
+        assert os.listdir(cache_dir) == [], "clear() should remove the files"
+
+    print("✅ test_store_fetch_and_persist passed")
+
+
+def test_eviction_and_ttl():
+    """Test LRU eviction by item count and expiry after the TTL."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = _image(tmpdir, "source.png")
+        cache = PromptCache(os.path.join(tmpdir, "lru"), max_items=2)
+        cache.store("a", source)
+        cache.store("b", source)
+        assert cache.lookup("a"), "Touch a so b becomes least recently used"
+        cache.store("c", source)
+        assert cache.lookup("b") is None, "Least recently used entry should be evicted"
+        assert cache.lookup("a") and cache.lookup("c"), "Recent entries should stay"
+        assert cache.stats()["evictions"] == 1, "Should count the eviction"
+
+        cache = PromptCache(os.path.join(tmpdir, "ttl"), ttl=0.05)
+        cache.store("a", source)
+        assert cache.lookup("a"), "Fresh entry should hit"
+        time.sleep(0.1)
+        assert cache.lookup("a") is None, "Expired entry should miss"
+        assert cache.stats()["expired"] == 1, "Should count the expiry"
+        assert cache.stats()["items"] == 0, "Expired entry should be dropped"
+
+    print("✅ test_eviction_and_ttl passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for prompt_cache.py\n")
+    print("=" * 50)
+
+    test_prompt_key()
+    test_store_fetch_and_persist()
+    test_eviction_and_ttl()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,107 @@
+"""
+Tests for the render cache.
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import render_cache
+from generate_art import generate_artwork
+from render_cache import RenderCache, cache_key, encode_png
+
+
+def test_cache_key():
+    """Test that the key changes with every input."""
+    t = datetime.datetime(2023, 1, 1, 12, 0, 0)
+    key = cache_key("Monday", t, 800, 600)
+    assert key == cache_key("Monday", t, 800, 600), "Key should be stable"
+    assert key != cache_key("Tuesday", t, 800, 600), "Key should depend on day"
+    assert key != cache_key("Monday", t + datetime.timedelta(microseconds=1), 800, 600), \
+        "Key should depend on timestamp"
+    assert key != cache_key("Monday", t, 600, 800), "Key should depend on size"
+    assert key != cache_key("Monday", t, 800, 600, version="other"), "Key should depend on version"
+    print("✅ test_cache_key passed")
+
+
+def test_render_cache_hits():
+    """Test memory and disk hits skip rendering and return identical bytes."""
+    t = datetime.datetime(2023, 1, 6, 9, 30, 0)
+    expected = encode_png(generate_artwork("Friday", t, width=120, height=90))
+    calls = []
+    original = render_cache.generate_artwork
+    
+    def counting_generate(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+    
+    render_cache.generate_artwork = counting_generate
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = RenderCache(cache_dir=tmpdir)
+            assert cache.render_png("Friday", t, 120, 90) == expected, "Miss should render"
+            assert cache.render_png("Friday", t, 120, 90) == expected, "Memory hit should match"
+            
+            warm = RenderCache(cache_dir=tmpdir)
+            output_path = os.path.join(tmpdir, "out", "artwork.png")
+            image = warm.generate_artwork("Friday", t, 120, 90, output_path=output_path)
+            assert image.size == (120, 90), "Cached image should keep its size"
+            with open(output_path, "rb") as f:
+                assert f.read() == expected, "Disk hit should write the cached bytes"
+            
+            assert len(calls) == 1, "Only the first request should render"
+            assert cache.stats()["memory_hits"] == 1, "Second request should hit memory"
+            assert cache.stats()["misses"] == 1, "First request should miss"
+            assert warm.stats()["disk_hits"] == 1, "New cache should hit disk"
+    finally:
+        render_cache.generate_artwork = original
+    
+    print("✅ test_render_cache_hits passed")
+
+
+def test_render_cache_eviction():
+    """Test that the LRU limits evict the least recently used entries."""
+    times = [datetime.datetime(2023, 1, 2, 10, i, 0) for i in range(3)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = RenderCache(cache_dir=tmpdir, max_memory_items=2, max_disk_items=2)
+        cache.render_png("Monday", times[0], 64, 48)
+        cache.render_png("Monday", times[1], 64, 48)
+        cache.render_png("Monday", times[0], 64, 48)  # refresh times[0]
+        cache.render_png("Monday", times[2], 64, 48)  # evicts times[1]
+        
+        stats = cache.stats()
+        assert stats["memory_items"] == 2, "Memory level should hold 2 entries"
+        assert stats["disk_items"] == 2, "Disk level should hold 2 entries"
+        assert stats["memory_evictions"] == 1, "One memory eviction expected"
+        assert stats["disk_evictions"] == 1, "One disk eviction expected"
+        assert len(os.listdir(tmpdir)) == 2, "Evicted file should be removed"
+        evicted = os.path.join(tmpdir, cache_key("Monday", times[1], 64, 48) + ".png")
+        assert not os.path.exists(evicted), "Least recently used entry should be evicted"
+        
+        cache.clear()
+        assert cache.stats()["disk_items"] == 0, "Clear should empty the cache"
+        assert os.listdir(tmpdir) == [], "Clear should remove files"
+    
+    print("✅ test_render_cache_eviction passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for render_cache.py\n")
+    print("=" * 50)
+    
+    test_cache_key()
+    test_render_cache_hits()
+    test_render_cache_eviction()
+    
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,100 @@
+"""
+Tests for the render instrumentation hooks.
+"""
+
+import datetime
+import io
+import os
+import pstats
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from generate_art import generate_artwork
+from render_instrumentation import RenderInstrumentation
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+
+
+def test_stage_records():
+    """Test that an instrumented render reports every stage and is otherwise unchanged."""
+    records = []
+    instrument = RenderInstrumentation(callback=records.append)
+    plain = generate_artwork("Friday", SAMPLE_TIME, 200, 150)
+    traced = generate_artwork("Friday", SAMPLE_TIME, 200, 150, output_path=io.BytesIO(),
+                              instrument=instrument)
+    assert plain.tobytes() == traced.tobytes(), "Instrumentation should not change the image"
+
+    assert len(records) == 1, "Callback should get one record per render"
+    record = records[0]
+    assert record["day"] == "Friday" and record["style"] == "circles", "Should describe the render"
+    assert list(record["stages"]) == ["scene", "gradient", "shapes", "composite", "rotate",
+                                      "encode"], \
+        "Every stage should be recorded in order"
+    stage_total = sum(stage["seconds"] for stage in record["stages"].values())
+    assert 0 < stage_total <= record["seconds"], "Stage times should add up within the total"
+    assert record["stages"]["shapes"]["pillow_images"] >= 1, "Overlay allocation should be counted"
+
+    summary = instrument.summary()
+    assert summary["renders"] == 1, "Summary should count the render"
+    assert summary["stages"]["gradient"]["count"] == 1, "Summary should aggregate stages"
+
+    print("✅ test_stage_records passed")
+
+
+def test_sampling():
+    """Test that only the sampled fraction of renders is recorded."""
+    records = []
+    instrument = RenderInstrumentation(callback=records.append, sample_rate=0.0)
+    generate_artwork("Monday", SAMPLE_TIME, 200, 150, instrument=instrument)
+    assert records == [] and instrument.summary()["renders"] == 0, "Rate 0 should record nothing"
+
+    instrument = RenderInstrumentation(callback=records.append, sample_rate=0.5, seed=3)
+    for _ in range(40):
+        generate_artwork("Monday", SAMPLE_TIME, 160, 120, instrument=instrument)
+    assert 5 < len(records) < 35, f"About half the renders should be sampled, got {len(records)}"
+
+    print("✅ test_sampling passed")
+
+
+def test_profile_dumps():
+    """Test that profiled renders dump cProfile and tracemalloc files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        instrument = RenderInstrumentation(profile_dir=tmpdir, cprofile=True, trace_memory=True)
+        generate_artwork("Saturday", SAMPLE_TIME, 200, 150, instrument=instrument)
+        record = instrument.records[-1]
+
+        stats = pstats.Stats(record["cprofile"])
+        assert any(name == "_render_artwork" for _, _, name in stats.stats), \
+            "Profile should include the render"
+        snapshot = tracemalloc.Snapshot.load(record["tracemalloc"])
+        assert snapshot.traces is not None, "Snapshot should load"
+        assert "python_peak_bytes" in record["stages"]["shapes"], \
+            "Stages should report Python peaks"
+        assert not tracemalloc.is_tracing(), "Tracing started for the render should be stopped"
+        assert sorted(os.listdir(tmpdir)) == sorted(
+            os.path.basename(record[key]) for key in ("cprofile", "tracemalloc")), \
+            "Only the two dumps should be written"
+
+    print("✅ test_profile_dumps passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for render_instrumentation.py\n")
+    print("=" * 50)
+
+    test_stage_records()
+    test_sampling()
+    test_profile_dumps()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,169 @@
+"""
+Tests for the render server.
+"""
+
+import datetime
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from http.client import HTTPConnection
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from generate_art import generate_artwork, shape_functions
+from image_encoders import ImageEncoder
+from render_server import QueueFull, RenderService, make_server, percentile
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50, "Median of 1..100 should be 50"
+    assert percentile(values, 0.99) == 99, "p99 of 1..100 should be 99"
+    assert percentile([7], 0.9) == 7, "Single sample is every percentile"
+    assert percentile([], 0.5) is None, "No samples should give None"
+
+    print("✅ test_percentile passed")
+
+
+def test_http_render_and_metrics():
+    """Test that /render returns the same bytes as a direct render and /metrics counts it."""
+    time_obj = datetime.datetime(2024, 1, 5, 14, 30, 7)
+    expected = ImageEncoder("png").to_bytes(generate_artwork("Friday", time_obj, 200, 150))
+
+    with RenderService(workers=2) as service:
+        server = make_server(service, port=0)
+        thread = _serve(server)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            for _ in range(2):
+                url = f"{base}/render?timestamp={time_obj.isoformat()}&width=200&height=150"
+                with urllib.request.urlopen(url) as response:
+                    assert response.headers["Content-Type"] == "image/png", "Should be a PNG"
+                    assert response.read() == expected, \
+                        "Server output should match generate_artwork"
+
+            try:
+                urllib.request.urlopen(f"{base}/render?width=0")
+                assert False, "Invalid size should be rejected"
+            except urllib.error.HTTPError as error:
+                assert error.code == 400, "Invalid parameters should give 400"
+
+            try:
+                urllib.request.urlopen(f"{base}/render?style=symmetry&width=40&height=40")
+                assert False, "A canvas too small for the style should be rejected"
+            except urllib.error.HTTPError as error:
+                assert error.code == 400, \
+                    f"A style that cannot fit should give 400, not {error.code}"
+
+            with urllib.request.urlopen(f"{base}/metrics") as response:
+                metrics = json.load(response)
+            assert metrics["completed"] == 2, "Both renders should be counted"
+            assert metrics["latency_samples"] == 2, "Latencies should be recorded"
+            assert metrics["latency_ms"]["p50"] > 0, "Percentiles should be reported"
+            assert metrics["cache"]["memory_hits"] == 1, "Repeat request should hit the cache"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print("✅ test_http_render_and_metrics passed")
+
+
+def test_backpressure():
+    """Test that requests beyond the workers and queue are rejected, not queued."""
+    time_obj = datetime.datetime(2024, 3, 4, 9, 0, 0)
+    with RenderService(workers=1, max_queue=1, cache_items=0) as service:
+        running = service.submit("Monday", time_obj, 1600, 1200, style="reaction_diffusion")
+        queued = service.submit("Monday", time_obj, 1600, 1200, style="reaction_diffusion")
+        try:
+            service.submit("Monday", time_obj, 200, 150)
+            assert False, "Third request should be rejected"
+        except QueueFull:
+            pass
+        assert service.metrics()["queued"] == 1, "One request should be waiting"
+        running.result()
+        queued.result()
+        service.submit("Monday", time_obj, 200, 150).result()
+        metrics = service.metrics()
+        assert metrics["rejected"] == 1 and metrics["completed"] == 3, "Counters should add up"
+
+    print("✅ test_backpressure passed")
+
+
+def test_warm_up():
+    """Test that warm-up with its defaults renders every style and logs failing ones."""
+    def broken(draw, width, height, colors, influence, rng):
+        raise RuntimeError("broken style")
+
+    with RenderService(workers=2, cache_items=0) as service:
+        assert service.warm_up() == {}, "Every style should warm up at the default size"
+        shape_functions["test_broken"] = broken
+        try:
+            failures = service.warm_up()
+        finally:
+            del shape_functions["test_broken"]
+        assert list(failures) == ["test_broken"], "Only the broken style should fail"
+        assert isinstance(failures["test_broken"], RuntimeError), "Errors should be kept"
+        service.render("Monday", datetime.datetime(2024, 1, 1), 64, 48)
+
+    print("✅ test_warm_up passed")
+
+
+def test_unix_socket():
+    """Test rendering over a Unix socket."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("⏭️ test_unix_socket skipped (no Unix sockets)")
+        return
+    with RenderService(workers=1) as service, tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "render.sock")
+        server = make_server(service, unix_socket=path)
+        _serve(server)
+        try:
+            class UnixConnection(HTTPConnection):
+                def connect(self):
+                    self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    self.sock.connect(path)
+
+            connection = UnixConnection("localhost")
+            connection.request("GET", "/render?timestamp=2024-01-01T00:00:00&width=64&height=48")
+            response = connection.getresponse()
+            assert response.status == 200, "Unix socket render should succeed"
+            assert response.read().startswith(b"\x89PNG"), "Should return PNG bytes"
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print("✅ test_unix_socket passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for render_server.py\n")
+    print("=" * 50)
+
+    test_percentile()
+    test_http_render_and_metrics()
+    test_backpressure()
+    test_warm_up()
+    test_unix_socket()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,115 @@
+"""
+Tests for scene generation and display-list rasterization.
+"""
+
+import datetime
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from generate_art import build_scene, generate_artwork, render_scene, shape_functions
+from scene import BITMAP, Scene, SceneRecorder
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+
+
+def test_scene_matches_generate_artwork():
+    """Test that rasterizing a scene at its own size reproduces generate_artwork."""
+    for style in sorted(shape_functions):
+        for background in ("gradient", "noise"):
+            scene = build_scene("Friday", SAMPLE_TIME, 240, 180, style=style, background=background)
+            expected = generate_artwork("Friday", SAMPLE_TIME, 240, 180, style=style,
+                                        background=background)
+            assert render_scene(scene).tobytes() == expected.tobytes(), \
+                f"Scene render should match for {style} on {background}"
+
+    print("✅ test_scene_matches_generate_artwork passed")
+
+
+def test_scene_is_compact_and_serializable():
+    """Test the display list layout and a save/load round trip."""
+    scene = build_scene("Friday", SAMPLE_TIME, 320, 240)
+    assert len(scene) > 0, "Circles scene should contain shapes"
+    assert scene.offsets[-1] == len(scene.coords), "Offsets should cover every point"
+    assert scene.nbytes < 64 * len(scene), "Geometric shapes should take a few bytes each"
+
+    restored = Scene.from_bytes(scene.to_bytes())
+    assert render_scene(restored).tobytes() == render_scene(scene).tobytes(), \
+        "Round trip should render identically"
+
+    bitmaps = build_scene("Friday", SAMPLE_TIME, 160, 120, style="voronoi")
+    assert (bitmaps.kinds == BITMAP).all(), "Field styles should record bitmap masks"
+    buffer = io.BytesIO()
+    bitmaps.save(buffer)
+    buffer.seek(0)
+    assert render_scene(Scene.load(buffer)).tobytes() == render_scene(bitmaps).tobytes(), \
+        "Masks should survive a round trip"
+
+    print("✅ test_scene_is_compact_and_serializable passed")
+
+
+def test_scene_multiple_resolutions():
+    """Test that one scene rasterizes consistently at other sizes."""
+    for style in ("circles", "waves", "noise"):
+        scene = build_scene("Sunday", SAMPLE_TIME, 400, 300, style=style)
+        native = np.asarray(render_scene(scene), dtype=np.int16)
+
+        thumb = render_scene(scene, 100, 75)
+        assert thumb.size == (100, 75), "Thumbnail should have the requested size"
+        large = render_scene(scene, 800, 600)
+        assert large.size == (800, 600), "Large render should have the requested size"
+
+        reduced = np.asarray(large.resize((400, 300), Image.Resampling.BOX), dtype=np.int16)
+        difference = np.abs(reduced - native).mean()
+        assert difference < 6, f"Upscaled {style} render should match the layout ({difference:.1f})"
+
+    print("✅ test_scene_multiple_resolutions passed")
+
+
+def test_scene_keeps_subpixel_coordinates():
+    """Test that fractional coordinates are stored as recorded and scaled before rounding."""
+    recorder = SceneRecorder(100, 80)
+    recorder.line([10.25, 20.75, 60.5, 70.125], fill=(200, 40, 90), width=1)
+    recorder.polygon([(5.5, 5.25), (40.75, 10.5), (20.25, 45.875)], fill=(30, 120, 200))
+    scene = recorder.scene()
+    assert scene.coords[0].tolist() == [10.25, 20.75], "Sub-pixel points should not be truncated"
+    assert scene.bounds()[1].tolist() == [3, 3, 43, 48], "Bounds should enclose fractional points"
+
+    recorder.bitmap((90.5, 10.25), Image.new("L", (10, 4)), fill=(0, 0, 0))
+    assert recorder.scene().bounds()[2].tolist() == [88, 8, 102, 16], \
+        "Bitmap bounds should cover the whole mask plus the padding"
+
+    # At 4x, a scene must draw what the shapes would have been at 4x
+    large = Image.new("RGBA", (400, 320))
+    scene.rasterize(ImageDraw.Draw(large), 400, 320)
+    expected = Image.new("RGBA", (400, 320))
+    draw = ImageDraw.Draw(expected)
+    draw.line([41.0, 83.0, 242.0, 280.5], fill=(200, 40, 90, 255), width=4)
+    draw.polygon([22.0, 21.0, 163.0, 42.0, 81.0, 183.5], fill=(30, 120, 200, 255))
+    assert large.tobytes() == expected.tobytes(), "Scaled replay should use the exact points"
+
+    print("✅ test_scene_keeps_subpixel_coordinates passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for scene.py\n")
+    print("=" * 50)
+
+    test_scene_matches_generate_artwork()
+    test_scene_is_compact_and_serializable()
+    test_scene_multiple_resolutions()
+    test_scene_keeps_subpixel_coordinates()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,180 @@
+"""
+Tests for tiled rendering of large canvases.
+"""
+
+import datetime
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from generate_art import build_scene, generate_artwork, render_scene
+from tiled_render import StripedPNGWriter, render_tiled, tile_stripes, write_tiled
+
+SAMPLE_TIME = datetime.datetime(2024, 1, 5, 14, 30, 7)
+# Whole minutes at second 50 leave the frame unrotated
+UNROTATED_TIME = datetime.datetime(2024, 1, 4, 23, 0, 50)
+
+# Renders one canvas in a fresh interpreter and prints its peak RSS growth in
+# bytes; unlike tracemalloc, RSS includes Pillow's image buffers. Linux carries
+# ru_maxrss over from the parent across fork and exec, so VmHWM (which exec
+# resets) is read where it exists
+RSS_CHILD = """
+import datetime, io, resource, sys
+from generate_art import generate_artwork
+from tiled_render import render_tiled
+
+def peak_rss():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (
+        1 if sys.platform == "darwin" else 1024)
+
+pipeline, width, height = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+time_obj = datetime.datetime(2024, 1, 5, 14, 30, 7)
+render_tiled("Friday", time_obj, 256, 256, io.BytesIO(), tile_size=128, workers=2)
+before = peak_rss()
+if pipeline == "tiled":
+    render_tiled("Friday", time_obj, width, height, io.BytesIO(), tile_size=128, workers=2)
+else:
+    generate_artwork("Friday", time_obj, width, height, output_path=io.BytesIO())
+print(peak_rss() - before)
+"""
+
+
+def read_png(buffer):
+    return np.asarray(Image.open(io.BytesIO(buffer.getvalue())).convert("RGB"))
+
+
+def peak_rss_growth(pipeline, width, height):
+    """Return the peak RSS growth in bytes of one render in a subprocess."""
+    output = subprocess.run([sys.executable, "-c", RSS_CHILD, pipeline, str(width), str(height)],
+                            cwd=Path(__file__).parent, check=True, capture_output=True, text=True)
+    return int(output.stdout)
+
+
+def test_striped_png_writer():
+    """Test that stripes written one after another form a valid PNG."""
+    pixels = np.random.default_rng(1).integers(0, 256, size=(70, 45, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    with StripedPNGWriter(buffer, 45, 70) as writer:
+        for top in range(0, 70, 16):
+            writer.write(pixels[top:top + 16])
+    assert np.array_equal(read_png(buffer), pixels), "PNG should decode to the written rows"
+
+    writer = StripedPNGWriter(io.BytesIO(), 45, 70)
+    writer.write(pixels[:10])
+    try:
+        writer.close()
+        assert False, "Closing before every row is written should raise"
+    except ValueError:
+        pass
+
+    stripes = tile_stripes(300, 200, 128)
+    assert [len(row) for row in stripes] == [3, 3], "Edge tiles should be kept"
+    assert stripes[-1][-1] == (256, 128, 300, 200), "Edge tiles should be clipped to the canvas"
+
+    print("✅ test_striped_png_writer passed")
+
+
+def test_tiled_matches_generate_artwork():
+    """Test that the stitched tiles give the same pixels as the full-frame render."""
+    for style in ("circles", "rectangles", "noise", "voronoi"):
+        for background in ("gradient", "noise"):
+            buffer = io.BytesIO()
+            render_tiled("Friday", SAMPLE_TIME, 301, 217, buffer, tile_size=64, workers=2,
+                         style=style, background=background)
+            expected = generate_artwork("Friday", SAMPLE_TIME, 301, 217, style=style,
+                                        background=background)
+            assert np.array_equal(read_png(buffer), np.asarray(expected)), \
+                f"Tiled {style} on {background} should match the full render"
+
+    # Unrotated frames are copied from the tiles without resampling
+    scene = build_scene("Sunday", SAMPLE_TIME, 250, 190)
+    scene.settings["rotation"] = 0
+    buffer = io.BytesIO()
+    write_tiled(scene, buffer, tile_size=100, workers=1)
+    assert np.array_equal(read_png(buffer), np.asarray(render_scene(scene))), \
+        "Unrotated tiles should match too"
+
+    print("✅ test_tiled_matches_generate_artwork passed")
+
+
+def test_tiled_has_no_seams():
+    """Test that strokes and bitmaps crossing tile edges are drawn as in the full frame."""
+    for time_obj in (SAMPLE_TIME, UNROTATED_TIME):
+        day = time_obj.strftime("%A")
+        for style in ("lines", "waves", "fractal_tree", "organic", "curves"):
+            buffer = io.BytesIO()
+            render_tiled(day, time_obj, 301, 217, buffer, tile_size=37, workers=1, style=style)
+            expected = generate_artwork(day, time_obj, 301, 217, style=style)
+            assert np.array_equal(read_png(buffer), np.asarray(expected)), \
+                f"Tiled {style} at {time_obj} should match the full render"
+
+    # The last column is a tile of its own, which must still get the bitmap layers
+    time_obj = datetime.datetime(2024, 1, 5, 0, 0, 50)
+    for style in ("noise", "voronoi", "reaction_diffusion"):
+        buffer = io.BytesIO()
+        render_tiled("Friday", time_obj, 1025, 300, buffer, tile_size=512, workers=1, style=style)
+        expected = generate_artwork("Friday", time_obj, 1025, 300, style=style)
+        assert np.array_equal(read_png(buffer), np.asarray(expected)), \
+            f"A 1 px edge tile of {style} should match the full render"
+
+    print("✅ test_tiled_has_no_seams passed")
+
+
+def test_tiled_processes_and_memory():
+    """Test process workers and that memory follows the tile size, not the canvas."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        threaded = os.path.join(tmpdir, "threaded.png")
+        processes = os.path.join(tmpdir, "processes.png")
+        stats = render_tiled("Monday", SAMPLE_TIME, 320, 240, threaded, tile_size=100)
+        render_tiled("Monday", SAMPLE_TIME, 320, 240, processes, tile_size=100, workers=2,
+                     executor="process")
+        assert stats["tiles"] == 12 and stats["stripes"] == 3, "Stats should count the tiles"
+        with open(threaded, "rb") as a, open(processes, "rb") as b:
+            assert a.read() == b.read(), "Processes should write the same file as threads"
+
+    if importlib.util.find_spec("resource") is None:
+        print("⏭️ peak RSS check skipped (no resource module)")
+    else:
+        width, height = 1200, 4800
+        frame = width * height * 3
+        full = peak_rss_growth("full", width, height)
+        tiled = peak_rss_growth("tiled", width, height)
+        assert full > frame, f"Full-frame peak {full} bytes should hold at least one frame"
+        assert tiled < frame / 4, f"Tiled peak {tiled} bytes should be well below one frame"
+
+    print("✅ test_tiled_processes_and_memory passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n🧪 Running tests for tiled_render.py\n")
+    print("=" * 50)
+
+    test_striped_png_writer()
+    test_tiled_matches_generate_artwork()
+    test_tiled_has_no_seams()
+    test_tiled_processes_and_memory()
+
+    print("=" * 50)
+    print("\n✅ All tests passed!\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,374 @@
+"""
+Tiled rendering for very large canvases with bounded memory.
+
+generate_artwork keeps several full-frame buffers alive at once (canvas,
+overlay, rotated copy), which for a 20000x15000 poster means gigabytes and
+a single core. write_tiled() instead builds the scene once (see scene.py),
+splits the canvas into tiles and renders each tile on its own: the
+gradient, noise background and only the shapes whose bounds overlap it are
+drawn into a small buffer, composited and rotated exactly as the full frame
+would be. Tiles run in parallel on a thread or process pool and each stripe
+of tiles is streamed into a PNG as soon as it is complete, so peak memory
+follows the tile size and canvas width instead of the canvas area.
+
+Each tile replays the same drawing calls shifted up by whole rows into a
+buffer that reaches past the tile's edges, so Pillow neither clips a shape
+nor rounds an edge differently there, and samples the rotation with
+Pillow's own fixed-point arithmetic: the stitched image matches
+generate_artwork pixel for pixel and shows no seams. The pixel-field styles
+(noise, voronoi, reaction_diffusion) still compute their
+fields over the whole canvas while the scene is built; the geometric
+styles are the ones that scale to poster sizes.
+"""
+
+import argparse
+import datetime
+import math
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from generate_art import build_scene, gradient_array, paint_noise_background, shape_functions
+from palettes import HARMONIES, apply_grade
+from scene import LINE, Scene
+
+DEFAULT_TILE_SIZE = 512
+
+# Pixels added to half the widest stroke when padding a tile's overlay
+TILE_MARGIN_SLACK = 4
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class StripedPNGWriter:
+    """
+    Write an RGB PNG from top to bottom, a stripe of rows at a time.
+
+    Rows use PNG's "Up" filter and go through one zlib stream, so only the
+    current stripe and the last row written are held in memory.
+    ``destination`` is a file path or a writable binary file object.
+    """
+
+    def __init__(self, destination, width, height, compress_level=6):
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._owns_file = isinstance(destination, (str, os.PathLike))
+        if self._owns_file:
+            os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+            self._file = open(destination, "wb")
+        else:
+            self._file = destination
+        self._compressor = zlib.compressobj(compress_level)
+        self._previous = np.zeros(width * 3, dtype=np.uint8)
+
+        self._file.write(PNG_SIGNATURE)
+        # 8-bit RGB, deflate, adaptive filtering, no interlace
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, kind, data):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+    def write(self, rows):
+        """Append a (rows, width, 3) uint8 array below the rows already written."""
+        rows = np.asarray(rows, dtype=np.uint8).reshape(-1, self.width * 3)
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError("more rows written than the image height")
+        filtered = np.empty((len(rows), self.width * 3 + 1), dtype=np.uint8)
+        filtered[:, 0] = 2
+        # uint8 arithmetic wraps modulo 256, as the filter requires; writing
+        # the differences in place saves a stripe-sized temporary
+        np.subtract(rows[0], self._previous, out=filtered[0, 1:])
+        np.subtract(rows[1:], rows[:-1], out=filtered[1:, 1:])
+        self._previous = rows[-1].copy()
+        self.rows_written += len(rows)
+
+        data = self._compressor.compress(filtered)
+        if data:
+            self._chunk(b"IDAT", data)
+
+    def close(self):
+        """Finish the zlib stream and the PNG; every row must have been written."""
+        if self._compressor is None:
+            return
+        if self.rows_written != self.height:
+            raise ValueError(f"{self.rows_written} of {self.height} rows written")
+        self._chunk(b"IDAT", self._compressor.flush())
+        self._chunk(b"IEND", b"")
+        self._compressor = None
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        elif self._owns_file:
+            self._file.close()
+
+
+def tile_stripes(width, height, tile_size=DEFAULT_TILE_SIZE):
+    """Return the tile boxes (left, top, right, bottom) as a list of stripes."""
+    return [
+        [(left, top, min(left + tile_size, width), min(top + tile_size, height))
+         for left in range(0, width, tile_size)]
+        for top in range(0, height, tile_size)
+    ]
+
+
+def rotation_matrix(angle, width, height):
+    """The output-to-source affine matrix Image.rotate uses for a width x height frame."""
+    angle = -math.radians(angle)
+    a, b = round(math.cos(angle), 15), round(math.sin(angle), 15)
+    d, e = round(-math.sin(angle), 15), round(math.cos(angle), 15)
+    center_x, center_y = width / 2.0, height / 2.0
+    c = a * -center_x + b * -center_y + center_x
+    f = d * -center_x + e * -center_y + center_y
+    return a, b, c, d, e, f
+
+
+def _fixed(value):
+    return math.floor(value * 65536.0 + 0.5)
+
+
+def tile_rotation(matrix, box, width, height):
+    """
+    Return (region, tile_matrix) for rotating the output box out of the canvas.
+
+    Pillow's nearest-neighbour affine transform steps through the frame in
+    16.16 fixed point. The fixed-point position of each output pixel is
+    linear in its coordinates, so the canvas region a tile samples is found
+    exactly from its corners, and the tile matrix reproduces the full
+    frame's fixed-point values at the tile's offset: the tile samples
+    precisely the pixels the full-frame rotate would. ``region`` is None when
+    the whole tile lies outside the rotated canvas.
+    """
+    a, b, c, d, e, f = matrix
+    left, top, right, bottom = box
+    step_x = (_fixed(a), _fixed(b))
+    step_y = (_fixed(d), _fixed(e))
+    # Fixed-point source position of output pixel (left, top)
+    start_x = _fixed(c + a * 0.5 + b * 0.5) + left * step_x[0] + top * step_x[1]
+    start_y = _fixed(f + d * 0.5 + e * 0.5) + left * step_y[0] + top * step_y[1]
+
+    corners = [(x, y) for x in (0, right - left - 1) for y in (0, bottom - top - 1)]
+    xs = [(start_x + x * step_x[0] + y * step_x[1]) >> 16 for x, y in corners]
+    ys = [(start_y + x * step_y[0] + y * step_y[1]) >> 16 for x, y in corners]
+    region = (max(0, min(xs)), max(0, min(ys)), min(width, max(xs) + 1), min(height, max(ys) + 1))
+    if region[0] >= region[2] or region[1] >= region[3]:
+        return None, None
+
+    start_x -= region[0] << 16
+    start_y -= region[1] << 16
+    # Exact multiples of 1/65536, which Pillow converts back to the same integers
+    tile_matrix = (step_x[0] / 65536, step_x[1] / 65536,
+                   (start_x - step_x[0] / 2 - step_x[1] / 2) / 65536,
+                   step_y[0] / 65536, step_y[1] / 65536,
+                   (start_y - step_y[0] / 2 - step_y[1] / 2) / 65536)
+    return region, tile_matrix
+
+
+class TileRenderer:
+    """Render any tile of a native-size scene, independently of the others."""
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.bounds = scene.bounds()
+        settings = scene.settings
+        # Every gradient row is one colour, so one column serves all tiles
+        self.gradient = gradient_array(tuple(settings["base_color"]), 1, scene.height)
+        rotation = settings["rotation"]
+        self.matrix = rotation_matrix(rotation, scene.width, scene.height) if rotation else None
+        # Pillow clips shapes at the image edge, which shifts the pixels of a
+        # stroke crossing it; shapes are drawn into a margin this wide and
+        # cropped, so nothing is clipped where a tile ends
+        widths = scene.params[scene.kinds == LINE]
+        self.margin = (int(widths.max()) // 2 if widths.size else 0) + TILE_MARGIN_SLACK
+
+    def paint_region(self, region):
+        """Draw the unrotated canvas pixels inside region into a new RGB image."""
+        left, top, right, bottom = region
+        scene = self.scene
+        column = self.gradient[top:bottom]
+        strip = Image.frombuffer("RGBA", (1, bottom - top), column, "raw", "RGBA", 0, 1)
+        image = strip.convert("RGB").resize((right - left, bottom - top), Image.Resampling.NEAREST)
+
+        noise = scene.settings.get("noise")
+        if noise:
+            seed, offset, cells, octaves = noise["params"]
+            paint_noise_background(image, tuple(noise["color"]),
+                                   (seed, tuple(offset), cells, octaves),
+                                   canvas_size=(scene.width, scene.height), origin=(left, top))
+
+        bounds = self.bounds
+        visible = np.flatnonzero((bounds[:, 0] < right) & (bounds[:, 2] >= left)
+                                 & (bounds[:, 1] < bottom) & (bounds[:, 3] >= top))
+        if visible.size:
+            # Pillow's edge maths rounds differently once x is shifted, so the
+            # overlay keeps the canvas's columns from 0 and only rows move; the
+            # margin stops at the canvas, where the full frame clips too.
+            # Without a colour Pillow zeroes the overlay with calloc, so the
+            # columns left of the tile are never touched and take no memory
+            pad_top = min(self.margin, top)
+            overlay_right = min(right + self.margin, scene.width)
+            overlay_bottom = min(bottom + self.margin, scene.height)
+            overlay = Image.new("RGBA", (overlay_right, overlay_bottom - top + pad_top), None)
+            scene.rasterize(ImageDraw.Draw(overlay), origin=(0, top - pad_top), indices=visible)
+            image.paste(overlay, (-left, -pad_top), overlay)
+        if "grade" in scene.settings:
+            image = apply_grade(image, scene.settings["grade"])
+        return image
+
+    def render(self, box):
+        """Return the final RGB pixels of the output tile box as an array."""
+        if self.matrix is None:
+            return np.asarray(self.paint_region(box))
+
+        size = (box[2] - box[0], box[3] - box[1])
+        region, matrix = tile_rotation(self.matrix, box, self.scene.width, self.scene.height)
+        if region is None:
+            return np.full((size[1], size[0], 3), 255, dtype=np.uint8)
+        # Pixels rotated in from outside the canvas stay white, as with rotate()
+        tile = self.paint_region(region).transform(size, Image.Transform.AFFINE, matrix,
+                                                   fillcolor=(255, 255, 255))
+        return np.asarray(tile)
+
+
+_worker_renderer = None
+
+
+def _init_worker(scene_bytes):
+    global _worker_renderer
+    _worker_renderer = TileRenderer(Scene.from_bytes(scene_bytes))
+
+
+def _render_in_worker(box):
+    return _worker_renderer.render(box)
+
+
+def write_tiled(scene, output_path, tile_size=DEFAULT_TILE_SIZE, workers=None, executor="thread",
+                compress_level=6, progress=None):
+    """
+    Rasterize a native-size scene tile by tile into a PNG at output_path.
+
+    Tiles are rendered on ``workers`` threads (``executor="thread"``) or
+    processes (``"process"``, which ships the scene to each worker once).
+    At most two stripes of tiles are in flight, so memory stays around
+    ``2 * width * tile_size * 3`` bytes plus one source region, and the rows
+    its shapes are drawn into, per worker.
+    ``progress(done, total)`` is called after each stripe is written.
+
+    Returns a dict with the tile and stripe counts and elapsed seconds.
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError(f"executor must be 'thread' or 'process', got {executor!r}")
+    workers = workers or os.cpu_count() or 1
+    stripes = tile_stripes(scene.width, scene.height, tile_size)
+    started = time.perf_counter()
+
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(scene.to_bytes(),))
+        job = _render_in_worker
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tile")
+        job = TileRenderer(scene).render
+
+    with pool, StripedPNGWriter(output_path, scene.width, scene.height, compress_level) as writer:
+        def flush(row, futures):
+            top, bottom = row[0][1], row[0][3]
+            stripe = np.empty((bottom - top, scene.width, 3), dtype=np.uint8)
+            for (left, _, right, _), future in zip(row, futures):
+                stripe[:, left:right] = future.result()
+            writer.write(stripe)
+            if progress:
+                progress(writer.rows_written, scene.height)
+
+        # Render the next stripe while the previous one is stitched and compressed
+        queued = deque()
+        for row in stripes:
+            queued.append((row, [pool.submit(job, box) for box in row]))
+            if len(queued) > 1:
+                flush(*queued.popleft())
+        while queued:
+            flush(*queued.popleft())
+
+    return {
+        "tiles": sum(len(row) for row in stripes),
+        "stripes": len(stripes),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def render_tiled(day, time_obj, width, height, output_path, tile_size=DEFAULT_TILE_SIZE,
+                 workers=None, executor="thread", style=None, background="gradient",
+                 palette=None, compress_level=6, progress=None):
+    """
+    Render the artwork for day/time_obj tile by tile into a PNG.
+
+    Gives the same image generate_artwork would at width x height; see
+    write_tiled() for the tiling options.
+    """
+    scene = build_scene(day, time_obj, width, height, style, background, palette)
+    return write_tiled(scene, output_path, tile_size, workers, executor, compress_level, progress)
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Render a poster-size artwork tile by tile.")
+    parser.add_argument("--timestamp", type=datetime.datetime.fromisoformat, default=None,
+                        help="Timestamp to render (ISO format, default: now)")
+    parser.add_argument("--width", type=int, default=20000, help="Image width in pixels")
+    parser.add_argument("--height", type=int, default=15000, help="Image height in pixels")
+    parser.add_argument("--tile-size", type=int, default=DEFAULT_TILE_SIZE,
+                        help=f"Tile edge in pixels (default: {DEFAULT_TILE_SIZE})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of workers (default: CPU count)")
+    parser.add_argument("--processes", action="store_true",
+                        help="Render tiles in worker processes instead of threads")
+    parser.add_argument("--style", choices=sorted(shape_functions),
+                        default=None, help="Shape style (default: the day's style)")
+    parser.add_argument("--background", choices=["gradient", "noise"], default="gradient",
+                        help="Background texture (default: gradient)")
+    parser.add_argument("--palette", choices=["dynamic", *sorted(HARMONIES)], default=None,
+                        help="Color harmony and time-of-day grading (default: the day's colors)")
+    parser.add_argument("--compress-level", type=int, default=6, help="zlib level 0-9 (default: 6)")
+    parser.add_argument("--output", default=os.path.join("output", "poster.png"),
+                        help="PNG file to write")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    now = args.timestamp or datetime.datetime.now()
+    day = now.strftime("%A")
+
+    def report(rows, total):
+        print(f"  {rows}/{total} rows written", end="\r")
+
+    print(f"Rendering {args.width}x{args.height} in {args.tile_size}px tiles into {args.output}...")
+    stats = render_tiled(day, now, args.width, args.height, args.output,
+                         tile_size=args.tile_size, workers=args.workers,
+                         executor="process" if args.processes else "thread", style=args.style,
+                         background=args.background, palette=args.palette,
+                         compress_level=args.compress_level,
+                         progress=report)
+
+    print()
+    print("✅ Tiled render complete!")
+    print(f"Tiles: {stats['tiles']} in {stats['stripes']} stripes")
+    print(f"Elapsed: {stats['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()